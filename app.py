@@ -1,64 +1,40 @@
-import streamlit as st
-import numpy as np
-from PIL import Image, ImageOps, UnidentifiedImageError
-import time
-import plotly.graph_objects as go
-import plotly.express as px
 import os
+import shutil
+import sqlite3
 import tempfile
-from functools import lru_cache
-from importlib import import_module
-from contextlib import suppress
+import time
+
+import streamlit as st
+from contextlib import nullcontext, suppress
 from html import escape
 
-MODEL_REPO_ID = os.getenv("JACKFRUIT_MODEL_REPO_ID", "theashish03/jackfruit")
-MODEL_FILENAME = os.getenv("JACKFRUIT_MODEL_FILENAME", "best.pt")
-MODEL_REVISION = os.getenv(
-    "JACKFRUIT_MODEL_REVISION",
-    "a2106beb9c286ace88715fe9497bd1dac08d3908",
+from jackfruit.core import (
+    BATCH_SIZE,
+    DECODE_SIZE,
+    DETECTION_FLOOR,
+    TILE_SIZE,
+    confidence_summary,
+    image_to_cv2_bgr,
+    inference_scheduler,
+    iter_batch_analysis,
+    load_model,
+    model_runtime_available,
+    process_pool,
+    run_raw_detection,
+    run_tiled_detection,
+    summarize_raw_detections,
+    validate_uploaded_image,
 )
-MAX_IMAGE_PIXELS = int(os.getenv("JACKFRUIT_MAX_IMAGE_PIXELS", "12000000"))
-Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
-
-
-def _cv2():
-    return import_module("cv2")
-
-
-@lru_cache(maxsize=1)
-def model_runtime_available():
-    try:
-        _cv2()
-        import_module("ultralytics")
-    except Exception:
-        return False
-    return True
-
-
-def validate_uploaded_image(uploaded_file):
-    try:
-        image = Image.open(uploaded_file)
-        image.load()
-    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as exc:
-        raise ValueError("The uploaded file is not a valid supported image.") from exc
-
-    width, height = image.size
-    if width <= 0 or height <= 0:
-        raise ValueError("The uploaded image has invalid dimensions.")
-    if width * height > MAX_IMAGE_PIXELS:
-        raise ValueError(
-            f"The uploaded image is too large. Please use an image up to {MAX_IMAGE_PIXELS:,} pixels."
-        )
-
-    image_format = image.format
-    image = ImageOps.exif_transpose(image).convert("RGB")
-    image.format = image_format
-    return image
+from jackfruit.annotate import render_detections
+from jackfruit.charts import bin_frequencies, lttb
+from jackfruit.history import SessionHistory, history_store, make_record
+from jackfruit.metrics import METRICS_HOST, METRICS_PORT, REGISTRY, STAGE_METRIC, start_metrics_server
+from jackfruit.theme import theme_html
+from jackfruit.timing import StageTimer
+from jackfruit.video import VIDEO_FRAME_STRIDE, analyze_video, video_frame_count
+from jackfruit.warmup import PRELOAD_MODEL, model_warmup
 
-
-def image_to_cv2_bgr(image):
-    cv2 = _cv2()
-    return cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+THEME_STYLESHEET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "theme.css")
 
 
 def model_runtime_message():
@@ -71,559 +47,147 @@ def model_runtime_message():
 def image_metadata_html(image):
     image_format = escape(image.format or "Uploaded image")
     mode = escape(image.mode)
-    width, height = image.size
+    width, height = getattr(image, "info", {}).get("original_size", image.size)
+    decoded_note = ""
+    if (width, height) != tuple(image.size):
+        decoded_note = f" (analyzed at {image.size[0]} x {image.size[1]})"
     return f"""
         <div class="stats-card">
             <h4>Image Information</h4>
             <p><strong>Format:</strong> {image_format}</p>
-            <p><strong>Size:</strong> {width} x {height} pixels</p>
+            <p><strong>Size:</strong> {width} x {height} pixels{decoded_note}</p>
             <p><strong>Mode:</strong> {mode}</p>
         </div>
         """
 
 
-def summarize_detections(boxes, confidence_threshold, target_class_id=0):
-    jackfruit_count = 0
-    confidences = []
+# Page configuration
+st.set_page_config(
+    page_title="🍈 Jackfruit AI Detector",
+    page_icon="🍈",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Serve /metrics once per process when JACKFRUIT_METRICS_PORT is set
+try:
+    start_metrics_server()
+except OSError as exc:
+    st.warning(f"⚠️ Metrics endpoint unavailable: {exc}")
+
+# Initialize session state with the most recent persisted analyses
+if 'history' not in st.session_state:
+    try:
+        store = history_store()
+    except (OSError, sqlite3.Error) as exc:
+        store = None
+        st.warning(f"⚠️ Detection history will not be saved: {exc}")
+    st.session_state.history = SessionHistory(store)
 
-    if boxes is None:
-        return jackfruit_count, confidences
+# Preload and warm up the model in the background on the first script run
+warmup = model_warmup().start() if PRELOAD_MODEL and model_runtime_available() else None
 
-    for box in boxes:
-        class_id = int(box.cls[0])
-        conf_score = float(box.conf[0])
-        if class_id == target_class_id and conf_score >= confidence_threshold:
-            jackfruit_count += 1
-            confidences.append(conf_score)
 
-    return jackfruit_count, confidences
+def render_model_status():
+    if warmup.status == "warming":
+        st.info("⏳ Warming up the AI model...")
+    elif warmup.ready:
+        st.success(f"🟢 Model ready (warm-up {warmup.duration:.1f}s)")
+    else:
+        st.warning(f"⚠️ Model warm-up failed: {warmup.error}")
 
 
-def confidence_summary(confidences):
-    if not confidences:
-        return {
-            "avg_conf": 0,
-            "min_conf": 0,
-            "max_conf": 0,
-            "avg_conf_pct": 0,
-            "min_conf_pct": 0,
-            "max_conf_pct": 0,
+def metrics_table(summary):
+    return [
+        {
+            "Stage": row["stage"] if row["metric"] == STAGE_METRIC else f"request: {row['stage']}",
+            "Count": row["count"],
+            "Mean ms": round(row["mean_ms"], 1),
+            "p50 ms": round(row["p50_ms"], 1),
+            "p95 ms": round(row["p95_ms"], 1),
         }
+        for row in summary
+    ]
 
-    avg_conf = float(np.mean(confidences))
-    min_conf = float(np.min(confidences))
-    max_conf = float(np.max(confidences))
-    return {
-        "avg_conf": avg_conf,
-        "min_conf": min_conf,
-        "max_conf": max_conf,
-        "avg_conf_pct": avg_conf * 100,
-        "min_conf_pct": min_conf * 100,
-        "max_conf_pct": max_conf * 100,
-    }
 
+def scheduler_status_text(stats):
+    return (
+        f"Inference queue: {stats['queue_depth']}/{stats['queue_size']} waiting · "
+        f"wait p50 {stats['wait_p50_ms']:.0f} ms / p95 {stats['wait_p95_ms']:.0f} ms · "
+        f"avg batch {stats['avg_batch_size']:.1f} on {stats['workers']} worker(s)"
+    )
 
-def run_model_inference(image_cv, confidence_threshold):
-    cv2 = _cv2()
-    temp_image_path = None
 
-    try:
-        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as temp_image:
-            temp_image_path = temp_image.name
+def render_scheduler_status():
+    st.caption(scheduler_status_text(inference_scheduler().stats()))
 
-        if not cv2.imwrite(temp_image_path, image_cv):
-            raise RuntimeError("Could not prepare the uploaded image for detection.")
 
-        results = load_model()(temp_image_path, conf=confidence_threshold, save=False)
-        return results[0]
-    finally:
-        if temp_image_path:
-            with suppress(FileNotFoundError):
-                os.remove(temp_image_path)
+def decoded_upload(cache, uploaded_file, max_size):
+    """Validate and decode an upload once per file_id; reruns reuse the cached image or error."""
+    key = (uploaded_file.file_id, max_size)
+    if cache.get("key") != key:
+        cache.clear()
+        cache["key"] = key
+        try:
+            cache["image"], cache["error"] = validate_uploaded_image(uploaded_file, max_size=max_size), None
+        except ValueError as exc:
+            cache["image"], cache["error"] = None, str(exc)
+    return cache["image"], cache["error"]
 
-# Page configuration
-st.set_page_config(
-    page_title="🍈 Jackfruit AI Detector",
-    page_icon="🍈",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
 
-# Initialize session state
-if 'detection_history' not in st.session_state:
-    st.session_state.detection_history = []
-
-# Theme definitions (always dark mode)
-themes = {
-    'dark': {
-        'bg_primary': '#1a1a1a',
-        'bg_secondary': '#2d2d2d',
-        'text_primary': '#ffffff',
-        'text_secondary': '#b0b0b0',
-        'accent_1': '#ff6b6b',
-        'accent_2': '#4ecdc4',
-        'accent_3': '#45b7d1',
-        'gradient_1': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
-        'gradient_2': 'linear-gradient(135deg, #f093fb 0%, #f5576c 100%)',
-        'gradient_3': 'linear-gradient(135deg, #4facfe 0%, #00f2fe 100%)',
-        'card_shadow': '0 8px 32px rgba(0,0,0,0.3)',
-        'border_color': '#404040'
-    }
-}
-
-current_theme = themes['dark']
-
-# Enhanced CSS with theme support and better animations
-st.markdown(f"""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Poppins:wght@300;400;500;600;700&display=swap');
-    
-    :root {{
-        --bg-primary: {current_theme['bg_primary']};
-        --bg-secondary: {current_theme['bg_secondary']};
-        --text-primary: {current_theme['text_primary']};
-        --text-secondary: {current_theme['text_secondary']};
-        --accent-1: {current_theme['accent_1']};
-        --accent-2: {current_theme['accent_2']};
-        --accent-3: {current_theme['accent_3']};
-        --gradient-1: {current_theme['gradient_1']};
-        --gradient-2: {current_theme['gradient_2']};
-        --gradient-3: {current_theme['gradient_3']};
-        --card-shadow: {current_theme['card_shadow']};
-        --border-color: {current_theme['border_color']};
-    }}
-    
-    .stApp {{
-        background: var(--bg-primary);
-        color: var(--text-primary);
-        transition: all 0.3s ease;
-    }}
-    
-    * {{
-        font-family: 'Inter', 'Poppins', sans-serif;
-        transition: all 0.3s ease;
-    }}
-    
-    .main-header {{
-        background: var(--gradient-1);
-        padding: 3rem 2rem;
-        border-radius: 20px;
-        margin-bottom: 2rem;
-        text-align: center;
-        box-shadow: var(--card-shadow);
-        animation: slideInDown 1s ease-out;
-        position: relative;
-        overflow: hidden;
-    }}
-    
-    .main-header::before {{
-        content: '';
-        position: absolute;
-        top: -50%;
-        left: -50%;
-        width: 200%;
-        height: 200%;
-        background: radial-gradient(circle, rgba(255,255,255,0.1) 0%, transparent 70%);
-        animation: float 6s ease-in-out infinite;
-    }}
-    
-    .main-header h1 {{
-        color: white;
-        font-size: 3.5rem;
-        font-weight: 700;
-        margin-bottom: 1rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        position: relative;
-        z-index: 1;
-    }}
-    
-    .main-header p {{
-        color: rgba(255,255,255,0.9);
-        font-size: 1.3rem;
-        margin: 0;
-        font-weight: 400;
-        position: relative;
-        z-index: 1;
-    }}
-    
-    @keyframes slideInDown {{
-        from {{
-            transform: translateY(-100px);
-            opacity: 0;
-        }}
-        to {{
-            transform: translateY(0);
-            opacity: 1;
-        }}
-    }}
-    
-    @keyframes float {{
-        0%, 100% {{ transform: translateY(0px) rotate(0deg); }}
-        50% {{ transform: translateY(-20px) rotate(180deg); }}
-    }}
-    
-    .upload-section {{
-        background: var(--gradient-2);
-        padding: 2.5rem;
-        border-radius: 20px;
-        margin: 2rem 0;
-        box-shadow: var(--card-shadow);
-        animation: fadeInUp 1s ease-out;
-        position: relative;
-        overflow: hidden;
-    }}
-    
-    .upload-section::before {{
-        content: '🍈';
-        position: absolute;
-        top: -20px;
-        right: -20px;
-        font-size: 8rem;
-        opacity: 0.1;
-        animation: rotate 20s linear infinite;
-    }}
-    
-    @keyframes rotate {{
-        from {{ transform: rotate(0deg); }}
-        to {{ transform: rotate(360deg); }}
-    }}
-    
-    @keyframes fadeInUp {{
-        from {{
-            transform: translateY(50px);
-            opacity: 0;
-        }}
-        to {{
-            transform: translateY(0);
-            opacity: 1;
-        }}
-    }}
-    
-    .stats-card {{
-        background: var(--bg-secondary);
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: var(--card-shadow);
-        border: 1px solid var(--border-color);
-        margin: 1rem 0;
-        transition: all 0.4s cubic-bezier(0.175, 0.885, 0.32, 1.275);
-        position: relative;
-        overflow: hidden;
-    }}
-    
-    .stats-card::before {{
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.1), transparent);
-        transition: left 0.5s;
-    }}
-    
-    .stats-card:hover {{
-        transform: translateY(-8px) scale(1.02);
-        box-shadow: 0 20px 40px rgba(0,0,0,0.15);
-    }}
-    
-    .stats-card:hover::before {{
-        left: 100%;
-    }}
-    
-    .result-container {{
-        background: var(--gradient-3);
-        padding: 2.5rem;
-        border-radius: 20px;
-        margin: 2rem 0;
-        box-shadow: var(--card-shadow);
-        animation: zoomIn 1s ease-out;
-        position: relative;
-    }}
-    
-    @keyframes zoomIn {{
-        from {{
-            transform: scale(0.8);
-            opacity: 0;
-        }}
-        to {{
-            transform: scale(1);
-            opacity: 1;
-        }}
-    }}
-    
-    .detection-badge {{
-        background: var(--gradient-1);
-        color: white;
-        padding: 1rem 2rem;
-        border-radius: 50px;
-        font-weight: 600;
-        font-size: 1.2rem;
-        display: inline-block;
-        margin: 1rem 0;
-        box-shadow: var(--card-shadow);
-        animation: pulse 2s infinite;
-        position: relative;
-        overflow: hidden;
-    }}
-    
-    .detection-badge::before {{
-        content: '';
-        position: absolute;
-        top: 50%;
-        left: 50%;
-        width: 0;
-        height: 0;
-        background: rgba(255,255,255,0.2);
-        border-radius: 50%;
-        transition: all 0.6s ease;
-        transform: translate(-50%, -50%);
-    }}
-    
-    .detection-badge:hover::before {{
-        width: 300px;
-        height: 300px;
-    }}
-    
-    @keyframes pulse {{
-        0% {{ transform: scale(1); box-shadow: 0 0 0 0 rgba(255, 107, 107, 0.7); }}
-        70% {{ transform: scale(1.05); box-shadow: 0 0 0 10px rgba(255, 107, 107, 0); }}
-        100% {{ transform: scale(1); box-shadow: 0 0 0 0 rgba(255, 107, 107, 0); }}
-    }}
-    
-    .sidebar-content {{
-        background: var(--gradient-1);
-        padding: 1.5rem;
-        border-radius: 15px;
-        margin-bottom: 1.5rem;
-        animation: slideInLeft 0.8s ease-out;
-    }}
-    
-    @keyframes slideInLeft {{
-        from {{
-            transform: translateX(-100px);
-            opacity: 0;
-        }}
-        to {{
-            transform: translateX(0);
-            opacity: 1;
-        }}
-    }}
-    
-    .sidebar-content h3 {{
-        color: white;
-        margin-bottom: 1rem;
-        font-weight: 600;
-    }}
-    
-    .stButton > button {{
-        background: var(--gradient-1) !important;
-        color: white !important;
-        border: none !important;
-        padding: 1rem 2.5rem !important;
-        border-radius: 50px !important;
-        font-weight: 600 !important;
-        font-size: 1.1rem !important;
-        transition: all 0.3s cubic-bezier(0.175, 0.885, 0.32, 1.275) !important;
-        box-shadow: var(--card-shadow) !important;
-        position: relative !important;
-        overflow: hidden !important;
-    }}
-    
-    .stButton > button:hover {{
-        transform: translateY(-3px) scale(1.05) !important;
-        box-shadow: 0 15px 35px rgba(0,0,0,0.2) !important;
-    }}
-    
-    .stButton > button:active {{
-        transform: translateY(0) scale(0.95) !important;
-    }}
-    
-    .metric-card {{
-        background: var(--bg-secondary);
-        padding: 2rem;
-        border-radius: 15px;
-        text-align: center;
-        box-shadow: var(--card-shadow);
-        border: 1px solid var(--border-color);
-        margin: 0.5rem;
-        animation: fadeIn 1s ease-out;
-        transition: all 0.3s ease;
-    }}
-    
-    .metric-card:hover {{
-        transform: translateY(-5px);
-        box-shadow: 0 15px 35px rgba(0,0,0,0.15);
-    }}
-    
-    @keyframes fadeIn {{
-        from {{ opacity: 0; transform: translateY(20px); }}
-        to {{ opacity: 1; transform: translateY(0); }}
-    }}
-    
-    .loading-container {{
-        display: flex;
-        flex-direction: column;
-        justify-content: center;
-        align-items: center;
-        padding: 3rem;
-        background: var(--bg-secondary);
-        border-radius: 20px;
-        margin: 2rem 0;
-    }}
-    
-    .jackfruit-loader {{
-        width: 80px;
-        height: 80px;
-        border-radius: 50%;
-        background: var(--gradient-1);
-        animation: jackfruitSpin 2s linear infinite;
-        position: relative;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 2rem;
-        margin-bottom: 1rem;
-    }}
-    
-    @keyframes jackfruitSpin {{
-        0% {{ transform: rotate(0deg) scale(1); }}
-        50% {{ transform: rotate(180deg) scale(1.1); }}
-        100% {{ transform: rotate(360deg) scale(1); }}
-    }}
-    
-    .feature-grid {{
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-        gap: 2rem;
-        margin: 2rem 0;
-    }}
-    
-    .feature-card {{
-        background: var(--bg-secondary);
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: var(--card-shadow);
-        border: 1px solid var(--border-color);
-        text-align: center;
-        animation: slideInUp 0.8s ease-out;
-        transition: all 0.3s ease;
-    }}
-    
-    .feature-card:hover {{
-        transform: translateY(-10px);
-        box-shadow: 0 20px 40px rgba(0,0,0,0.15);
-    }}
-    
-    @keyframes slideInUp {{
-        from {{
-            transform: translateY(100px);
-            opacity: 0;
-        }}
-        to {{
-            transform: translateY(0);
-            opacity: 1;
-        }}
-    }}
-    
-    .feature-icon {{
-        font-size: 3rem;
-        margin-bottom: 1rem;
-        display: block;
-        animation: bounce 2s infinite;
-    }}
-    
-    @keyframes bounce {{
-        0%, 20%, 50%, 80%, 100% {{ transform: translateY(0); }}
-        40% {{ transform: translateY(-10px); }}
-        60% {{ transform: translateY(-5px); }}
-    }}
-    
-    .footer {{
-        background: var(--gradient-1);
-        padding: 3rem 2rem;
-        border-radius: 20px;
-        margin-top: 3rem;
-        text-align: center;
-        animation: fadeIn 1s ease-out;
-        position: relative;
-        overflow: hidden;
-    }}
-    
-    .footer::before {{
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.1), transparent);
-        animation: shine 3s infinite;
-    }}
-    
-    @keyframes shine {{
-        0% {{ left: -100%; }}
-        100% {{ left: 100%; }}
-    }}
-    
-    .stSelectbox > div > div {{
-        background: var(--bg-secondary) !important;
-        border: 1px solid var(--border-color) !important;
-        border-radius: 10px !important;
-    }}
-    
-    .stSlider > div > div {{
-        background: var(--gradient-1) !important;
-    }}
-    
-    .stProgress > div > div {{
-        background: var(--gradient-1);
-    }}
+def upload_bgr(cache):
+    """BGR array of the cached upload, converted on first use."""
+    if cache.get("image_cv") is None:
+        cache["image_cv"] = image_to_cv2_bgr(cache["image"])
+    return cache["image_cv"]
+
+
+def render_sidebar_analytics():
+    if st.session_state.history:
+        # Running aggregates, updated on append instead of rescanning the history
+        history_stats = st.session_state.history.stats
+        total_images = history_stats.analyses
+        total_jackfruits = history_stats.total
+        avg_per_image = history_stats.mean
+        max_detected = history_stats.maximum
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("📸 Images", total_images, delta=1 if total_images > 0 else 0)
+            st.metric("🍈 Total Fruits", total_jackfruits)
+        with col2:
+            st.metric("📈 Average", f"{avg_per_image:.1f}")
+            st.metric("🏆 Max Found", max_detected)
+    else:
+        st.info("Upload images to see analytics")
     
-    .annotated-image {{
-        animation: fadeInScale 1s ease-out;
-    }}
+    st.markdown("---")
     
-    @keyframes fadeInScale {{
-        from {{
-            opacity: 0;
-            transform: scale(0.95);
-        }}
-        to {{
-            opacity: 1;
-            transform: scale(1);
-        }}
-    }}
+    st.markdown("""
+    <div class="sidebar-content">
+        <h3>🎛️ Controls</h3>
+    </div>
+    """, unsafe_allow_html=True)
     
-    /* Responsive design */
-    @media (max-width: 768px) {{
-        .main-header h1 {{
-            font-size: 2.5rem;
-        }}
-        
-        .main-header p {{
-            font-size: 1.1rem;
-        }}
-        
-        .feature-grid {{
-            grid-template-columns: 1fr;
-        }}
-    }}
-</style>
-""", unsafe_allow_html=True)
+    if st.button("🗑️ Clear History"):
+        st.session_state.history.clear()
+        st.success("History cleared successfully!")
+        st.rerun()
 
-# Cache the model loading
-@st.cache_resource
-def load_model():
-    from huggingface_hub import hf_hub_download
-    from ultralytics import YOLO
 
-    model_path = hf_hub_download(
-        repo_id=MODEL_REPO_ID,
-        filename=MODEL_FILENAME,
-        revision=MODEL_REVISION,
-    )
-    return YOLO(model_path)
+def render_upload_preview(image, image_error):
+    if image_error:
+        st.error(image_error)
+        return
+    st.image(image, caption="Uploaded Image", width="stretch")
+    st.markdown(image_metadata_html(image), unsafe_allow_html=True)
+
+# Theme stylesheet, served once as a static file; only a <link> is sent per rerun
+try:
+    st.markdown(theme_html(THEME_STYLESHEET), unsafe_allow_html=True)
+except ValueError as exc:
+    st.markdown(theme_html(THEME_STYLESHEET, environ={}), unsafe_allow_html=True)
+    st.warning(f"⚠️ Theme override ignored: {exc}")
 
 # Header with enhanced styling
 st.markdown("""
@@ -662,6 +226,13 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
     
+    if warmup is not None:
+        # Poll while warming so the readiness badge flips without user input
+        st.fragment(render_model_status, run_every=2 if warmup.status == "warming" else None)()
+    
+    if model_runtime_available() and inference_scheduler() is not None:
+        st.fragment(render_scheduler_status, run_every=5)()
+    
     confidence_threshold = st.slider(
         "Confidence Threshold",
         min_value=0.1,
@@ -671,42 +242,32 @@ with st.sidebar:
         help="Minimum confidence score for detection"
     )
     
-    st.markdown("---")
-    
-    st.markdown("""
-    <div class="sidebar-content">
-        <h3>📊 Analytics Dashboard</h3>
-    </div>
-    """, unsafe_allow_html=True)
+    batch_size = st.number_input(
+        "Batch Size",
+        min_value=1,
+        max_value=64,
+        value=BATCH_SIZE,
+        step=1,
+        help="Images sent to the model per forward pass in batch mode"
+    )
     
-    if st.session_state.detection_history:
-        total_images = len(st.session_state.detection_history)
-        total_jackfruits = sum(st.session_state.detection_history)
-        avg_per_image = total_jackfruits / total_images if total_images > 0 else 0
-        max_detected = max(st.session_state.detection_history) if st.session_state.detection_history else 0
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("📸 Images", total_images, delta=1 if total_images > 0 else 0)
-            st.metric("🍈 Total Fruits", total_jackfruits)
-        with col2:
-            st.metric("📈 Average", f"{avg_per_image:.1f}")
-            st.metric("🏆 Max Found", max_detected)
-    else:
-        st.info("Upload images to see analytics")
+    tiled_inference = st.checkbox(
+        "🧩 Tiled Inference",
+        value=False,
+        help=f"Split large images into overlapping {TILE_SIZE}px tiles to find small or distant fruit"
+    )
     
     st.markdown("---")
     
     st.markdown("""
     <div class="sidebar-content">
-        <h3>🎛️ Controls</h3>
+        <h3>📊 Analytics Dashboard</h3>
     </div>
     """, unsafe_allow_html=True)
     
-    if st.button("🗑️ Clear History"):
-        st.session_state.detection_history = []
-        st.success("History cleared successfully!")
-        st.rerun()
+    st.fragment(render_sidebar_analytics)()
+    
+    st.toggle("🐞 Timing metrics", key="show_metrics", help="Per-stage latency histograms for this server process")
 
 # Main content area
 col1, col2 = st.columns([1, 1])
@@ -725,71 +286,118 @@ with col1:
         help="Upload images in JPG, PNG, BMP, or TIFF format"
     )
     
+    upload_cache = st.session_state.setdefault("upload_cache", {})
+    image = None
     if uploaded_file is not None:
-        try:
-            image = validate_uploaded_image(uploaded_file)
-            st.session_state.current_image_error = None
-            st.image(image, caption="Uploaded Image", width="stretch")
-            st.markdown(image_metadata_html(image), unsafe_allow_html=True)
-            image_cv = image_to_cv2_bgr(image) if model_runtime_available() else None
-        except ValueError as exc:
-            st.session_state.current_image_error = str(exc)
-            st.error(str(exc))
-            image_cv = None
+        image, image_error = decoded_upload(
+            upload_cache, uploaded_file, max_size=None if tiled_inference else DECODE_SIZE
+        )
+        st.fragment(render_upload_preview)(image, image_error)
+    else:
+        upload_cache.clear()
 
-with col2:
-    if uploaded_file is not None and not st.session_state.get("current_image_error"):
-        st.markdown("""
-        <div class="result-container">
-            <h2 style="color: white; text-align: center; margin-bottom: 1rem; font-weight: 600;">🔍 Detection Results</h2>
+
+@st.fragment
+def render_detection_results(uploaded_file, image):
+    st.markdown("""
+    <div class="result-container">
+        <h2 style="color: white; text-align: center; margin-bottom: 1rem; font-weight: 600;">🔍 Detection Results</h2>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    if not model_runtime_available():
+        st.warning(model_runtime_message())
+    elif st.button("🚀 Analyze Image", key="analyze_btn"):
+        # Enhanced loading animation
+        loading_placeholder = st.empty()
+        loading_placeholder.markdown("""
+        <div class="loading-container">
+            <div class="jackfruit-loader">🍈</div>
+            <h3 style="color: var(--text-primary); margin-bottom: 0.5rem;">Analyzing Image...</h3>
+            <p style="color: var(--text-secondary);">Please wait while our AI processes your image</p>
         </div>
         """, unsafe_allow_html=True)
         
-        if not model_runtime_available():
-            st.warning(model_runtime_message())
-        elif st.button("🚀 Analyze Image", key="analyze_btn"):
-            # Enhanced loading animation
-            st.markdown("""
-            <div class="loading-container">
-                <div class="jackfruit-loader">🍈</div>
-                <h3 style="color: var(--text-primary); margin-bottom: 0.5rem;">Analyzing Image...</h3>
-                <p style="color: var(--text-secondary);">Please wait while our AI processes your image</p>
-            </div>
-            """, unsafe_allow_html=True)
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        stage_timer = StageTimer()
+        
+        try:
+            # Report each real processing stage as it starts
+            status_text.text("🔍 Loading AI model...")
+            with stage_timer.stage("model load"):
+                if warmup is not None:
+                    warmup.wait()
+                # With a process pool the worker processes hold the models.
+                if process_pool() is None:
+                    load_model()
+            progress_bar.progress(20)
             
-            progress_bar = st.progress(0)
-            status_text = st.empty()
+            status_text.text("🧪 Preprocessing image...")
+            with stage_timer.stage("preprocessing"):
+                image_cv = upload_bgr(upload_cache)
+            progress_bar.progress(40)
             
-            # Simulate processing stages
-            stages = [
-                "🔍 Loading AI model...",
-                "🎯 Detecting objects...",
-                "📊 Analyzing results...",
-                "✅ Finalizing detection..."
-            ]
+            status_text.text("🎯 Detecting objects...")
+            inference_floor = min(DETECTION_FLOOR, confidence_threshold)
+            with stage_timer.stage("inference"):
+                if tiled_inference:
+                    boxes, names = run_tiled_detection(image_cv, inference_floor, batch_size=batch_size)
+                else:
+                    boxes, names = run_raw_detection(image_cv, inference_floor)
+            progress_bar.progress(60)
             
-            for i, stage in enumerate(stages):
-                status_text.text(stage)
-                for j in range(25):
-                    progress_bar.progress((i * 25) + j + 1)
-                    time.sleep(0.01)
+            status_text.text("📊 Analyzing results...")
+            with stage_timer.stage("post-processing"):
+                jackfruit_count, confidences = summarize_raw_detections(boxes, confidence_threshold)
+            st.session_state.analysis = {
+                "file_id": uploaded_file.file_id,
+                # Boxes are in the pixel space of this decode; tiling changes it
+                "image_size": tuple(image.size),
+                "floor": inference_floor,
+                "boxes": boxes,
+                "names": names,
+            }
             
+            # Add to history
+            st.session_state.history.append(
+                make_record("image", uploaded_file.name, jackfruit_count, confidences, stage_timer.total, uploaded_file.getvalue())
+            )
+            # The annotation stage of the next run still reports into this timer
+            st.session_state.analysis_timer = stage_timer
+        except Exception as e:
+            loading_placeholder.empty()
+            progress_bar.empty()
+            status_text.empty()
+            st.error(f"❌ Error during detection: {str(e)}")
+            st.info("💡 Please check the model configuration and try again.")
+        else:
+            # The sidebar analytics and history charts live outside this fragment
+            st.rerun()
+
+    # Re-threshold the stored raw detections whenever the slider moves
+    analysis = st.session_state.get("analysis")
+    if (
+        analysis is not None
+        and analysis["file_id"] == uploaded_file.file_id
+        and image is not None
+    ):
+        stage_timer = st.session_state.pop("analysis_timer", None)
+        if analysis["image_size"] != tuple(image.size):
+            st.info("🔁 The image is now decoded at a different size (Tiled Inference changed). Analyze the image again to see its detections.")
+        elif confidence_threshold < analysis["floor"]:
+            st.info("🔁 The threshold is below the stored detections. Analyze the image again to include them.")
+        else:
             try:
-                # Use confidence threshold directly
-                adjusted_conf = confidence_threshold
-
-                result = run_model_inference(image_cv, adjusted_conf)
-                boxes = result.boxes
-                
-                # Clear loading elements
-                progress_bar.empty()
-                status_text.empty()
-                
-                # Count jackfruits and collect detection data
-                jackfruit_count, confidences = summarize_detections(boxes, adjusted_conf)
-                
-                # Add to history
-                st.session_state.detection_history.append(jackfruit_count)
+                # Count jackfruits and draw only the counted boxes
+                with stage_timer.stage("annotation") if stage_timer else nullcontext():
+                    jackfruit_count, confidences, annotated_img = render_detections(
+                        upload_bgr(upload_cache),
+                        analysis["boxes"],
+                        analysis["names"],
+                        confidence_threshold,
+                        channels="BGR",
+                    )
                 
                 # Calculate summary
                 stats = confidence_summary(confidences)
@@ -802,9 +410,7 @@ with col2:
                 """, unsafe_allow_html=True)
                 
                 # Show annotated image with animation
-                annotated_img = result.plot()
-                annotated_img_rgb = _cv2().cvtColor(annotated_img, _cv2().COLOR_BGR2RGB)
-                st.image(annotated_img_rgb, caption=f"Analysis Complete: {jackfruit_count} jackfruits detected", width="stretch")
+                st.image(annotated_img, caption=f"Analysis Complete: {jackfruit_count} jackfruits detected", width="stretch")
                 
                 # Summarized detection details
                 if jackfruit_count > 0:
@@ -818,16 +424,215 @@ with col2:
                     """.format(**stats), unsafe_allow_html=True)
                 
                 # Success message
-                st.success(f"🎉 Analysis completed successfully! Found {jackfruit_count} jackfruit{'s' if jackfruit_count != 1 else ''} in your image.")
+                if stage_timer:
+                    st.success(f"🎉 Analysis completed successfully! Found {jackfruit_count} jackfruit{'s' if jackfruit_count != 1 else ''} in your image.")
+                    st.caption(f"⏱️ {stage_timer.summary()}")
                         
             except Exception as e:
-                progress_bar.empty()
-                status_text.empty()
                 st.error(f"❌ Error during detection: {str(e)}")
                 st.info("💡 Please check the model configuration and try again.")
 
-# Enhanced History visualization
-if st.session_state.detection_history:
+
+with col2:
+    if uploaded_file is not None and image is not None:
+        render_detection_results(uploaded_file, image)
+
+# Batch analysis
+st.markdown("---")
+st.markdown("""
+<div class="upload-section">
+    <h2 style="color: white; text-align: center; margin-bottom: 1rem; font-weight: 600;">📁 Batch Analysis</h2>
+    <p style="color: rgba(255,255,255,0.9); text-align: center; font-size: 1.1rem;">Upload a whole folder of field photos and analyze them in batches</p>
+</div>
+""", unsafe_allow_html=True)
+
+batch_files = st.file_uploader(
+    "Choose images...",
+    type=['jpg', 'jpeg', 'png', 'bmp', 'tiff'],
+    accept_multiple_files=True,
+    key="batch_uploader",
+    help="Upload several images in JPG, PNG, BMP, or TIFF format"
+)
+
+if batch_files:
+    if not model_runtime_available():
+        st.warning(model_runtime_message())
+    elif st.button(f"🚀 Analyze {len(batch_files)} Images", key="analyze_batch_btn"):
+        batch_progress = st.progress(0)
+        batch_status = st.empty()
+        batch_table = st.empty()
+        batch_rows = []
+        
+        try:
+            batch_started = time.perf_counter()
+            for rows in iter_batch_analysis(batch_files, batch_size=batch_size):
+                batch_latency = (time.perf_counter() - batch_started) / len(rows)
+                records = []
+                for row in rows:
+                    batch_file = batch_files[len(batch_rows)]
+                    if row["error"]:
+                        batch_rows.append({"Image": row["name"], "Jackfruits": None, "Avg Confidence": None, "Error": row["error"]})
+                        continue
+                    count, confidences = summarize_raw_detections(row["boxes"], confidence_threshold)
+                    records.append(
+                        make_record("batch", row["name"], count, confidences, batch_latency, batch_file.getvalue())
+                    )
+                    batch_rows.append({
+                        "Image": row["name"],
+                        "Jackfruits": count,
+                        "Avg Confidence": round(confidence_summary(confidences)["avg_conf"], 3),
+                        "Error": None,
+                    })
+                # Stream each finished batch into the history
+                st.session_state.history.append(*records)
+                batch_started = time.perf_counter()
+                batch_progress.progress(len(batch_rows) / len(batch_files))
+                batch_status.text(f"Analyzed {len(batch_rows)} of {len(batch_files)} images...")
+                batch_table.dataframe(batch_rows, width="stretch")
+            st.session_state.batch_results = batch_rows
+        except Exception as e:
+            st.error(f"❌ Error during batch detection: {str(e)}")
+            st.info("💡 Please check the model configuration and try again.")
+        finally:
+            batch_progress.empty()
+            batch_status.empty()
+        
+        if st.session_state.get("batch_results") is batch_rows:
+            st.rerun()
+    
+    if st.session_state.get("batch_results"):
+        batch_results = st.session_state.batch_results
+        analyzed = [row for row in batch_results if row["Error"] is None]
+        st.success(f"🎉 Batch analysis completed! Found {sum(row['Jackfruits'] for row in analyzed)} jackfruits in {len(analyzed)} images.")
+        st.dataframe(batch_results, width="stretch")
+
+# Video analysis
+st.markdown("---")
+st.markdown("""
+<div class="upload-section">
+    <h2 style="color: white; text-align: center; margin-bottom: 1rem; font-weight: 600;">🎬 Video Analysis</h2>
+    <p style="color: rgba(255,255,255,0.9); text-align: center; font-size: 1.1rem;">Walk an orchard row on video and count each jackfruit once</p>
+</div>
+""", unsafe_allow_html=True)
+
+video_file = st.file_uploader(
+    "Choose a video...",
+    type=['mp4', 'mov', 'avi', 'mkv'],
+    key="video_uploader",
+    help="Frames are streamed from disk, so long videos do not need more memory"
+)
+
+if video_file is not None:
+    frame_stride = st.number_input(
+        "Detect every Nth frame",
+        min_value=1,
+        max_value=120,
+        value=VIDEO_FRAME_STRIDE,
+        step=1,
+        help="Frames in between are only analyzed when the scene changed noticeably"
+    )
+    if not model_runtime_available():
+        st.warning(model_runtime_message())
+    elif st.button("🚀 Analyze Video", key="analyze_video_btn"):
+        video_progress = st.progress(0)
+        video_status = st.empty()
+        video_preview = st.empty()
+        suffix = os.path.splitext(video_file.name)[1] or ".mp4"
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_video:
+            # OpenCV reads from a path; copy the upload in chunks.
+            shutil.copyfileobj(video_file, temp_video)
+        
+        try:
+            total_frames = video_frame_count(temp_video.name)
+            update = None
+            for update in analyze_video(temp_video.name, confidence_threshold, stride=frame_stride, batch_size=batch_size):
+                if total_frames:
+                    video_progress.progress(min(update["frames_read"] / total_frames, 1.0))
+                video_status.text(
+                    f"Frame {update['frames_read']}: {update['unique_count']} unique jackfruits so far · "
+                    f"{update['fps']:.1f} frames/s ({update['frames_detected']} analyzed)"
+                )
+                _, _, preview = render_detections(
+                    update["frame"], update["boxes"], update["names"], confidence_threshold, channels="BGR"
+                )
+                video_preview.image(preview, caption=f"Frame {update['frame_index']}", width="stretch")
+            if update is None:
+                st.warning("⚠️ The video did not contain any frames.")
+            else:
+                st.session_state.history.append(
+                    make_record("video", video_file.name, update["unique_count"], [], update["frames_read"] / update["fps"])
+                )
+                st.session_state.video_result = {
+                    "name": video_file.name,
+                    "unique_count": update["unique_count"],
+                    "frames_read": update["frames_read"],
+                    "frames_detected": update["frames_detected"],
+                    "fps": update["fps"],
+                }
+        except Exception as e:
+            st.error(f"❌ Error during video detection: {str(e)}")
+            st.info("💡 Please check the model configuration and try again.")
+        finally:
+            video_progress.empty()
+            video_status.empty()
+            with suppress(FileNotFoundError):
+                os.remove(temp_video.name)
+    
+    video_result = st.session_state.get("video_result")
+    if video_result and video_result["name"] == video_file.name:
+        st.success(
+            f"🎉 Counted {video_result['unique_count']} unique jackfruits in {video_result['frames_read']} frames "
+            f"({video_result['frames_detected']} analyzed, {video_result['fps']:.1f} frames/s)."
+        )
+
+def history_figures(session_history):
+    # Plotly is only imported once there is something to chart.
+    import plotly.graph_objects as go
+    
+    # Enhanced line chart, downsampled so the payload stays constant
+    trend_x, trend_y = lttb(
+        range(session_history.first_index, session_history.first_index + len(session_history)),
+        session_history.counts,
+    )
+    trend_fig = go.Figure()
+    trend_fig.add_trace(go.Scattergl(
+        x=trend_x,
+        y=trend_y,
+        mode='lines+markers',
+        name='Jackfruits Detected',
+        line=dict(color='#FF6B6B', width=4),
+        marker=dict(size=10, color='#4ECDC4', line=dict(color='white', width=2)),
+        fill='tozeroy',
+        fillcolor='rgba(255, 107, 107, 0.1)'
+    ))
+    trend_fig.update_layout(
+        title="🍈 Detection Trend Over Time",
+        xaxis_title="Image Number",
+        yaxis_title="Jackfruits Count",
+        template="plotly_dark",
+        hovermode='x unified'
+    )
+    
+    # Enhanced distribution chart from the pre-binned running frequencies
+    distribution_fig = None
+    if session_history.stats.analyses > 1:
+        bin_centers, bin_heights, bin_width = bin_frequencies(session_history.stats.frequencies)
+        distribution_fig = go.Figure(go.Bar(x=bin_centers, y=bin_heights, width=bin_width * 0.9, name='Analyses'))
+        distribution_fig.update_layout(
+            title="📊 Detection Distribution",
+            template="plotly_dark",
+            xaxis_title="Jackfruits Count",
+            yaxis_title="Frequency",
+            hovermode='x unified'
+        )
+    return trend_fig, distribution_fig
+
+
+@st.fragment
+def render_history_charts():
+    charts_started = time.perf_counter()
+    session_history = st.session_state.history
+    
     st.markdown("---")
     st.markdown("""
     <div class="result-container">
@@ -835,48 +640,36 @@ if st.session_state.detection_history:
     </div>
     """, unsafe_allow_html=True)
     
+    # Figures are rebuilt only when the history changed since the last run
+    cached = st.session_state.get("history_figures")
+    if cached is None or cached[0] != session_history.revision:
+        cached = (session_history.revision, *history_figures(session_history))
+        st.session_state.history_figures = cached
+    _, trend_fig, distribution_fig = cached
+    
     col1, col2 = st.columns(2)
     
     with col1:
-        # Enhanced line chart
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=list(range(1, len(st.session_state.detection_history) + 1)),
-            y=st.session_state.detection_history,
-            mode='lines+markers',
-            name='Jackfruits Detected',
-            line=dict(color='#FF6B6B', width=4, shape='spline'),
-            marker=dict(size=10, color='#4ECDC4', line=dict(color='white', width=2)),
-            fill='tozeroy',
-            fillcolor='rgba(255, 107, 107, 0.1)'
-        ))
-        fig.update_layout(
-            title="🍈 Detection Trend Over Time",
-            xaxis_title="Image Number",
-            yaxis_title="Jackfruits Count",
-            template="plotly_dark",
-            hovermode='x unified'
-        )
-        st.plotly_chart(fig, width="stretch")
+        st.plotly_chart(trend_fig, width="stretch")
     
     with col2:
-        # Enhanced distribution chart
-        if len(st.session_state.detection_history) > 1:
-            fig = px.histogram(
-                x=st.session_state.detection_history,
-                nbins=max(2, len(set(st.session_state.detection_history))),
-                title="📊 Detection Distribution",
-                labels={'x': 'Jackfruits Detected'},
-                template="plotly_dark",
-            )
-            fig.update_layout(
-                xaxis_title="Jackfruits Count",
-                yaxis_title="Frequency",
-                hovermode='x unified'
-            )
-            st.plotly_chart(fig, width="stretch")
+        if distribution_fig is not None:
+            st.plotly_chart(distribution_fig, width="stretch")
         else:
             st.info("Upload more images to see distribution chart")
+    REGISTRY.observe("charts", time.perf_counter() - charts_started)
+
+
+# Enhanced History visualization
+if st.session_state.history:
+    render_history_charts()
+
+if st.session_state.get("show_metrics"):
+    # Rendered last so the panel includes the stages of this run.
+    with st.sidebar:
+        st.dataframe(metrics_table(REGISTRY.summary()), width="stretch", hide_index=True)
+        if METRICS_PORT:
+            st.caption(f"Prometheus metrics: http://{METRICS_HOST}:{METRICS_PORT}/metrics")
 
 # Footer
 st.markdown("""
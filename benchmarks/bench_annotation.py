@@ -0,0 +1,81 @@
+"""Annotation render time for 12 MP frames with many boxes.
+
+Usage: python benchmarks/bench_annotation.py [--boxes 50 500] [--size 4000x3000] [--repeat 5]
+
+Half of the boxes are below the threshold or belong to another class, as
+after a low-floor detection pass. Compares the previous path
+(``Results.plot()`` on every box plus a BGR-to-RGB conversion; needs
+ultralytics) with ``render_detections`` at full resolution, with the
+default size cap, and in count-only mode.
+"""
+import argparse
+import importlib.util
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from jackfruit import annotate, core
+
+NAMES = {0: "jackfruit", 1: "leaf"}
+
+
+def make_boxes(count, width, height, rng):
+    x1 = rng.uniform(0, width - 200, count)
+    y1 = rng.uniform(0, height - 200, count)
+    sizes = rng.uniform(40, 200, (count, 2))
+    conf = np.where(np.arange(count) % 4 == 1, 0.15, rng.uniform(0.3, 0.99, count))
+    cls = np.where(np.arange(count) % 4 == 3, 1, 0)
+    return np.column_stack([x1, y1, x1 + sizes[:, 0], y1 + sizes[:, 1], conf, cls]).astype(np.float32)
+
+
+def timed(function, repeat):
+    function()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def legacy(image_bgr, boxes):
+    cv2 = core._cv2()
+    annotated = core.result_from_detections(image_bgr, core.threshold_detections(boxes, 0.25), NAMES).plot()
+    return cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--boxes", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--size", default="4000x3000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.split("x"))
+    rng = np.random.default_rng(0)
+    image_bgr = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    has_ultralytics = importlib.util.find_spec("ultralytics") is not None
+
+    print(f"{'boxes':>6} {'plot+cvt ms':>12} {'native ms':>10} {'capped ms':>10} {'count-only ms':>14}")
+    for count in args.boxes:
+        boxes = make_boxes(count, width, height, rng)
+        legacy_ms = timed(lambda: legacy(image_bgr, boxes), args.repeat) if has_ultralytics else float("nan")
+        native_ms = timed(
+            lambda: annotate.render_detections(image_bgr, boxes, NAMES, 0.25, max_size=0, channels="BGR"), args.repeat
+        )
+        capped_ms = timed(lambda: annotate.render_detections(image_bgr, boxes, NAMES, 0.25, channels="BGR"), args.repeat)
+        count_ms = timed(lambda: annotate.render_detections(image_bgr, boxes, NAMES, 0.25, count_only=True), args.repeat)
+        print(f"{count:>6} {legacy_ms:12.1f} {native_ms:10.1f} {capped_ms:10.1f} {count_ms:14.3f}")
+    if not has_ultralytics:
+        print("ultralytics is not installed; the plot+cvt column is skipped.")
+
+
+if __name__ == "__main__":
+    main()
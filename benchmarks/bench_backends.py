@@ -0,0 +1,97 @@
+"""Compare load time, inference latency and peak RSS across model backends.
+
+Usage: python benchmarks/bench_backends.py [--backends torch onnx openvino] [--repeats 30]
+
+Each backend runs in its own subprocess with JACKFRUIT_MODEL_BACKEND set, so
+the reported peak RSS only contains what that runtime imports and allocates.
+Exported models are created on first use and reused on later runs.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def run_worker(repeats, image_size):
+    import numpy as np
+
+    from jackfruit import core
+
+    started = time.perf_counter()
+    model = core.load_model()
+    load_seconds = time.perf_counter() - started
+
+    rng = np.random.default_rng(0)
+    image_cv = rng.integers(0, 256, size=(image_size, image_size, 3), dtype=np.uint8)
+    model(image_cv, imgsz=core.IMAGE_SIZE, conf=0.25, save=False, verbose=False)
+
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        model(image_cv, imgsz=core.IMAGE_SIZE, conf=0.25, save=False, verbose=False)
+        timings.append(time.perf_counter() - started)
+
+    timings = np.array(timings) * 1000
+    print(
+        json.dumps(
+            {
+                "backend": core.MODEL_BACKEND,
+                "load_ms": load_seconds * 1000,
+                "p50_ms": float(np.percentile(timings, 50)),
+                "p95_ms": float(np.percentile(timings, 95)),
+                # ru_maxrss is reported in kilobytes on Linux.
+                "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "openvino"])
+    parser.add_argument("--repeats", type=int, default=30)
+    parser.add_argument("--image-size", type=int, default=640)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.repeats, args.image_size)
+        return
+
+    print(f"{'backend':>9} {'load ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'peak RSS MB':>12}")
+    for backend in args.backends:
+        completed = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--worker",
+                "--repeats",
+                str(args.repeats),
+                "--image-size",
+                str(args.image_size),
+            ],
+            env={**os.environ, "JACKFRUIT_MODEL_BACKEND": backend},
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            reason = completed.stderr.strip().splitlines()[-1:] or ["unknown error"]
+            print(f"{backend:>9} failed: {reason[0]}")
+            continue
+        stats = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(
+            f"{backend:>9} {stats['load_ms']:9.0f} {stats['p50_ms']:8.1f}"
+            f" {stats['p95_ms']:8.1f} {stats['peak_rss_mb']:12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
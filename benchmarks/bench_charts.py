@@ -0,0 +1,63 @@
+"""Chart build time and figure payload size as the history grows.
+
+Usage: python benchmarks/bench_charts.py [--points 100 1000 10000 100000]
+
+Compares the previous charts (spline over every point plus a plotly.express
+histogram) with the downsampled trend and pre-binned bars from
+``jackfruit.charts``.
+"""
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+from jackfruit import charts
+
+
+def legacy(counts):
+    trend = go.Figure(go.Scatter(x=list(range(1, len(counts) + 1)), y=counts, line=dict(shape="spline")))
+    distribution = px.histogram(x=counts, nbins=max(2, len(set(counts))))
+    return trend, distribution
+
+
+def downsampled(counts, frequencies):
+    x, y = charts.lttb(range(1, len(counts) + 1), counts)
+    centers, heights, width = charts.bin_frequencies(frequencies)
+    return go.Figure(go.Scattergl(x=x, y=y)), go.Figure(go.Bar(x=centers, y=heights, width=width * 0.9))
+
+
+def measure(build):
+    started = time.perf_counter()
+    figures = build()
+    payload = sum(len(figure.to_json()) for figure in figures)
+    return (time.perf_counter() - started) * 1000, payload / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    args = parser.parse_args()
+
+    random.seed(0)
+    # Warm up plotly's validators so the first row is not dominated by imports.
+    legacy([1, 2])[0].to_json()
+    print(f"{'points':>8} {'legacy ms':>10} {'legacy KB':>10} {'new ms':>8} {'new KB':>8}")
+    for points in args.points:
+        counts = [random.randint(0, 60) for _ in range(points)]
+        frequencies = Counter(counts)
+        legacy_ms, legacy_kb = measure(lambda: legacy(counts))
+        new_ms, new_kb = measure(lambda: downsampled(counts, frequencies))
+        print(f"{points:>8} {legacy_ms:10.1f} {legacy_kb:10.1f} {new_ms:8.1f} {new_kb:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
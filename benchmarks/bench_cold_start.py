@@ -0,0 +1,70 @@
+"""Measure cold start from the local model store with zero network access.
+
+Usage: JACKFRUIT_MODEL_STORE=/models python benchmarks/bench_cold_start.py [--runs 5]
+
+Each run is a fresh interpreter with JACKFRUIT_MODEL_OFFLINE=1 that times the
+import of jackfruit.core, resolving (and sha256-verifying) the checkpoint from
+the store, and constructing the model. Fill the store first with
+jackfruit-prefetch-model.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def run_worker():
+    started = time.perf_counter()
+    from jackfruit import core
+
+    imported = time.perf_counter()
+    core.download_model()
+    resolved = time.perf_counter()
+    core.load_model()
+    loaded = time.perf_counter()
+    print(
+        json.dumps(
+            {
+                "import_ms": (imported - started) * 1000,
+                "resolve_ms": (resolved - imported) * 1000,
+                "load_ms": (loaded - resolved) * 1000,
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker()
+        return
+
+    print(f"{'run':>3} {'import ms':>10} {'resolve ms':>11} {'load ms':>9}")
+    for run in range(1, args.runs + 1):
+        completed = subprocess.run(
+            [sys.executable, __file__, "--worker"],
+            env={**os.environ, "JACKFRUIT_MODEL_OFFLINE": "1"},
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            reason = completed.stderr.strip().splitlines()[-1:] or ["unknown error"]
+            print(f"{run:>3} failed: {reason[0]}")
+            continue
+        stats = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(f"{run:>3} {stats['import_ms']:10.1f} {stats['resolve_ms']:11.1f} {stats['load_ms']:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
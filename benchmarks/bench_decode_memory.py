@@ -0,0 +1,114 @@
+"""Peak RSS per request for the legacy and the reduced-memory decode pipelines.
+
+Usage: python benchmarks/bench_decode_memory.py [--size 4000x3000]
+
+A synthetic JPEG and PNG of the given size are decoded and converted to the
+BGR array handed to the model. Every measurement runs in a fresh interpreter
+and reports the growth of ru_maxrss over the baseline after imports, i.e.
+the extra peak memory one request costs.
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+MODES = ("legacy", "full", "reduced")
+
+
+def legacy_decode(image_file):
+    import cv2
+    import numpy as np
+    from PIL import Image, ImageOps
+
+    image = Image.open(image_file)
+    image.load()
+    image = ImageOps.exif_transpose(image).convert("RGB")
+    return cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+
+
+def run_worker(path, mode):
+    from jackfruit import core
+
+    # Import the heavy modules before the baseline so only the decode is measured.
+    core._cv2()
+    core.np.zeros(1)
+
+    payload = BytesIO(Path(path).read_bytes())
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    if mode == "legacy":
+        image_cv = legacy_decode(payload)
+    else:
+        max_size = core.DECODE_SIZE if mode == "reduced" else None
+        image_cv = core.image_to_cv2_bgr(core.validate_uploaded_image(payload, max_size=max_size))
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        json.dumps(
+            {
+                "shape": list(image_cv.shape),
+                "ms": elapsed * 1000,
+                # ru_maxrss is reported in kilobytes on Linux.
+                "peak_delta_mb": (peak - baseline) / 1024,
+            }
+        )
+    )
+
+
+def make_samples(directory, width, height):
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    # Smooth noise compresses like a photo instead of like random bytes.
+    small = rng.integers(0, 256, size=(height // 16, width // 16, 3), dtype=np.uint8)
+    image = Image.fromarray(small).resize((width, height), Image.BILINEAR)
+    samples = {}
+    for image_format, suffix in (("JPEG", ".jpg"), ("PNG", ".png")):
+        path = Path(directory) / f"sample{suffix}"
+        image.save(path, image_format)
+        samples[image_format] = path
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="4000x3000", help="WIDTHxHEIGHT of the synthetic image")
+    parser.add_argument("--worker", nargs=2, metavar=("PATH", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(*args.worker)
+        return
+
+    width, height = (int(value) for value in args.size.lower().split("x"))
+    with tempfile.TemporaryDirectory() as directory:
+        samples = make_samples(directory, width, height)
+        print(f"{'format':>6} {'mode':>8} {'decoded':>12} {'ms':>8} {'peak RSS +MB':>13}")
+        for image_format, path in samples.items():
+            for mode in MODES:
+                completed = subprocess.run(
+                    [sys.executable, __file__, "--worker", str(path), mode],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                stats = json.loads(completed.stdout.strip().splitlines()[-1])
+                decoded = "x".join(str(value) for value in stats["shape"][1::-1])
+                print(
+                    f"{image_format:>6} {mode:>8} {decoded:>12} {stats['ms']:8.1f}"
+                    f" {stats['peak_delta_mb']:13.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare the in-memory and temp-file inference sources of run_model_inference.
+
+Usage: python benchmarks/bench_inference_source.py [--real-model] [--size 3000x4000]
+
+Without --real-model the YOLO model is replaced by a stub that only decodes its
+input the way the Ultralytics loader does (cv2.imread for paths, nothing for
+arrays), which isolates the per-request overhead of the temp-file round trip.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from jackfruit import core
+
+
+class DecodeOnlyModel:
+    def __call__(self, source, conf, save, imgsz):
+        if isinstance(source, str):
+            source = core._cv2().imread(source)
+        return [source.shape]
+
+
+def read_proc_io():
+    try:
+        with open("/proc/self/io") as proc_io:
+            return dict(
+                (key, int(value))
+                for key, value in (line.split(": ") for line in proc_io.read().splitlines())
+            )
+    except OSError:
+        return {}
+
+
+def bench(image_cv, source, repeats):
+    timings = []
+    io_before = read_proc_io()
+    for _ in range(repeats):
+        started = time.perf_counter()
+        core.run_model_inference(image_cv, 0.25, source=source)
+        timings.append(time.perf_counter() - started)
+    io_after = read_proc_io()
+    io_delta = {key: io_after[key] - io_before.get(key, 0) for key in io_after}
+    return np.array(timings) * 1000, io_delta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="3000x4000", help="HEIGHTxWIDTH of the synthetic image")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--real-model", action="store_true", help="run the actual YOLO model")
+    args = parser.parse_args()
+
+    height, width = (int(value) for value in args.size.lower().split("x"))
+    rng = np.random.default_rng(0)
+    image_cv = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+    if not args.real_model:
+        core.load_model = lambda: DecodeOnlyModel()
+
+    print(f"image {width}x{height}, {args.repeats} requests per source")
+    for source in ("file", "array"):
+        bench(image_cv, source, 1)
+        timings, io_delta = bench(image_cv, source, args.repeats)
+        per_request = {key: value / args.repeats for key, value in io_delta.items()}
+        print(
+            f"{source:>5}: p50 {np.percentile(timings, 50):8.2f} ms"
+            f"  p95 {np.percentile(timings, 95):8.2f} ms"
+            f"  read syscalls/req {per_request.get('syscr', float('nan')):6.1f}"
+            f"  write syscalls/req {per_request.get('syscw', float('nan')):6.1f}"
+            f"  bytes written/req {per_request.get('wchar', float('nan')):12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Per-rerun page payload and script time of the Streamlit app.
+
+Usage: python benchmarks/bench_page_payload.py [--reruns 20] [--baseline REV]
+
+Runs app.py headless with streamlit.testing and reports the serialized size
+of the markdown/HTML elements sent on each rerun, the script run time and
+the number of third-party URLs the page must fetch before it can paint
+(the old Google Fonts @import). --baseline runs app.py from a git revision
+as well, e.g. --baseline HEAD~1.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+os.environ.setdefault("JACKFRUIT_HISTORY_DB", "")
+
+from streamlit.testing.v1 import AppTest
+
+EXTERNAL_URL = re.compile(r"@import\s+url\(['\"]?https?://|<link[^>]+href=['\"]https?://")
+
+
+def measure(script_path, reruns):
+    app_test = AppTest.from_file(str(script_path), default_timeout=60)
+    app_test.run()
+    timings = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        app_test.run()
+        timings.append((time.perf_counter() - started) * 1000)
+    markdown = [element.proto for element in app_test.markdown]
+    return {
+        "payload_kb": sum(proto.ByteSize() for proto in markdown) / 1024,
+        "blocking_urls": sum(len(EXTERNAL_URL.findall(proto.body)) for proto in markdown),
+        "rerun_ms": statistics.median(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--baseline", help="git revision of app.py to compare against")
+    args = parser.parse_args()
+
+    runs = [("current", ROOT / "app.py")]
+    with tempfile.TemporaryDirectory() as directory:
+        if args.baseline:
+            source = subprocess.run(
+                ["git", "show", f"{args.baseline}:app.py"], cwd=ROOT, capture_output=True, text=True, check=True
+            ).stdout
+            baseline_path = Path(directory) / "app.py"
+            baseline_path.write_text(source)
+            runs.insert(0, (args.baseline, baseline_path))
+
+        print(f"{'app':>10} {'markdown KB/rerun':>18} {'blocking URLs':>14} {'rerun ms':>9}")
+        for label, path in runs:
+            stats = measure(path, args.reruns)
+            print(f"{label:>10} {stats['payload_kb']:18.1f} {stats['blocking_urls']:>14} {stats['rerun_ms']:9.1f}")
+    print(f"theme.css served once: {(ROOT / 'static' / 'theme.css').stat().st_size / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
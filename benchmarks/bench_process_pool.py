@@ -0,0 +1,94 @@
+"""Decode + detect throughput with a thread pool versus model worker processes.
+
+Usage: python benchmarks/bench_process_pool.py [--images 64] [--workers 4] [--real]
+
+Every image is a 4000x3000 JPEG upload that has to be validated, decoded,
+converted to BGR and run through the detector. The default simulated model
+holds the GIL for --model-ms per image, like the Python-side pre- and
+post-processing around a real forward pass; --real loads the configured
+checkpoint in every worker instead.
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+from PIL import Image
+
+from jackfruit import core, procpool
+
+
+class SimulatedModel:
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def __call__(self, images, conf, save, imgsz):
+        results = []
+        for _ in images:
+            deadline = time.perf_counter() + self.seconds
+            while time.perf_counter() < deadline:
+                pass
+            results.append(SimpleNamespace(boxes=SimpleNamespace(data=np.zeros((0, 6))), names={0: "jackfruit"}))
+        return results
+
+
+def simulated_model(seconds):
+    return SimulatedModel(seconds)
+
+
+def make_payload(width=4000, height=3000):
+    rng = np.random.default_rng(0)
+    small = rng.integers(0, 256, size=(height // 16, width // 16, 3), dtype=np.uint8)
+    payload = BytesIO()
+    Image.fromarray(small).resize((width, height), Image.BILINEAR).save(payload, "JPEG")
+    return payload.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--model-ms", type=float, default=50.0)
+    parser.add_argument("--real", action="store_true", help="use the configured model in every worker")
+    args = parser.parse_args()
+
+    # A partial of a module-level function pickles by reference for spawned workers.
+    model_factory = core.load_model if args.real else partial(simulated_model, args.model_ms / 1000)
+    payloads = [make_payload()] * args.images
+    model = model_factory()
+
+    def thread_task(payload):
+        image = core.validate_uploaded_image(BytesIO(payload), max_size=core.DECODE_SIZE)
+        return core._predict(model, [core.image_to_cv2_bgr(image)], core.DETECTION_FLOOR)
+
+    print(f"{args.images} uploads, {args.workers} workers")
+    print(f"{'mode':>10} {'images/s':>9}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(thread_task, payloads))
+    print(f"{'threads':>10} {args.images / (time.perf_counter() - started):9.1f}")
+
+    pool = procpool.ProcessInferencePool(args.workers, model_factory=model_factory)
+    try:
+        # The first call pays for process start-up and model loading.
+        pool.analyze_encoded(payloads[: args.workers], core.DETECTION_FLOOR, core.DECODE_SIZE)
+        started = time.perf_counter()
+        for start in range(0, len(payloads), core.BATCH_SIZE):
+            pool.analyze_encoded(payloads[start:start + core.BATCH_SIZE], core.DETECTION_FLOOR, core.DECODE_SIZE)
+        print(f"{'processes':>10} {args.images / (time.perf_counter() - started):9.1f}")
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Throughput of concurrent single-image requests with and without the inference scheduler.
+
+Usage: python benchmarks/bench_scheduler.py [--clients 16] [--requests 20] [--real]
+
+By default the model is simulated: a forward pass costs --fixed-ms plus
+--per-image-ms per image and, like a real YOLO instance, serves one caller at
+a time. --real runs the configured checkpoint on random 640x640 frames.
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from jackfruit import core, scheduler
+
+
+class SimulatedModel:
+    def __init__(self, fixed_ms, per_image_ms):
+        self.fixed = fixed_ms / 1000
+        self.per_image = per_image_ms / 1000
+        self._lock = threading.Lock()
+
+    def __call__(self, images, conf, save, imgsz):
+        images = images if isinstance(images, list) else [images]
+        with self._lock:
+            time.sleep(self.fixed + self.per_image * len(images))
+        return [None] * len(images)
+
+
+def drive(infer, clients, requests, frame):
+    latencies = []
+    lock = threading.Lock()
+
+    def client():
+        for _ in range(requests):
+            started = time.perf_counter()
+            infer(frame)
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    latencies = np.array(latencies) * 1000
+    return len(latencies) / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--fixed-ms", type=float, default=20.0)
+    parser.add_argument("--per-image-ms", type=float, default=5.0)
+    parser.add_argument("--real", action="store_true", help="use the configured model instead of a simulation")
+    args = parser.parse_args()
+
+    def make_model(index):
+        if args.real:
+            return core.load_model() if index == 0 else core.build_model()
+        return SimulatedModel(args.fixed_ms, args.per_image_ms)
+
+    model = make_model(0)
+    if args.real:
+        frame = np.random.default_rng(0).integers(0, 256, (640, 640, 3), dtype=np.uint8)
+    else:
+        frame = np.zeros((640, 640, 3), dtype=np.uint8)
+
+    def direct(image_cv):
+        return model(image_cv, imgsz=core.IMAGE_SIZE, conf=core.DETECTION_FLOOR, save=False)
+
+    inference = scheduler.InferenceScheduler(
+        core._predict,
+        lambda index: model if index == 0 else make_model(index),
+        workers=args.workers,
+        max_batch_size=core.BATCH_SIZE,
+    )
+
+    print(f"{args.clients} clients x {args.requests} requests")
+    print(f"{'mode':>10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for mode, infer in (
+        ("direct", direct),
+        ("scheduler", lambda image_cv: inference.run([image_cv], core.DETECTION_FLOOR)),
+    ):
+        rps, p50, p95 = drive(infer, args.clients, args.requests, frame)
+        print(f"{mode:>10} {rps:8.1f} {p50:8.1f} {p95:8.1f}")
+
+    stats = inference.stats()
+    print(
+        f"scheduler: {stats['batches']} batches, avg size {stats['avg_batch_size']:.1f}, "
+        f"queue wait p95 {stats['wait_p95_ms']:.1f} ms"
+    )
+    inference.close()
+
+
+if __name__ == "__main__":
+    main()
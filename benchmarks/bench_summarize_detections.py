@@ -0,0 +1,78 @@
+"""Micro-benchmark summarize_detections against the per-box Python loop.
+
+Usage: python benchmarks/bench_summarize_detections.py [--repeats 200]
+
+Boxes are torch tensors (on CUDA when available) if torch is installed, so the
+loop pays the same per-element indexing and device transfers as with real
+Ultralytics results; otherwise NumPy arrays stand in for them.
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from jackfruit import core
+
+
+class FakeBoxes:
+    def __init__(self, cls, conf):
+        self.cls = cls
+        self.conf = conf
+
+    def __len__(self):
+        return len(self.cls)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield FakeBoxes(self.cls[index:index + 1], self.conf[index:index + 1])
+
+
+def loop_summarize(boxes, confidence_threshold, target_class_id=0):
+    jackfruit_count = 0
+    confidences = []
+    for box in boxes:
+        class_id = int(box.cls[0])
+        conf_score = float(box.conf[0])
+        if class_id == target_class_id and conf_score >= confidence_threshold:
+            jackfruit_count += 1
+            confidences.append(conf_score)
+    return jackfruit_count, confidences
+
+
+def make_boxes(count, rng):
+    cls = rng.integers(0, 2, size=count).astype(np.float32)
+    conf = rng.random(count, dtype=np.float32)
+    try:
+        import torch
+    except ImportError:
+        return FakeBoxes(cls, conf), "numpy"
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    return FakeBoxes(torch.from_numpy(cls).to(device), torch.from_numpy(conf).to(device)), f"torch/{device}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for count in (10, 100, 1000):
+        boxes, backend = make_boxes(count, rng)
+        assert loop_summarize(boxes, 0.25) == core.summarize_detections(boxes, 0.25)
+        loop_time = timeit.timeit(lambda: loop_summarize(boxes, 0.25), number=args.repeats)
+        vector_time = timeit.timeit(lambda: core.summarize_detections(boxes, 0.25), number=args.repeats)
+        print(
+            f"{count:5d} boxes ({backend}): loop {loop_time / args.repeats * 1e6:9.1f} us"
+            f"  vectorized {vector_time / args.repeats * 1e6:8.1f} us"
+            f"  speedup {loop_time / vector_time:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Video mode throughput and peak memory for short and long clips.
+
+Usage: python benchmarks/bench_video.py [--seconds 10 60] [--stride 5] [--simulate]
+
+A synthetic 1280x720 clip with drifting "fruit" is written for each length
+and analyzed in a fresh interpreter, reporting frames/s and peak RSS. Peak
+RSS should not grow with the clip length. --simulate replaces the detector
+with a threshold on the synthetic frames so only decode, frame selection
+and tracking are measured.
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from jackfruit import core, video
+
+FPS = 25
+SIZE = (1280, 720)
+
+
+def write_clip(path, seconds):
+    cv2 = core._cv2()
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), FPS, SIZE)
+    frame = np.zeros((SIZE[1], SIZE[0], 3), dtype=np.uint8)
+    for index in range(seconds * FPS):
+        frame[:] = 30
+        for fruit in range(5):
+            x = (index * 4 + fruit * 250) % (SIZE[0] - 80)
+            frame[200 + fruit * 80:260 + fruit * 80, x:x + 60] = 220
+        writer.write(frame)
+    writer.release()
+
+
+def simulated_detect_images(images_cv, floor_threshold):
+    detections = []
+    for image_cv in images_cv:
+        mask = image_cv[:, :, 1] > 128
+        rows = np.flatnonzero(mask.any(axis=1))
+        boxes = []
+        for band in np.split(rows, np.flatnonzero(np.diff(rows) > 1) + 1) if rows.size else []:
+            xs = np.flatnonzero(mask[band[0]])
+            boxes.append([xs.min(), band[0], xs.max(), band[-1], 0.9, 0])
+        detections.append((np.array(boxes, dtype=np.float32).reshape(-1, 6), {0: "jackfruit"}))
+    return detections
+
+
+def run_worker(path, stride, simulate):
+    if simulate:
+        core.detect_images = simulated_detect_images
+    final = None
+    for final in video.analyze_video(path, 0.25, stride=stride):
+        pass
+    print(
+        json.dumps(
+            {
+                "frames": final["frames_read"],
+                "detected": final["frames_detected"],
+                "unique": final["unique_count"],
+                "fps": final["fps"],
+                # ru_maxrss is reported in kilobytes on Linux.
+                "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=int, nargs="+", default=[10, 60])
+    parser.add_argument("--stride", type=int, default=video.VIDEO_FRAME_STRIDE)
+    parser.add_argument("--simulate", action="store_true", help="skip the model")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.stride, args.simulate)
+        return
+
+    print(f"{'seconds':>8} {'frames':>7} {'analyzed':>9} {'unique':>7} {'frames/s':>9} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for seconds in args.seconds:
+            path = Path(directory) / f"clip-{seconds}s.avi"
+            write_clip(path, seconds)
+            command = [sys.executable, __file__, "--worker", str(path), "--stride", str(args.stride)]
+            if args.simulate:
+                command.append("--simulate")
+            completed = subprocess.run(command, capture_output=True, text=True, check=True)
+            stats = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(
+                f"{seconds:>8} {stats['frames']:>7} {stats['detected']:>9} {stats['unique']:>7}"
+                f" {stats['fps']:9.1f} {stats['peak_mb']:8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
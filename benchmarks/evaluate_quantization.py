@@ -0,0 +1,86 @@
+"""Compare the fp32 and int8 model variants on a labelled image folder.
+
+Usage: python benchmarks/evaluate_quantization.py DATASET [--variants fp32 int8]
+
+DATASET holds images/ and YOLO-format labels/ (one "class cx cy w h" line per
+fruit, normalised to the image size, same file stem as the image). For each
+variant the script reports the mean absolute count error at --conf, mAP@0.5,
+mAP@0.5:0.95 and per-image inference latency.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from jackfruit import core, evaluation
+from jackfruit.cli import iter_image_paths
+
+
+def evaluate_variant(variant, samples, conf, map_conf):
+    core.MODEL_VARIANT = variant
+    core.load_model.cache_clear()
+    core.load_model()
+
+    pairs, count_errors, timings = [], [], []
+    for image_cv, labels in samples:
+        started = time.perf_counter()
+        result = core.run_model_inference(image_cv, map_conf)
+        timings.append(time.perf_counter() - started)
+        predictions, _ = core.result_to_detections(result)
+        predictions = np.asarray(predictions, dtype=np.float64).reshape(-1, 6)
+        pairs.append((predictions, labels))
+        count, _ = core.summarize_raw_detections(predictions, conf)
+        count_errors.append(abs(count - int(np.sum(labels[:, 4] == 0))))
+
+    timings = np.array(timings) * 1000
+    return {
+        "variant": variant,
+        "count_mae": float(np.mean(count_errors)),
+        **evaluation.mean_average_precision(pairs),
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p95_ms": float(np.percentile(timings, 95)),
+    }
+
+
+def load_samples(dataset, limit):
+    samples = []
+    for path in list(iter_image_paths([str(dataset / "images")]))[:limit]:
+        with open(path, "rb") as image_file:
+            image = core.validate_uploaded_image(image_file)
+        width, height = image.size
+        labels = evaluation.load_yolo_labels(dataset / "labels" / f"{Path(path).stem}.txt", width, height)
+        samples.append((core.image_to_cv2_bgr(image), labels))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dataset", type=Path)
+    parser.add_argument("--variants", nargs="+", default=["fp32", "int8"])
+    parser.add_argument("--conf", type=float, default=0.25, help="threshold used for counting")
+    parser.add_argument("--map-conf", type=float, default=0.01, help="threshold used for mAP")
+    parser.add_argument("--limit", type=int, default=None, help="evaluate at most this many images")
+    args = parser.parse_args()
+
+    samples = load_samples(args.dataset, args.limit)
+    if not samples:
+        parser.error(f"no images found under {args.dataset / 'images'}")
+
+    print(f"{len(samples)} images, counting at conf >= {args.conf}")
+    print(f"{'variant':>8} {'count MAE':>10} {'mAP50':>7} {'mAP50-95':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for variant in args.variants:
+        stats = evaluate_variant(variant, samples, args.conf, args.map_conf)
+        print(
+            f"{stats['variant']:>8} {stats['count_mae']:10.3f} {stats['map50']:7.3f}"
+            f" {stats['map50_95']:9.3f} {stats['p50_ms']:8.1f} {stats['p95_ms']:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
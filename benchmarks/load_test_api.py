@@ -0,0 +1,146 @@
+"""Load test for the HTTP API: latency percentiles and requests per second.
+
+Usage: python benchmarks/load_test_api.py [--url http://127.0.0.1:8000] [--concurrency 16] [--requests 400]
+
+Without --url the script starts ``jackfruit-api`` on a free local port with
+the result cache disabled, waits for /health, and stops the server afterwards.
+Against an existing --url server, whose cache cannot be switched off, every
+request sends freshly seeded images instead, so no request is a cache hit.
+Requests post synthetic 1920x1080 JPEGs to /v1/detect (or --batch images to
+/v1/detect/batch). No external services are contacted.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from io import BytesIO
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx
+import numpy as np
+from PIL import Image
+
+
+def make_payload(width=1920, height=1080, seed=0):
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 256, size=(height // 16, width // 16, 3), dtype=np.uint8)
+    payload = BytesIO()
+    Image.fromarray(small).resize((width, height), Image.BILINEAR).save(payload, "JPEG")
+    return payload.getvalue()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port):
+    # Repeated payloads would otherwise be served from the result cache.
+    env = {**os.environ, "JACKFRUIT_RESULT_CACHE_SIZE": "0"}
+    env.pop("JACKFRUIT_RESULT_CACHE_DIR", None)
+    server = subprocess.Popen(
+        [sys.executable, "-c", "import sys; from jackfruit.api import main; sys.exit(main(sys.argv[1:]))",
+         "--port", str(port)],
+        cwd=ROOT,
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.perf_counter() + 60
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return server, url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("The API server did not become healthy within 60 seconds.")
+
+
+async def run_load(url, payload, concurrency, requests, batch, conf, seeded=False):
+    """Send ``requests`` (request indices); ``seeded`` gives each one its own images."""
+    latencies, statuses = [], Counter()
+    remaining = iter(requests)
+    endpoint = f"{url}/v1/detect/batch" if batch > 1 else f"{url}/v1/detect"
+
+    async def request_files(request):
+        payloads = [payload] * batch
+        if seeded:
+            # Encoded off the event loop and before the timer starts.
+            payloads = await asyncio.gather(
+                *(asyncio.to_thread(make_payload, seed=request * batch + index + 1) for index in range(batch))
+            )
+        if batch > 1:
+            return [("files", (f"image-{index}.jpg", data, "image/jpeg")) for index, data in enumerate(payloads)]
+        return {"file": ("image.jpg", payloads[0], "image/jpeg")}
+
+    async def worker(client):
+        for request in remaining:
+            files = await request_files(request)
+            started = time.perf_counter()
+            try:
+                response = await client.post(endpoint, params={"conf": conf}, files=files)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as exc:
+                statuses[type(exc).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return np.array(latencies) * 1000, elapsed, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="existing server to test instead of starting one")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--warmup", type=int, default=8, help="requests sent before measuring")
+    parser.add_argument("--batch", type=int, default=1, help="images per request (uses /v1/detect/batch)")
+    parser.add_argument("--conf", type=float, default=0.25)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server, url = start_server(free_port())
+    try:
+        payload = make_payload()
+        seeded = server is None
+        warmup_requests = range(args.warmup)
+        measured_requests = range(args.warmup, args.warmup + args.requests)
+        asyncio.run(
+            run_load(url, payload, min(args.concurrency, args.warmup), warmup_requests, args.batch, args.conf, seeded)
+        )
+        latencies, elapsed, statuses = asyncio.run(
+            run_load(url, payload, args.concurrency, measured_requests, args.batch, args.conf, seeded)
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{args.requests} requests x {args.batch} image(s), concurrency {args.concurrency}")
+    if seeded:
+        print("result cache: bypassed with distinct seeded images per request (external server)")
+    else:
+        print("result cache: disabled on the started server (JACKFRUIT_RESULT_CACHE_SIZE=0, no cache dir)")
+    print(f"status codes: {dict(statuses)}")
+    print(f"p50 {p50:.1f} ms  p95 {p95:.1f} ms  p99 {p99:.1f} ms")
+    print(f"{args.requests / elapsed:.1f} requests/s, {args.requests * args.batch / elapsed:.1f} images/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Reusable building blocks for the Jackfruit detector app."""
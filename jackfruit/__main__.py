@@ -0,0 +1,5 @@
+import sys
+
+from jackfruit.cli import main
+
+sys.exit(main())
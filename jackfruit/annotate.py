@@ -0,0 +1,91 @@
+"""Native box renderer for detection results.
+
+Draws only the boxes that are counted (target class, above the confidence
+threshold) onto one copy of an RGB frame, optionally downscaled first, so the
+UI no longer needs ``Results.plot()`` plus a BGR-to-RGB conversion.
+"""
+import os
+
+from jackfruit import core, metrics
+from jackfruit.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# Longest edge of the rendered image in pixels; 0 renders at full resolution.
+ANNOTATION_MAX_SIZE = int(os.getenv("JACKFRUIT_ANNOTATION_MAX_SIZE", "1920"))
+BOX_COLOR = (255, 56, 56)
+LABEL_COLOR = (255, 255, 255)
+
+
+def counted_detections(boxes, confidence_threshold, target_class_id=0):
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 6)
+    keep = np.isin(boxes[:, 5], np.atleast_1d(target_class_id)) & (boxes[:, 4] >= confidence_threshold)
+    return boxes[keep]
+
+
+@metrics.timed("render")
+def render_detections(
+    image,
+    boxes,
+    names,
+    confidence_threshold,
+    target_class_id=0,
+    max_size=None,
+    count_only=False,
+    channels="RGB",
+):
+    """Return ``(count, confidences, rendered)``.
+
+    ``image`` is an array in ``channels`` order and is never modified.
+    ``rendered`` is a new RGB uint8 array, or None when ``count_only`` is set.
+    """
+    kept = counted_detections(boxes, confidence_threshold, target_class_id)
+    confidences = kept[:, 4].tolist()
+    if count_only:
+        return len(kept), confidences, None
+
+    cv2 = core._cv2()
+    max_size = ANNOTATION_MAX_SIZE if max_size is None else max_size
+    height, width = image.shape[:2]
+    scale = max_size / max(height, width) if max_size and max(height, width) > max_size else 1.0
+    # Exactly one full-frame pass creates the RGB canvas: the downscale, the
+    # BGR-to-RGB conversion or a plain copy.
+    if scale < 1.0:
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        source = image
+        factor = int(1 / scale)
+        if factor >= 2:
+            # INTER_AREA is only fast for integer factors; finish bilinearly.
+            source = cv2.resize(image, (width // factor, height // factor), interpolation=cv2.INTER_AREA)
+        canvas = cv2.resize(source, size, interpolation=cv2.INTER_LINEAR)
+        if channels == "BGR":
+            cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB, dst=canvas)
+    elif channels == "BGR":
+        canvas = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    else:
+        canvas = np.array(image, dtype=np.uint8, order="C")
+
+    thickness = max(round(sum(canvas.shape[:2]) / 2 * 0.003), 2)
+    font_scale = thickness / 3
+    font_thickness = max(thickness - 1, 1)
+    for x1, y1, x2, y2, confidence, class_id in kept:
+        top_left = (int(x1 * scale), int(y1 * scale))
+        cv2.rectangle(canvas, top_left, (int(x2 * scale), int(y2 * scale)), BOX_COLOR, thickness, cv2.LINE_AA)
+        label = f"{names.get(int(class_id), int(class_id))} {confidence:.2f}"
+        (text_width, text_height), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, font_thickness)
+        # Put the label above the box, or inside it at the top edge of the frame.
+        outside = top_left[1] >= text_height + 3
+        label_bottom = top_left[1] - 2 if outside else top_left[1] + text_height + 2
+        cv2.rectangle(
+            canvas,
+            (top_left[0], label_bottom - text_height - 2),
+            (top_left[0] + text_width, label_bottom + 2),
+            BOX_COLOR,
+            -1,
+            cv2.LINE_AA,
+        )
+        cv2.putText(
+            canvas, label, (top_left[0], label_bottom), cv2.FONT_HERSHEY_SIMPLEX,
+            font_scale, LABEL_COLOR, font_thickness, cv2.LINE_AA,
+        )
+    return len(kept), confidences, canvas
@@ -0,0 +1,191 @@
+"""HTTP inference API: ``jackfruit-api`` or ``uvicorn jackfruit.api:app``.
+
+Requires the extras in ``requirements-api.txt``. Decoding and inference run
+in a thread pool so the event loop keeps accepting requests.
+"""
+import argparse
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, nullcontext
+from functools import lru_cache, partial
+from io import BytesIO
+
+from fastapi import FastAPI, File, HTTPException, Query, UploadFile
+from fastapi.responses import PlainTextResponse
+
+from jackfruit import core, metrics, warmup
+
+API_WORKERS = int(os.getenv("JACKFRUIT_API_WORKERS", str(min(8, os.cpu_count() or 1))))
+MAX_UPLOAD_BYTES = int(os.getenv("JACKFRUIT_MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+MAX_BATCH_FILES = int(os.getenv("JACKFRUIT_API_MAX_BATCH_FILES", "64"))
+
+# Without the scheduler or the process pool every executor thread would call
+# the one shared model instance, which is not thread-safe.
+_MODEL_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def api_executor():
+    return ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="jackfruit-api")
+
+
+def _model_guard():
+    if not core.model_runtime_available():
+        raise RuntimeError("Model inference dependencies are not installed on this server.")
+    # Do not load a second copy of the model while the preload is running.
+    if warmup.model_warmup().status == "warming":
+        warmup.model_warmup().wait()
+    if core.inference_scheduler() is not None or core.process_pool() is not None:
+        return nullcontext()
+    return _MODEL_LOCK
+
+
+def _decode(data, tiled):
+    image = core.validate_uploaded_image(BytesIO(data), max_size=None if tiled else core.DECODE_SIZE)
+    return image.info["original_size"], image.size, core.image_to_cv2_bgr(image)
+
+
+def detection_payload(boxes, names, confidence_threshold, original_size, decoded_size):
+    count, confidences = core.summarize_raw_detections(boxes, confidence_threshold)
+    # Boxes are reported in the pixel coordinates of the uploaded image.
+    scale_x = original_size[0] / decoded_size[0]
+    scale_y = original_size[1] / decoded_size[1]
+    kept = core.threshold_detections(boxes, confidence_threshold)
+    return {
+        "count": count,
+        "width": original_size[0],
+        "height": original_size[1],
+        "confidence": core.confidence_summary(confidences),
+        "boxes": [
+            {
+                "x1": round(float(x1) * scale_x, 2),
+                "y1": round(float(y1) * scale_y, 2),
+                "x2": round(float(x2) * scale_x, 2),
+                "y2": round(float(y2) * scale_y, 2),
+                "confidence": round(float(conf), 4),
+                "class_id": int(class_id),
+                "class_name": names.get(int(class_id), str(int(class_id))),
+            }
+            for x1, y1, x2, y2, conf, class_id in kept.tolist()
+        ],
+        "model_revision": core.MODEL_REVISION,
+    }
+
+
+def analyze_bytes(data, confidence_threshold, tiled=False):
+    original_size, decoded_size, image_cv = _decode(data, tiled)
+    floor_threshold = min(core.DETECTION_FLOOR, confidence_threshold)
+    with _model_guard():
+        if tiled:
+            boxes, names = core.run_tiled_detection(image_cv, floor_threshold)
+        else:
+            boxes, names = core.run_raw_detection(image_cv, floor_threshold)
+    return detection_payload(boxes, names, confidence_threshold, original_size, decoded_size)
+
+
+def analyze_batch(items, confidence_threshold):
+    floor_threshold = min(core.DETECTION_FLOOR, confidence_threshold)
+    results = []
+    # Decode and detect one model batch at a time so only BATCH_SIZE decoded
+    # images are held at once.
+    for chunk in core.iter_batches(items, core.BATCH_SIZE):
+        decoded = []
+        for name, data in chunk:
+            try:
+                decoded.append((name, *_decode(data, tiled=False), None))
+            except core.ImageValidationError as exc:
+                decoded.append((name, None, None, None, str(exc)))
+
+        images_cv = [image_cv for _, _, _, image_cv, error in decoded if error is None]
+        with _model_guard():
+            detections = iter(core.run_raw_batch_detection(images_cv, floor_threshold))
+
+        for name, original_size, decoded_size, _, error in decoded:
+            if error is not None:
+                results.append({"name": name, "error": error})
+                continue
+            boxes, names = next(detections)
+            payload = detection_payload(boxes, names, confidence_threshold, original_size, decoded_size)
+            results.append({"name": name, "error": None, **payload})
+    return results
+
+
+async def _read_upload(upload):
+    data = await upload.read(MAX_UPLOAD_BYTES + 1)
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"{upload.filename} is larger than {MAX_UPLOAD_BYTES:,} bytes.")
+    return data
+
+
+async def _run(function, *args):
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(api_executor(), partial(function, *args))
+    except core.ImageValidationError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except ValueError as exc:
+        # Any other ValueError is a server configuration problem, such as an
+        # unsupported model variant or backend.
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        # Raised when the inference queue is full or the model is unavailable.
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    if warmup.PRELOAD_MODEL and core.model_runtime_available():
+        warmup.model_warmup().start()
+    yield
+
+
+app = FastAPI(title="Jackfruit detector", lifespan=lifespan)
+
+
+@app.get("/health")
+async def health():
+    return {
+        "status": "ok",
+        "model_runtime": core.model_runtime_available(),
+        "model_revision": core.MODEL_REVISION,
+        "warmup": warmup.model_warmup().status if warmup.PRELOAD_MODEL else "disabled",
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.REGISTRY.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/v1/detect")
+async def detect(
+    file: UploadFile = File(...),
+    conf: float = Query(0.25, ge=0.0, le=1.0),
+    tiled: bool = False,
+):
+    data = await _read_upload(file)
+    return await _run(analyze_bytes, data, conf, tiled)
+
+
+@app.post("/v1/detect/batch")
+async def detect_batch(
+    files: list[UploadFile] = File(...),
+    conf: float = Query(0.25, ge=0.0, le=1.0),
+):
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_FILES} files can be sent per request.")
+    items = [(upload.filename, await _read_upload(upload)) for upload in files]
+    return {"results": await _run(analyze_batch, items, conf)}
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(prog="jackfruit-api", description="Serve jackfruit counts over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+    uvicorn.run(app, host=args.host, port=args.port)
+    return 0
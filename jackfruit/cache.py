@@ -0,0 +1,138 @@
+"""Content-addressed cache for raw detection results.
+
+The optional SQLite tier is best effort: a locked, read-only or full database
+is logged and treated as a miss, never as a failed detection.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import closing
+from pathlib import Path
+
+from jackfruit.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+DETECTION_COLUMNS = 6
+
+logger = logging.getLogger(__name__)
+
+
+def image_digest(image):
+    pixels = np.ascontiguousarray(image)
+    digest = hashlib.sha256()
+    digest.update(f"{pixels.dtype.str}:{pixels.shape}".encode())
+    digest.update(memoryview(pixels).cast("B"))
+    return digest.hexdigest()
+
+
+def cache_key(image, *parts):
+    return ":".join([image_digest(image), *(str(part) for part in parts)])
+
+
+class DetectionCache:
+    def __init__(self, max_entries=128, cache_dir=None, max_disk_entries=10000):
+        if max_entries < 0 or max_disk_entries < 0:
+            raise ValueError("max_entries and max_disk_entries must be zero or positive.")
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.db_path = Path(cache_dir) / "detections.sqlite3" if cache_dir else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if self.db_path is not None:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                with closing(self._connect()) as connection, connection:
+                    # WAL lets other processes read while one of them writes.
+                    connection.execute("PRAGMA journal_mode=WAL")
+                    connection.execute(
+                        "CREATE TABLE IF NOT EXISTS detections ("
+                        "key TEXT PRIMARY KEY, boxes BLOB NOT NULL, names TEXT NOT NULL)"
+                    )
+            except (OSError, sqlite3.Error) as exc:
+                logger.warning("Detection cache disabled on disk (%s): %s", self.db_path, exc)
+                self.db_path = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key, boxes, names):
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, DETECTION_COLUMNS)
+        names = {int(class_id): str(name) for class_id, name in dict(names).items()}
+        entry = (boxes, names)
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.db_path is not None:
+            try:
+                with closing(self._connect()) as connection, connection:
+                    connection.execute("DELETE FROM detections")
+            except sqlite3.Error as exc:
+                logger.warning("Could not clear the detection cache on disk: %s", exc)
+
+    def _remember(self, key, entry):
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def _read_disk(self, key):
+        if self.db_path is None:
+            return None
+        try:
+            with closing(self._connect()) as connection:
+                row = connection.execute(
+                    "SELECT boxes, names FROM detections WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Detection cache read failed, treating it as a miss: %s", exc)
+            return None
+        if row is None:
+            return None
+        boxes = np.frombuffer(row[0], dtype=np.float32).reshape(-1, DETECTION_COLUMNS).copy()
+        names = {int(class_id): name for class_id, name in json.loads(row[1]).items()}
+        return boxes, names
+
+    def _write_disk(self, key, entry):
+        if self.db_path is None:
+            return
+        boxes, names = entry
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO detections (key, boxes, names) VALUES (?, ?, ?)",
+                    (key, boxes.tobytes(), json.dumps(names)),
+                )
+                if self.max_disk_entries:
+                    # A replaced row gets a new rowid, so rowid order is write order.
+                    connection.execute(
+                        "DELETE FROM detections WHERE rowid < "
+                        "(SELECT rowid FROM detections ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+                        (self.max_disk_entries - 1,),
+                    )
+        except sqlite3.Error as exc:
+            logger.warning("Detection cache write skipped: %s", exc)
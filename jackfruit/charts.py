@@ -0,0 +1,58 @@
+"""Constant-size chart data for long detection histories."""
+import os
+
+from jackfruit.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+TREND_POINTS = int(os.getenv("JACKFRUIT_TREND_POINTS", "200"))
+HISTOGRAM_BINS = int(os.getenv("JACKFRUIT_HISTOGRAM_BINS", "30"))
+
+
+def lttb(x, y, threshold=None):
+    """Largest-Triangle-Three-Buckets downsampling to at most ``threshold`` points.
+
+    Keeps the first and last point and, from each bucket in between, the point
+    forming the largest triangle with its neighbours, so peaks survive.
+    """
+    threshold = TREND_POINTS if threshold is None else threshold
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if threshold >= len(x) or threshold < 3:
+        return x, y
+
+    edges = np.linspace(1, len(x) - 1, threshold - 1).astype(int)
+    selected = [0]
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else len(x)
+        # Average of the next bucket (the last point for the final bucket).
+        next_x = x[end:next_end].mean() if end < next_end else x[-1]
+        next_y = y[end:next_end].mean() if end < next_end else y[-1]
+        previous = selected[-1]
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        selected.append(start + int(np.argmax(areas)))
+    selected.append(len(x) - 1)
+    return x[selected], y[selected]
+
+
+def bin_frequencies(frequencies, max_bins=None):
+    """Turn {count: occurrences} into at most ``max_bins`` bars (centers, heights, width)."""
+    max_bins = HISTOGRAM_BINS if max_bins is None else max_bins
+    if not frequencies:
+        return [], [], 1
+    values = sorted(frequencies)
+    if len(values) <= max_bins and values[-1] - values[0] < max_bins:
+        return values, [frequencies[value] for value in values], 1
+
+    low, high = values[0], values[-1]
+    width = max(1, int(np.ceil((high - low + 1) / max_bins)))
+    heights = {}
+    for value in values:
+        start = low + (value - low) // width * width
+        heights[start] = heights.get(start, 0) + frequencies[value]
+    starts = sorted(heights)
+    return [start + (width - 1) / 2 for start in starts], [heights[start] for start in starts], width
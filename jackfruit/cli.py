@@ -0,0 +1,233 @@
+"""Headless bulk detection: ``jackfruit-detect PATH_OR_GLOB ... -o results.jsonl``."""
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from jackfruit import core
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff"}
+CSV_FIELDS = [
+    "path",
+    "count",
+    "avg_conf",
+    "min_conf",
+    "max_conf",
+    "width",
+    "height",
+    "model_revision",
+    "error",
+]
+# Decoding runs in parallel across thread workers, but a YOLO model instance
+# must not be called from several threads at once.
+_MODEL_LOCK = threading.Lock()
+
+
+def iter_image_paths(inputs):
+    seen = set()
+    for pattern in inputs:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates = sorted(path.rglob("*"))
+        elif path.is_file():
+            candidates = [path]
+        else:
+            candidates = sorted(Path(match) for match in glob.glob(pattern, recursive=True))
+        for candidate in candidates:
+            if candidate.is_file() and candidate.suffix.lower() in IMAGE_SUFFIXES:
+                key = str(candidate)
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+
+def truncate_partial_line(output_path):
+    """Drop a partially written last line left by an interrupted run."""
+    if not os.path.exists(output_path):
+        return
+    with open(output_path, "rb+") as output:
+        size = output.seek(0, os.SEEK_END)
+        position = size
+        while position > 0:
+            chunk_start = max(0, position - 65536)
+            output.seek(chunk_start)
+            chunk = output.read(position - chunk_start)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                position = chunk_start + newline + 1
+                break
+            position = chunk_start
+        if position != size:
+            output.truncate(position)
+
+
+def read_completed_paths(output_path, output_format):
+    if not os.path.exists(output_path):
+        return set()
+    # The partial row is retried, so it must not be counted or appended to.
+    truncate_partial_line(output_path)
+    with open(output_path, newline="", encoding="utf-8") as output:
+        if output_format == "csv":
+            return {row["path"] for row in csv.DictReader(output) if row.get("path")}
+        completed = set()
+        for line in output:
+            try:
+                completed.add(json.loads(line)["path"])
+            except (ValueError, KeyError):
+                continue
+        return completed
+
+
+def analyze_image_paths(paths, confidence_threshold, tiled=False):
+    prepared = []
+    for path in paths:
+        try:
+            with open(path, "rb") as image_file:
+                image = core.validate_uploaded_image(
+                    image_file, max_size=None if tiled else core.DECODE_SIZE
+                )
+            prepared.append((path, image.info["original_size"], core.image_to_cv2_bgr(image), None))
+        except (OSError, ValueError) as exc:
+            prepared.append((path, (None, None), None, str(exc)))
+
+    images_cv = [image_cv for _, _, image_cv, _ in prepared if image_cv is not None]
+    with _MODEL_LOCK:
+        if tiled:
+            detections = [core.run_tiled_detection(image_cv, confidence_threshold) for image_cv in images_cv]
+        else:
+            detections = core.run_raw_batch_detection(images_cv, confidence_threshold)
+    detections = iter(detections)
+
+    rows = []
+    for path, (width, height), image_cv, error in prepared:
+        row = {
+            "path": path,
+            "count": None,
+            "avg_conf": None,
+            "min_conf": None,
+            "max_conf": None,
+            "width": width,
+            "height": height,
+            "model_revision": core.MODEL_REVISION,
+            "error": error,
+        }
+        if image_cv is not None:
+            boxes, _ = next(detections)
+            count, confidences = core.summarize_raw_detections(boxes, confidence_threshold)
+            stats = core.confidence_summary(confidences)
+            row.update(
+                count=count,
+                avg_conf=stats["avg_conf"],
+                min_conf=stats["min_conf"],
+                max_conf=stats["max_conf"],
+            )
+        rows.append(row)
+    return rows
+
+
+class ResultWriter:
+    def __init__(self, output_path, output_format):
+        self.output_format = output_format
+        truncate_partial_line(output_path)
+        is_new = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        self._file = open(output_path, "a", newline="", encoding="utf-8")
+        if output_format == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+            if is_new:
+                self._csv.writeheader()
+
+    def write(self, rows):
+        for row in rows:
+            if self.output_format == "csv":
+                self._csv.writerow(row)
+            else:
+                self._file.write(json.dumps(row) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="jackfruit-detect",
+        description="Count jackfruits in image folders without the Streamlit UI.",
+    )
+    parser.add_argument("inputs", nargs="+", help="image files, directories or glob patterns")
+    parser.add_argument("-o", "--output", required=True, help="JSONL or CSV file to append results to")
+    parser.add_argument(
+        "--format",
+        choices=("jsonl", "csv"),
+        help="output format (default: inferred from the output suffix)",
+    )
+    parser.add_argument("--conf", type=float, default=0.25, help="confidence threshold")
+    parser.add_argument("--batch-size", type=int, default=core.BATCH_SIZE, help="images per forward pass")
+    parser.add_argument("--workers", type=int, default=1, help="number of parallel workers")
+    parser.add_argument(
+        "--executor",
+        choices=("thread", "process"),
+        default="thread",
+        help="worker pool type; process workers each load their own model",
+    )
+    parser.add_argument("--tiled", action="store_true", help="use tiled inference for large images")
+    parser.add_argument(
+        "--no-resume",
+        dest="resume",
+        action="store_false",
+        help="reprocess images that already appear in the output file",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    output_format = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+
+    completed = read_completed_paths(args.output, output_format) if args.resume else set()
+    paths = [path for path in iter_image_paths(args.inputs) if path not in completed]
+    if completed:
+        print(f"Skipping {len(completed)} images already in {args.output}", file=sys.stderr)
+    if not paths:
+        print("No images left to process.", file=sys.stderr)
+        return 0
+
+    executor_class = ProcessPoolExecutor if args.executor == "process" else ThreadPoolExecutor
+    batches = core.iter_batches(paths, args.batch_size)
+    writer = ResultWriter(args.output, output_format)
+    processed = 0
+    try:
+        with executor_class(max_workers=max(1, args.workers)) as executor:
+            # Keep a bounded number of batches in flight so results stream to
+            # disk and memory stays flat for arbitrarily large folders.
+            pending = set()
+            for batch in batches:
+                pending.add(executor.submit(analyze_image_paths, batch, args.conf, args.tiled))
+                if len(pending) >= 2 * max(1, args.workers):
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    processed += _write_done(writer, done)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                processed += _write_done(writer, done)
+    finally:
+        writer.close()
+
+    print(f"Processed {processed} images into {args.output}", file=sys.stderr)
+    return 0
+
+
+def _write_done(writer, futures):
+    written = 0
+    for future in futures:
+        rows = future.result()
+        writer.write(rows)
+        written += len(rows)
+    return written
+
+
+if __name__ == "__main__":
+    sys.exit(main())
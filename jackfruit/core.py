@@ -0,0 +1,613 @@
+"""Detection pipeline shared by the Streamlit app and the batch CLI."""
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import lru_cache
+from importlib import import_module
+from pathlib import Path
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from jackfruit import metrics, model_store, scheduler
+from jackfruit.cache import DetectionCache, cache_key
+from jackfruit.lazy import lazy_import, module_available
+
+np = lazy_import("numpy")
+
+MODEL_REPO_ID = os.getenv("JACKFRUIT_MODEL_REPO_ID", "theashish03/jackfruit")
+MODEL_FILENAME = os.getenv("JACKFRUIT_MODEL_FILENAME", "best.pt")
+MODEL_REVISION = os.getenv(
+    "JACKFRUIT_MODEL_REVISION",
+    "a2106beb9c286ace88715fe9497bd1dac08d3908",
+)
+# Inference runtime for the checkpoint: "torch" runs best.pt eagerly, "onnx"
+# and "openvino" export it once and run it through that runtime instead.
+MODEL_BACKEND = os.getenv("JACKFRUIT_MODEL_BACKEND", "torch")
+MODEL_BACKENDS = {"torch": ".pt", "onnx": ".onnx", "openvino": "_openvino_model"}
+# "int8" swaps in a dynamically quantized ONNX model, produced once from the
+# checkpoint and cached in the per-revision snapshot next to it.
+MODEL_VARIANT = os.getenv("JACKFRUIT_MODEL_VARIANT", "fp32")
+# Square input size the model is exported at, warmed up at and run at.
+IMAGE_SIZE = int(os.getenv("JACKFRUIT_IMAGE_SIZE", "640"))
+# Images are decoded at roughly this many pixels on the short side unless
+# full resolution is needed (tiled inference); 0 always decodes full size.
+DECODE_SIZE = int(os.getenv("JACKFRUIT_DECODE_SIZE", str(IMAGE_SIZE)))
+MAX_IMAGE_PIXELS = int(os.getenv("JACKFRUIT_MAX_IMAGE_PIXELS", "12000000"))
+ALLOWED_IMAGE_FORMATS = ("JPEG", "PNG", "BMP", "TIFF")
+EXIF_ORIENTATION_TAG = 0x0112
+REDUCIBLE_MODES = ("RGB", "RGBA", "L", "LA")
+Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+# "array" hands the decoded BGR frame straight to YOLO; "file" keeps the old
+# temp-file JPEG round trip as a fallback.
+INFERENCE_SOURCE = os.getenv("JACKFRUIT_INFERENCE_SOURCE", "array")
+# Inference runs once at this floor; the confidence slider then only filters
+# the stored raw detections instead of triggering another forward pass.
+DETECTION_FLOOR = float(os.getenv("JACKFRUIT_DETECTION_FLOOR", "0.1"))
+BATCH_SIZE = int(os.getenv("JACKFRUIT_BATCH_SIZE", "8"))
+VALIDATION_WORKERS = int(os.getenv("JACKFRUIT_VALIDATION_WORKERS", "4"))
+TILE_SIZE = int(os.getenv("JACKFRUIT_TILE_SIZE", "640"))
+TILE_OVERLAP = float(os.getenv("JACKFRUIT_TILE_OVERLAP", "0.2"))
+TILE_NMS_IOU = float(os.getenv("JACKFRUIT_TILE_NMS_IOU", "0.5"))
+RESULT_CACHE_SIZE = int(os.getenv("JACKFRUIT_RESULT_CACHE_SIZE", "128"))
+RESULT_CACHE_DIR = os.getenv("JACKFRUIT_RESULT_CACHE_DIR") or None
+RESULT_CACHE_DISK_ENTRIES = int(os.getenv("JACKFRUIT_RESULT_CACHE_DISK_ENTRIES", "10000"))
+
+
+class ImageValidationError(ValueError):
+    """The uploaded data is not an acceptable image (a client error)."""
+
+
+def _cv2():
+    return import_module("cv2")
+
+
+@lru_cache(maxsize=1)
+def model_runtime_available():
+    return module_available("cv2") and module_available("ultralytics")
+
+
+@metrics.timed("header")
+def read_image_header(uploaded_file):
+    """Open an upload lazily and reject it from the header alone, before any pixels are decoded."""
+    try:
+        image = Image.open(uploaded_file, formats=ALLOWED_IMAGE_FORMATS)
+        orientation = _header_orientation(image)
+    except Image.DecompressionBombError as exc:
+        raise ImageValidationError(_too_large_message()) from exc
+    except (UnidentifiedImageError, OSError) as exc:
+        raise ImageValidationError("The uploaded file is not a valid supported image.") from exc
+
+    width, height = image.size
+    if width <= 0 or height <= 0:
+        raise ImageValidationError("The uploaded image has invalid dimensions.")
+    if width * height > MAX_IMAGE_PIXELS:
+        raise ImageValidationError(_too_large_message())
+    # Orientations 5-8 rotate by 90 degrees, so the displayed size is transposed.
+    # Pillow's TIFF plugin applies the orientation itself and already reports
+    # the rotated size.
+    rotated = orientation in {5, 6, 7, 8} and image.format != "TIFF"
+    original_size = (height, width) if rotated else (width, height)
+    return image, original_size
+
+
+def _too_large_message():
+    return f"The uploaded image is too large. Please use an image up to {MAX_IMAGE_PIXELS:,} pixels."
+
+
+def _header_orientation(image):
+    if image.format == "PNG":
+        # PngImageFile.getexif() decodes the pixels to reach a trailing eXIf
+        # chunk; only trust one that appeared before the image data.
+        exif = Image.Exif()
+        if "exif" in image.info:
+            exif.load(image.info["exif"])
+    else:
+        exif = image.getexif()
+    return exif.get(EXIF_ORIENTATION_TAG, 1)
+
+
+def validate_uploaded_image(uploaded_file, max_size=None):
+    image, original_size = read_image_header(uploaded_file)
+    # The header has its own stage; only the pixel decode counts as "decode".
+    with metrics.stage("decode"):
+        try:
+            if max_size:
+                # JPEG decodes straight to a 1/2, 1/4 or 1/8 scale that still
+                # covers max_size; other formats ignore the draft request.
+                image.draft("RGB", (max_size, max_size))
+            image.load()
+        except (OSError, Image.DecompressionBombError) as exc:
+            raise ImageValidationError("The uploaded file is not a valid supported image.") from exc
+
+        image_format = image.format
+        if image.mode not in REDUCIBLE_MODES:
+            # Image.reduce() rejects palette, bilevel and 16-bit images.
+            image = image.convert("RGB")
+        if max_size:
+            factor = min(image.size) // max_size
+            if factor >= 2:
+                image = image.reduce(factor)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        # Rotate the already converted pixels in place instead of copying again.
+        ImageOps.exif_transpose(image, in_place=True)
+        image.format = image_format
+        image.info["original_size"] = original_size
+        return image
+
+
+@metrics.timed("color_conversion")
+def image_to_cv2_bgr(image):
+    cv2 = _cv2()
+    image_cv = np.array(image)
+    return cv2.cvtColor(image_cv, cv2.COLOR_RGB2BGR, dst=image_cv)
+
+
+@metrics.timed("summarize")
+def summarize_detections(boxes, confidence_threshold, target_class_id=0):
+    if boxes is None:
+        return 0, []
+
+    if hasattr(boxes, "cls") and hasattr(boxes, "conf"):
+        class_ids = _to_numpy(boxes.cls)
+        conf_scores = _to_numpy(boxes.conf)
+    else:
+        boxes = list(boxes)
+        class_ids = np.array([box.cls[0] for box in boxes])
+        conf_scores = np.array([box.conf[0] for box in boxes])
+
+    return _summarize_arrays(class_ids, conf_scores, confidence_threshold, target_class_id)
+
+
+def _summarize_arrays(class_ids, conf_scores, confidence_threshold, target_class_id=0):
+    class_ids = np.asarray(class_ids).reshape(-1)
+    conf_scores = np.asarray(conf_scores).reshape(-1)
+    keep = np.isin(class_ids, np.atleast_1d(target_class_id)) & (
+        conf_scores >= confidence_threshold
+    )
+    confidences = conf_scores[keep].tolist()
+    return len(confidences), confidences
+
+
+def confidence_summary(confidences):
+    if not confidences:
+        return {
+            "avg_conf": 0,
+            "min_conf": 0,
+            "max_conf": 0,
+            "avg_conf_pct": 0,
+            "min_conf_pct": 0,
+            "max_conf_pct": 0,
+        }
+
+    avg_conf = float(np.mean(confidences))
+    min_conf = float(np.min(confidences))
+    max_conf = float(np.max(confidences))
+    return {
+        "avg_conf": avg_conf,
+        "min_conf": min_conf,
+        "max_conf": max_conf,
+        "avg_conf_pct": avg_conf * 100,
+        "min_conf_pct": min_conf * 100,
+        "max_conf_pct": max_conf * 100,
+    }
+
+
+# lru_cache does not serialize misses, so concurrent first callers would each
+# build a model (and run the same export); they wait for one build instead.
+_MODEL_LOCK = threading.Lock()
+# Re-entrant because the int8 quantization exports the ONNX model first.
+_EXPORT_LOCK = threading.RLock()
+
+
+def load_model():
+    if not _cached_model.cache_info().currsize:
+        with _MODEL_LOCK:
+            return _cached_model()
+    return _cached_model()
+
+
+def build_model():
+    from ultralytics import YOLO
+
+    model_path = download_model()
+    if MODEL_VARIANT not in {"fp32", "int8"}:
+        raise ValueError(f"Unsupported model variant: {MODEL_VARIANT!r}. Choose fp32 or int8.")
+    if MODEL_VARIANT == "fp32" and MODEL_BACKEND == "torch":
+        return YOLO(model_path)
+    return YOLO(str(runtime_model_path(model_path)), task="detect")
+
+
+def runtime_model_path(model_path):
+    """Exported or quantized artifact for MODEL_BACKEND / MODEL_VARIANT."""
+    model_path = Path(model_path)
+    if model_store.MODEL_OFFLINE:
+        # Never export offline; the artifact must come from the store and match
+        # the checksum recorded when it was prefetched.
+        if MODEL_VARIANT == "int8":
+            filename = f"{model_path.stem}.int8.onnx"
+        elif MODEL_BACKEND in MODEL_BACKENDS:
+            filename = model_path.stem + MODEL_BACKENDS[MODEL_BACKEND]
+        else:
+            # Raises the unsupported-backend error.
+            return exported_model_path(model_path, MODEL_BACKEND)
+        return model_store.resolve(MODEL_REPO_ID, MODEL_REVISION, filename)
+    if MODEL_VARIANT == "int8":
+        return quantized_model_path(model_path)
+    return exported_model_path(model_path, MODEL_BACKEND)
+
+
+_cached_model = lru_cache(maxsize=1)(build_model)
+load_model.cache_clear = _cached_model.cache_clear
+
+
+def download_model():
+    if model_store.MODEL_OFFLINE:
+        return str(model_store.resolve(MODEL_REPO_ID, MODEL_REVISION, MODEL_FILENAME))
+
+    from huggingface_hub import hf_hub_download
+
+    return hf_hub_download(
+        repo_id=MODEL_REPO_ID,
+        filename=MODEL_FILENAME,
+        revision=MODEL_REVISION,
+    )
+
+
+def exported_model_path(model_path, backend):
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(
+            f"Unsupported model backend: {backend!r}. Choose one of {', '.join(MODEL_BACKENDS)}."
+        )
+
+    model_path = Path(model_path)
+    target = model_path.with_name(model_path.stem + MODEL_BACKENDS[backend])
+    with _EXPORT_LOCK:
+        if not target.exists():
+            # Export once and keep the artifact next to the downloaded checkpoint,
+            # which the Hugging Face cache already separates per revision.
+            _export_model(model_path, backend, target)
+    return target
+
+
+def _export_model(model_path, backend, target):
+    from ultralytics import YOLO
+
+    # Ultralytics writes the export next to its source, so export a copy in a
+    # scratch directory and rename the finished artifact into place; a crashed
+    # or concurrent export never leaves a truncated file at the final path.
+    scratch = Path(tempfile.mkdtemp(prefix=".export-", dir=target.parent))
+    try:
+        source = scratch / model_path.name
+        shutil.copyfile(model_path, source)
+        # Batch mode, tiling, the CLI and the scheduler feed several images per
+        # call, so the graph needs a dynamic batch axis.
+        exported = Path(YOLO(str(source)).export(format=backend, dynamic=True, imgsz=IMAGE_SIZE))
+        try:
+            os.replace(exported, target)
+        except OSError:
+            # Another process finished first (a directory cannot replace a
+            # non-empty one); keep its artifact.
+            if not target.exists():
+                raise
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def quantized_model_path(model_path):
+    model_path = Path(model_path)
+    target = model_path.with_name(f"{model_path.stem}.int8.onnx")
+    with _EXPORT_LOCK:
+        if not target.exists():
+            _quantize_model(model_path, target)
+    return target
+
+
+def _quantize_model(model_path, target):
+    import onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    source = exported_model_path(model_path, "onnx")
+    partial = target.with_name(target.name + ".partial")
+    quantize_dynamic(str(source), str(partial), weight_type=QuantType.QUInt8)
+    # Ultralytics reads class names, stride and input size from the ONNX
+    # metadata, so carry it over from the float export.
+    quantized = onnx.load(str(partial))
+    del quantized.metadata_props[:]
+    quantized.metadata_props.extend(onnx.load(str(source)).metadata_props)
+    onnx.save(quantized, str(partial))
+    partial.replace(target)
+
+
+@lru_cache(maxsize=1)
+def inference_scheduler():
+    """Shared queue in front of the model, or None when JACKFRUIT_INFERENCE_WORKERS is 0."""
+    if scheduler.INFERENCE_WORKERS <= 0:
+        return None
+    return scheduler.InferenceScheduler(
+        _predict,
+        # Worker 0 reuses the preloaded (and warmed up) model; extra workers
+        # get private instances.
+        lambda index: load_model() if index == 0 else build_model(),
+        workers=scheduler.INFERENCE_WORKERS,
+        max_batch_size=BATCH_SIZE,
+    )
+
+
+@lru_cache(maxsize=1)
+def process_pool():
+    """Model worker processes, or None when JACKFRUIT_INFERENCE_PROCESSES is 0."""
+    from jackfruit import procpool
+
+    if procpool.INFERENCE_PROCESSES <= 0:
+        return None
+    return procpool.ProcessInferencePool(procpool.INFERENCE_PROCESSES)
+
+
+def _predict(model, images_cv, confidence_threshold):
+    with metrics.stage("model_forward"):
+        return list(model(list(images_cv), imgsz=IMAGE_SIZE, conf=confidence_threshold, save=False))
+
+
+def run_model_inference(image_cv, confidence_threshold, source=None):
+    source = source or INFERENCE_SOURCE
+    if source == "array":
+        if inference_scheduler() is not None:
+            return inference_scheduler().run([image_cv], confidence_threshold)[0]
+        model = load_model()
+        with metrics.stage("model_forward"):
+            results = model(image_cv, imgsz=IMAGE_SIZE, conf=confidence_threshold, save=False)
+        return results[0]
+    if source == "file":
+        return run_model_inference_from_file(image_cv, confidence_threshold)
+    raise ValueError(f"Unsupported inference source: {source!r}.")
+
+
+def run_batch_model_inference(images_cv, confidence_threshold):
+    if not images_cv:
+        return []
+    if inference_scheduler() is not None:
+        return inference_scheduler().run(images_cv, confidence_threshold)
+    return _predict(load_model(), images_cv, confidence_threshold)
+
+
+def run_model_inference_from_file(image_cv, confidence_threshold):
+    cv2 = _cv2()
+    temp_image_path = None
+
+    try:
+        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as temp_image:
+            temp_image_path = temp_image.name
+
+        with metrics.stage("temp_file_write"):
+            written = cv2.imwrite(temp_image_path, image_cv)
+        if not written:
+            raise RuntimeError("Could not prepare the uploaded image for detection.")
+
+        model = load_model()
+        with metrics.stage("model_forward"):
+            results = model(temp_image_path, imgsz=IMAGE_SIZE, conf=confidence_threshold, save=False)
+        return results[0]
+    finally:
+        if temp_image_path:
+            with suppress(FileNotFoundError):
+                os.remove(temp_image_path)
+
+@lru_cache(maxsize=1)
+def result_cache():
+    return DetectionCache(
+        max_entries=RESULT_CACHE_SIZE, cache_dir=RESULT_CACHE_DIR, max_disk_entries=RESULT_CACHE_DISK_ENTRIES
+    )
+
+
+def detection_cache_key(image_cv, confidence_threshold):
+    return cache_key(
+        image_cv,
+        MODEL_REPO_ID,
+        MODEL_REVISION,
+        MODEL_FILENAME,
+        MODEL_BACKEND,
+        MODEL_VARIANT,
+        f"imgsz={IMAGE_SIZE}",
+        f"conf={confidence_threshold:.4f}",
+    )
+
+
+def _to_numpy(values):
+    if hasattr(values, "cpu"):
+        values = values.cpu().numpy()
+    return np.asarray(values)
+
+
+def result_to_detections(result):
+    boxes = result.boxes
+    data = _to_numpy(boxes.data) if boxes is not None else np.empty((0, 6))
+    return data, dict(result.names)
+
+
+def result_from_detections(image_cv, boxes, names):
+    results_module = import_module("ultralytics.engine.results")
+    return results_module.Results(image_cv, path="", names=names, boxes=boxes)
+
+
+def run_raw_detection(image_cv, floor_threshold=None):
+    floor_threshold = DETECTION_FLOOR if floor_threshold is None else floor_threshold
+    key = detection_cache_key(image_cv, floor_threshold)
+    cached = result_cache().get(key)
+    if cached is not None:
+        return cached
+
+    if process_pool() is not None:
+        return result_cache().put(key, *process_pool().detect([image_cv], floor_threshold)[0])
+    result = run_model_inference(image_cv, floor_threshold)
+    return result_cache().put(key, *result_to_detections(result))
+
+
+def run_raw_batch_detection(images_cv, floor_threshold=None):
+    floor_threshold = DETECTION_FLOOR if floor_threshold is None else floor_threshold
+    keys = [detection_cache_key(image_cv, floor_threshold) for image_cv in images_cv]
+    detections = [result_cache().get(key) for key in keys]
+    misses = [index for index, cached in enumerate(detections) if cached is None]
+
+    fresh = detect_images([images_cv[index] for index in misses], floor_threshold)
+    for index, (boxes, names) in zip(misses, fresh):
+        detections[index] = result_cache().put(keys[index], boxes, names)
+    return detections
+
+
+def detect_images(images_cv, floor_threshold):
+    """Uncached (boxes, names) per image, from the worker processes when they are enabled."""
+    if process_pool() is not None:
+        return process_pool().detect(images_cv, floor_threshold)
+    return [
+        result_to_detections(result)
+        for result in run_batch_model_inference(images_cv, floor_threshold)
+    ]
+
+
+def iter_batches(items, batch_size):
+    batch_size = max(1, int(batch_size))
+    for start in range(0, len(items), batch_size):
+        yield items[start:start + batch_size]
+
+
+def prepare_batch_image(uploaded_file):
+    name = getattr(uploaded_file, "name", "image")
+    try:
+        image = validate_uploaded_image(uploaded_file, max_size=DECODE_SIZE)
+        return name, image_to_cv2_bgr(image), None
+    except ValueError as exc:
+        return name, None, str(exc)
+
+
+def iter_batch_analysis(uploaded_files, batch_size=None, max_workers=None, floor_threshold=None):
+    batch_size = batch_size or BATCH_SIZE
+    batches = iter_batches(list(uploaded_files), batch_size)
+    if process_pool() is not None:
+        yield from _iter_process_batch_analysis(batches, floor_threshold)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers or VALIDATION_WORKERS) as pool:
+        # Decode the next batch while the model works on the current one.
+        pending = [pool.submit(prepare_batch_image, item) for item in next(batches, [])]
+        while pending:
+            upcoming = [pool.submit(prepare_batch_image, item) for item in next(batches, [])]
+            prepared = [future.result() for future in pending]
+            valid = [index for index, (_, image_cv, _) in enumerate(prepared) if image_cv is not None]
+            detections = dict(
+                zip(
+                    valid,
+                    run_raw_batch_detection([prepared[index][1] for index in valid], floor_threshold),
+                )
+            )
+
+            batch_rows = []
+            for index, (name, _, error) in enumerate(prepared):
+                boxes, names = detections.get(index, (None, None))
+                batch_rows.append({"name": name, "boxes": boxes, "names": names, "error": error})
+            yield batch_rows
+            pending = upcoming
+
+
+def _iter_process_batch_analysis(batches, floor_threshold):
+    floor_threshold = DETECTION_FLOOR if floor_threshold is None else floor_threshold
+    for batch in batches:
+        # Workers decode the raw upload bytes too, so none of the per-image
+        # CPU work runs under this process's GIL.
+        payloads = [item.getvalue() if hasattr(item, "getvalue") else item.read() for item in batch]
+        rows = process_pool().analyze_encoded(payloads, floor_threshold, max_size=DECODE_SIZE)
+        yield [
+            {
+                "name": getattr(item, "name", "image"),
+                "boxes": row["boxes"],
+                "names": row["names"],
+                "error": row["error"],
+            }
+            for item, row in zip(batch, rows)
+        ]
+
+
+def tile_windows(width, height, tile_size, overlap):
+    if tile_size <= 0 or not 0 <= overlap < 1:
+        raise ValueError("Tile size must be positive and overlap must be in [0, 1).")
+    stride = max(1, int(tile_size * (1 - overlap)))
+
+    def starts(length):
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, stride))
+        positions.append(length - tile_size)
+        return positions
+
+    return [
+        (x, y, min(x + tile_size, width), min(y + tile_size, height))
+        for y in starts(height)
+        for x in starts(width)
+    ]
+
+
+@metrics.timed("nms")
+def non_max_suppression(boxes, iou_threshold):
+    if len(boxes) == 0:
+        return boxes
+
+    x1, y1, x2, y2, scores, class_ids = boxes.T
+    areas = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+    while order.size:
+        best, rest = order[0], order[1:]
+        keep.append(best)
+        overlap_w = np.clip(np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest]), 0, None)
+        overlap_h = np.clip(np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest]), 0, None)
+        intersection = overlap_w * overlap_h
+        iou = intersection / np.maximum(areas[best] + areas[rest] - intersection, 1e-9)
+        order = rest[(iou <= iou_threshold) | (class_ids[rest] != class_ids[best])]
+    return boxes[np.sort(keep)]
+
+
+def run_tiled_detection(
+    image_cv,
+    floor_threshold=None,
+    tile_size=None,
+    overlap=None,
+    batch_size=None,
+    iou_threshold=None,
+):
+    floor_threshold = DETECTION_FLOOR if floor_threshold is None else floor_threshold
+    tile_size = tile_size or TILE_SIZE
+    overlap = TILE_OVERLAP if overlap is None else overlap
+    iou_threshold = TILE_NMS_IOU if iou_threshold is None else iou_threshold
+    key = detection_cache_key(image_cv, floor_threshold) + f":tiles={tile_size}/{overlap}/{iou_threshold}"
+    cached = result_cache().get(key)
+    if cached is not None:
+        return cached
+
+    height, width = image_cv.shape[:2]
+    merged = []
+    names = {}
+    # Tiles are views into image_cv and only one batch of them is in flight,
+    # so peak memory does not grow with the number of tiles.
+    for windows in iter_batches(tile_windows(width, height, tile_size, overlap), batch_size or BATCH_SIZE):
+        tiles = [image_cv[y0:y1, x0:x1] for x0, y0, x1, y1 in windows]
+        for (x0, y0, _, _), (boxes, result_names) in zip(windows, detect_images(tiles, floor_threshold)):
+            boxes = np.array(boxes, dtype=np.float32).reshape(-1, 6)
+            boxes[:, [0, 2]] += x0
+            boxes[:, [1, 3]] += y0
+            merged.append(boxes)
+            names.update(result_names)
+
+    boxes = np.concatenate(merged) if merged else np.empty((0, 6), dtype=np.float32)
+    return result_cache().put(key, non_max_suppression(boxes, iou_threshold), names)
+
+
+def threshold_detections(boxes, confidence_threshold):
+    return boxes[boxes[:, 4] >= confidence_threshold]
+
+
+@metrics.timed("summarize")
+def summarize_raw_detections(boxes, confidence_threshold, target_class_id=0):
+    return _summarize_arrays(boxes[:, 5], boxes[:, 4], confidence_threshold, target_class_id)
@@ -0,0 +1,104 @@
+"""Accuracy metrics for comparing model variants on a labelled image folder."""
+from pathlib import Path
+
+import numpy as np
+
+IOU_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+
+
+def load_yolo_labels(label_path, width, height):
+    label_path = Path(label_path)
+    if not label_path.exists():
+        return np.empty((0, 5), dtype=np.float32)
+
+    rows = np.loadtxt(label_path, ndmin=2, dtype=np.float32)
+    if rows.size == 0:
+        return np.empty((0, 5), dtype=np.float32)
+    class_ids, center_x, center_y, box_w, box_h = rows[:, :5].T
+    return np.stack(
+        [
+            (center_x - box_w / 2) * width,
+            (center_y - box_h / 2) * height,
+            (center_x + box_w / 2) * width,
+            (center_y + box_h / 2) * height,
+            class_ids,
+        ],
+        axis=1,
+    )
+
+
+def box_iou(boxes_a, boxes_b):
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:4], boxes_b[None, :, 2:4])
+    intersection = np.clip(bottom_right - top_left, 0, None).prod(axis=2)
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    return intersection / np.maximum(area_a[:, None] + area_b[None, :] - intersection, 1e-9)
+
+
+def match_detections(predictions, labels, iou_thresholds=IOU_THRESHOLDS):
+    """Flag each prediction (x1, y1, x2, y2, conf, cls) as a true positive per IoU threshold."""
+    true_positives = np.zeros((len(predictions), len(iou_thresholds)), dtype=bool)
+    if len(predictions) == 0 or len(labels) == 0:
+        return true_positives
+
+    iou = box_iou(predictions[:, :4], labels[:, :4])
+    iou[predictions[:, 5][:, None] != labels[:, 4][None, :]] = 0
+    order = np.argsort(-predictions[:, 4], kind="stable")
+    for column, threshold in enumerate(iou_thresholds):
+        matched = np.zeros(len(labels), dtype=bool)
+        for index in order:
+            candidates = np.where(~matched & (iou[index] >= threshold))[0]
+            if candidates.size:
+                matched[candidates[np.argmax(iou[index, candidates])]] = True
+                true_positives[index, column] = True
+    return true_positives
+
+
+def average_precision(true_positives, confidences, label_count):
+    if label_count == 0:
+        return float("nan")
+    if len(confidences) == 0:
+        return 0.0
+
+    order = np.argsort(-np.asarray(confidences), kind="stable")
+    hits = np.asarray(true_positives, dtype=float)[order]
+    recall = np.cumsum(hits) / label_count
+    precision = np.cumsum(hits) / np.arange(1, len(hits) + 1)
+    # All-point interpolation over the precision envelope.
+    recall = np.concatenate([[0.0], recall, [1.0]])
+    precision = np.concatenate([[1.0], precision, [0.0]])
+    precision = np.maximum.accumulate(precision[::-1])[::-1]
+    steps = np.where(recall[1:] != recall[:-1])[0]
+    return float(np.sum((recall[steps + 1] - recall[steps]) * precision[steps + 1]))
+
+
+def mean_average_precision(per_image):
+    """per_image: iterable of (predictions, labels) pairs for one dataset."""
+    matches, confidences, class_ids, label_classes = [], [], [], []
+    for predictions, labels in per_image:
+        matches.append(match_detections(predictions, labels))
+        confidences.append(predictions[:, 4])
+        class_ids.append(predictions[:, 5])
+        label_classes.append(labels[:, 4])
+
+    matches = np.concatenate(matches) if matches else np.zeros((0, len(IOU_THRESHOLDS)), dtype=bool)
+    confidences = np.concatenate(confidences) if confidences else np.empty(0)
+    class_ids = np.concatenate(class_ids) if class_ids else np.empty(0)
+    label_classes = np.concatenate(label_classes) if label_classes else np.empty(0)
+
+    per_class = []
+    for class_id in np.unique(label_classes):
+        selected = class_ids == class_id
+        label_count = int(np.sum(label_classes == class_id))
+        per_class.append(
+            [
+                average_precision(matches[selected, column], confidences[selected], label_count)
+                for column in range(len(IOU_THRESHOLDS))
+            ]
+        )
+
+    if not per_class:
+        return {"map50": float("nan"), "map50_95": float("nan")}
+    per_class = np.array(per_class)
+    return {"map50": float(per_class[:, 0].mean()), "map50_95": float(per_class.mean())}
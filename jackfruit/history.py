@@ -0,0 +1,201 @@
+"""Persistent detection history in a local SQLite file (WAL mode).
+
+Every analysis appends one row tagged with a history id. By default every
+session shares the ``JACKFRUIT_HISTORY_ID`` history, so it is resumed after a
+reload or restart; ``JACKFRUIT_HISTORY_PER_SESSION`` gives each browser
+session a private one instead. Sessions only keep the last ``HISTORY_WINDOW``
+rows in memory, and the file keeps at most ``HISTORY_MAX_ROWS`` rows.
+"""
+import hashlib
+import os
+import sqlite3
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import closing
+from functools import lru_cache
+from pathlib import Path
+
+from jackfruit import core
+
+# Empty keeps history in memory only.
+HISTORY_DB = os.getenv("JACKFRUIT_HISTORY_DB", os.path.join("~", ".cache", "jackfruit", "history.sqlite3"))
+HISTORY_WINDOW = int(os.getenv("JACKFRUIT_HISTORY_WINDOW", "500"))
+DEFAULT_HISTORY_ID = "default"
+HISTORY_ID = os.getenv("JACKFRUIT_HISTORY_ID", DEFAULT_HISTORY_ID)
+# Private per-session histories are never read again after a restart and
+# only leave the disk through HISTORY_MAX_ROWS.
+HISTORY_PER_SESSION = os.getenv("JACKFRUIT_HISTORY_PER_SESSION", "0").lower() in {"1", "true", "yes"}
+# Oldest rows beyond this many are deleted on append; 0 keeps every row.
+HISTORY_MAX_ROWS = int(os.getenv("JACKFRUIT_HISTORY_MAX_ROWS", "100000"))
+COLUMNS = (
+    "created_at",
+    "source",
+    "name",
+    "image_sha256",
+    "count",
+    "avg_conf",
+    "min_conf",
+    "max_conf",
+    "latency_ms",
+    "model_revision",
+)
+
+
+def make_record(source, name, count, confidences, latency_seconds, payload=None):
+    stats = core.confidence_summary(confidences)
+    return {
+        "created_at": time.time(),
+        "source": source,
+        "name": name,
+        "image_sha256": hashlib.sha256(payload).hexdigest() if payload is not None else None,
+        "count": int(count),
+        "avg_conf": stats["avg_conf"],
+        "min_conf": stats["min_conf"],
+        "max_conf": stats["max_conf"],
+        "latency_ms": latency_seconds * 1000 if latency_seconds is not None else None,
+        "model_revision": core.MODEL_REVISION,
+    }
+
+
+class RunningStats:
+    """Count, sum, max and per-value frequencies, updated as results arrive."""
+
+    def __init__(self, analyses=0, total=0, maximum=0, frequencies=None):
+        self.analyses = analyses
+        self.total = total
+        self.maximum = maximum
+        self.frequencies = Counter(frequencies or {})
+
+    def add(self, count):
+        self.analyses += 1
+        self.total += count
+        self.maximum = max(self.maximum, count)
+        self.frequencies[count] += 1
+
+    @property
+    def mean(self):
+        return self.total / self.analyses if self.analyses else 0.0
+
+
+class HistoryStore:
+    def __init__(self, db_path, max_rows=HISTORY_MAX_ROWS):
+        if max_rows < 0:
+            raise ValueError("max_rows must be zero or positive.")
+        self.db_path = Path(db_path).expanduser()
+        self.max_rows = max_rows
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            # WAL lets the UI read while another session or process appends.
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, created_at REAL NOT NULL, source TEXT NOT NULL, "
+                "name TEXT, image_sha256 TEXT, count INTEGER NOT NULL, avg_conf REAL, min_conf REAL, "
+                "max_conf REAL, latency_ms REAL, model_revision TEXT, session_id TEXT)"
+            )
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(history)")}
+            if "session_id" not in columns:
+                # Databases written before sessions were tracked belong to the
+                # shared default history.
+                connection.execute("ALTER TABLE history ADD COLUMN session_id TEXT")
+                connection.execute("UPDATE history SET session_id = ?", (DEFAULT_HISTORY_ID,))
+            connection.execute("CREATE INDEX IF NOT EXISTS history_session ON history (session_id, id)")
+
+    def append(self, records, session_id):
+        rows = [(*(record[column] for column in COLUMNS), session_id) for record in records]
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                f"INSERT INTO history ({', '.join(COLUMNS)}, session_id) "
+                f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+                rows,
+            )
+            if self.max_rows:
+                connection.execute(
+                    "DELETE FROM history WHERE id < "
+                    "(SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (self.max_rows - 1,),
+                )
+
+    def recent(self, limit, session_id):
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM history WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+                (session_id, limit),
+            ).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in reversed(rows)]
+
+    def __len__(self):
+        with closing(self._connect()) as connection:
+            return connection.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def running_stats(self, session_id):
+        with closing(self._connect()) as connection:
+            frequencies = dict(
+                connection.execute(
+                    "SELECT count, COUNT(*) FROM history WHERE session_id = ? GROUP BY count", (session_id,)
+                )
+            )
+        return RunningStats(
+            analyses=sum(frequencies.values()),
+            total=sum(count * occurrences for count, occurrences in frequencies.items()),
+            maximum=max(frequencies, default=0),
+            frequencies=frequencies,
+        )
+
+    def clear(self, session_id):
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM history WHERE session_id = ?", (session_id,))
+
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, timeout=5)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+
+@lru_cache(maxsize=1)
+def history_store():
+    return HistoryStore(HISTORY_DB) if HISTORY_DB else None
+
+
+class SessionHistory:
+    """Bounded window over this session's rows in the shared store."""
+
+    def __init__(self, store=None, window=HISTORY_WINDOW, session_id=None):
+        self.store = store
+        self.session_id = session_id or (uuid.uuid4().hex if HISTORY_PER_SESSION else HISTORY_ID)
+        self.records = deque(store.recent(window, self.session_id) if store is not None else (), maxlen=window)
+        # Aggregates cover the session's whole persisted history, not just the window.
+        self.stats = store.running_stats(self.session_id) if store is not None else RunningStats()
+        # Bumped on every change so views derived from the history can be cached.
+        self.revision = 0
+
+    def append(self, *records):
+        if self.store is not None:
+            self.store.append(records, self.session_id)
+        self.records.extend(records)
+        for record in records:
+            self.stats.add(record["count"])
+        self.revision += 1
+
+    def clear(self):
+        if self.store is not None:
+            self.store.clear(self.session_id)
+        self.records.clear()
+        self.stats = RunningStats()
+        self.revision += 1
+
+    @property
+    def first_index(self):
+        """1-based analysis number of the oldest record in the window."""
+        return self.stats.analyses - len(self.records) + 1
+
+    @property
+    def counts(self):
+        return [record["count"] for record in self.records]
+
+    def __len__(self):
+        return len(self.records)
+
+    def __bool__(self):
+        return bool(self.records)
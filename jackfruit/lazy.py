@@ -0,0 +1,35 @@
+"""Deferred imports for heavy optional modules."""
+import importlib.util
+import sys
+from importlib import import_module
+
+
+class LazyModule:
+    """Stand-in that imports ``name`` on first attribute access.
+
+    Unlike ``importlib.util.LazyLoader`` it never registers a half-loaded
+    module in ``sys.modules``, so libraries that probe ``sys.modules`` (as
+    Streamlit does for numpy) do not trigger the import on our behalf.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attribute):
+        module = import_module(self._name)
+        return getattr(module, attribute)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
+
+
+def lazy_import(name):
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def module_available(name):
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # Already imported without a spec (e.g. replaced in sys.modules).
+        return name in sys.modules
@@ -0,0 +1,159 @@
+"""Per-stage latency histograms, exported as Prometheus text.
+
+Functions are instrumented with ``@timed("stage")`` or ``with stage("stage"):``.
+Observations go to the process-wide ``REGISTRY``, which ``jackfruit-api``
+serves on ``/metrics`` and the Streamlit app serves on
+``JACKFRUIT_METRICS_PORT`` when that is set.
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+METRICS_PORT = int(os.getenv("JACKFRUIT_METRICS_PORT", "0"))
+METRICS_HOST = os.getenv("JACKFRUIT_METRICS_HOST", "127.0.0.1")
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_METRIC = "jackfruit_stage_seconds"
+REQUEST_STAGE_METRIC = "jackfruit_request_stage_seconds"
+HELP = {
+    STAGE_METRIC: "Time spent in each instrumented function.",
+    REQUEST_STAGE_METRIC: "Time spent in each stage of a UI detection request.",
+}
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, fraction):
+        """Estimate like PromQL histogram_quantile: linear within the bucket."""
+        if self.count == 0:
+            return 0.0
+        rank = fraction * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage_name, seconds, metric=STAGE_METRIC):
+        with self._lock:
+            key = (metric, stage_name)
+            if key not in self._histograms:
+                self._histograms[key] = Histogram(self.buckets)
+            self._histograms[key].observe(seconds)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def summary(self):
+        with self._lock:
+            return [
+                {
+                    "metric": metric,
+                    "stage": stage_name,
+                    "count": histogram.count,
+                    "mean_ms": histogram.sum / histogram.count * 1000,
+                    "p50_ms": histogram.quantile(0.5) * 1000,
+                    "p95_ms": histogram.quantile(0.95) * 1000,
+                }
+                for (metric, stage_name), histogram in sorted(self._histograms.items())
+            ]
+
+    def render_prometheus(self):
+        lines = []
+        with self._lock:
+            for metric in sorted({metric for metric, _ in self._histograms}):
+                lines.append(f"# HELP {metric} {HELP.get(metric, metric)}")
+                lines.append(f"# TYPE {metric} histogram")
+                for (family, stage_name), histogram in sorted(self._histograms.items()):
+                    if family != metric:
+                        continue
+                    label = f'stage="{_escape(stage_name)}"'
+                    cumulative = 0
+                    for bound, bucket_count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                        cumulative += bucket_count
+                        lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {cumulative}')
+                    lines.append(f"{metric}_sum{{{label}}} {histogram.sum}")
+                    lines.append(f"{metric}_count{{{label}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = MetricsRegistry()
+
+
+@contextmanager
+def stage(stage_name, metric=STAGE_METRIC, registry=None):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        (registry or REGISTRY).observe(stage_name, time.perf_counter() - started, metric)
+
+
+def timed(stage_name):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@lru_cache(maxsize=1)
+def start_metrics_server(port=None, host=None):
+    """Serve /metrics from a daemon thread; returns None when no port is configured."""
+    port = METRICS_PORT if port is None else port
+    if not port:
+        return None
+    # http.server is only imported when the endpoint is enabled.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = REGISTRY.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host or METRICS_HOST, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="jackfruit-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,133 @@
+"""Local model store so air-gapped nodes start without any Hugging Face calls.
+
+Artifacts live under ``<store>/<repo--id>/<revision>/`` next to a
+``manifest.json`` that records the sha256 of every file. Fill the store on a
+connected machine with ``jackfruit-prefetch-model`` (or
+``python -m jackfruit.model_store``), copy it over, and start the app with
+``JACKFRUIT_MODEL_OFFLINE=1``.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+MODEL_STORE_DIR = Path(
+    os.getenv("JACKFRUIT_MODEL_STORE", os.path.join("~", ".cache", "jackfruit", "models"))
+).expanduser()
+MODEL_OFFLINE = os.getenv("JACKFRUIT_MODEL_OFFLINE", "0").lower() in {"1", "true", "yes"}
+MANIFEST_NAME = "manifest.json"
+
+if MODEL_OFFLINE:
+    # Stop huggingface_hub and Ultralytics from probing the network on import.
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("YOLO_OFFLINE", "1")
+
+
+def revision_dir(repo_id, revision, store_dir=None):
+    return Path(store_dir or MODEL_STORE_DIR) / repo_id.replace("/", "--") / revision
+
+
+def sha256_path(path):
+    path = Path(path)
+    digest = hashlib.sha256()
+    files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+    for file_path in files:
+        if path.is_dir():
+            digest.update(file_path.relative_to(path).as_posix().encode())
+        with open(file_path, "rb") as artifact:
+            for chunk in iter(lambda: artifact.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest(directory):
+    manifest_path = Path(directory) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {"files": {}}
+    with open(manifest_path, encoding="utf-8") as manifest:
+        return json.load(manifest)
+
+
+def record_artifact(directory, artifact_path, repo_id, revision):
+    directory = Path(directory)
+    manifest = read_manifest(directory)
+    manifest.update(repo_id=repo_id, revision=revision)
+    manifest["files"][Path(artifact_path).name] = {"sha256": sha256_path(artifact_path)}
+    partial = directory / (MANIFEST_NAME + ".partial")
+    with open(partial, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    partial.replace(directory / MANIFEST_NAME)
+    return manifest
+
+
+def prefetch(repo_id, revision, filename, store_dir=None):
+    from huggingface_hub import hf_hub_download
+
+    directory = revision_dir(repo_id, revision, store_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    downloaded = hf_hub_download(repo_id=repo_id, filename=filename, revision=revision)
+    target = directory / filename
+    partial = target.with_name(target.name + ".partial")
+    shutil.copyfile(downloaded, partial)
+    partial.replace(target)
+    record_artifact(directory, target, repo_id, revision)
+    return target
+
+
+def resolve(repo_id, revision, filename, store_dir=None, verify=True):
+    directory = revision_dir(repo_id, revision, store_dir)
+    target = directory / filename
+    entry = read_manifest(directory)["files"].get(filename)
+    if entry is None or not target.exists():
+        raise RuntimeError(
+            f"{filename} for {repo_id}@{revision} is not in the model store at {directory}. "
+            "Run jackfruit-prefetch-model on a connected machine first."
+        )
+    if verify and sha256_path(target) != entry["sha256"]:
+        raise RuntimeError(f"Checksum mismatch for {target}; prefetch the model again.")
+    return target
+
+
+def main(argv=None):
+    from jackfruit import core
+
+    parser = argparse.ArgumentParser(
+        prog="jackfruit-prefetch-model",
+        description="Download the detector into the local model store for offline startup.",
+    )
+    parser.add_argument("--store", type=Path, default=MODEL_STORE_DIR, help="model store directory")
+    parser.add_argument("--repo-id", default=core.MODEL_REPO_ID)
+    parser.add_argument("--revision", default=core.MODEL_REVISION)
+    parser.add_argument("--filename", default=core.MODEL_FILENAME)
+    parser.add_argument(
+        "--export",
+        nargs="*",
+        choices=("onnx", "openvino", "int8"),
+        default=[],
+        help="also build these runtime artifacts into the store",
+    )
+    args = parser.parse_args(argv)
+
+    target = prefetch(args.repo_id, args.revision, args.filename, args.store)
+    print(f"Stored {target}", file=sys.stderr)
+    for export in args.export:
+        artifact = (
+            core.quantized_model_path(target)
+            if export == "int8"
+            else core.exported_model_path(target, export)
+        )
+        record_artifact(target.parent, artifact, args.repo_id, args.revision)
+        print(f"Stored {artifact}", file=sys.stderr)
+
+    started = time.perf_counter()
+    resolve(args.repo_id, args.revision, args.filename, args.store)
+    print(f"Verified offline resolve in {(time.perf_counter() - started) * 1000:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Multi-process inference that sidesteps the GIL.
+
+Each worker process loads its own model. Pixels (or the encoded upload, when
+the worker also decodes) travel through ``multiprocessing.shared_memory``
+segments instead of being pickled through the executor's pipe; only the
+small (N, 6) detection arrays come back pickled.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+from jackfruit import core, warmup
+from jackfruit.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# 0 keeps inference in the calling process.
+INFERENCE_PROCESSES = int(os.getenv("JACKFRUIT_INFERENCE_PROCESSES", "0"))
+# Forking a process that already runs Streamlit or PyTorch threads is unsafe.
+PROCESS_START_METHOD = os.getenv("JACKFRUIT_PROCESS_START_METHOD", "spawn")
+
+_worker_model = None
+_warm_barrier = None
+
+
+def _init_worker(threads, warm_barrier):
+    global _warm_barrier
+    _warm_barrier = warm_barrier
+    # Split the cores between processes instead of letting every runtime
+    # spawn one thread per core.
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+
+
+def _model(model_factory):
+    global _worker_model
+    if _worker_model is None:
+        _worker_model = model_factory()
+    return _worker_model
+
+
+def _warm_worker(model_factory, runs, image_size):
+    try:
+        warmup.run_dummy_inferences(_model(model_factory), runs, image_size)
+    finally:
+        # Hold this worker until every worker has taken a warm-up task, so no
+        # process picks up two of them while another stays cold.
+        _warm_barrier.wait()
+    return os.getpid()
+
+
+def _pack(arrays):
+    shm = SharedMemory(create=True, size=max(1, sum(array.nbytes for array in arrays)))
+    layout = []
+    offset = 0
+    for array in arrays:
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf, offset=offset)[...] = array
+        layout.append((offset, array.shape, array.dtype.str))
+        offset += array.nbytes
+    return shm, layout
+
+
+def _unpack(shm, layout):
+    # Copy out of the segment: the predictor keeps references to its inputs,
+    # which would otherwise stop the segment from being closed.
+    return [
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset).copy()
+        for offset, shape, dtype in layout
+    ]
+
+
+def _detect_worker(model_factory, name, layout, confidence_threshold):
+    shm = SharedMemory(name=name)
+    try:
+        images_cv = _unpack(shm, layout)
+    finally:
+        shm.close()
+    results = core._predict(_model(model_factory), images_cv, confidence_threshold)
+    return [_detections(result) for result in results]
+
+
+def _analyze_worker(model_factory, name, layout, confidence_threshold, max_size):
+    shm = SharedMemory(name=name)
+    try:
+        payloads = [array.tobytes() for array in _unpack(shm, layout)]
+    finally:
+        shm.close()
+
+    rows, images_cv = [], []
+    for payload in payloads:
+        try:
+            image = core.validate_uploaded_image(BytesIO(payload), max_size=max_size)
+            images_cv.append(core.image_to_cv2_bgr(image))
+            rows.append({"original_size": image.info["original_size"], "error": None})
+        except ValueError as exc:
+            rows.append({"original_size": None, "error": str(exc)})
+
+    results = iter(core._predict(_model(model_factory), images_cv, confidence_threshold) if images_cv else [])
+    for row in rows:
+        boxes, names = _detections(next(results)) if row["error"] is None else (None, None)
+        row.update(boxes=boxes, names=names)
+    return rows
+
+
+def _detections(result):
+    boxes, names = core.result_to_detections(result)
+    return np.asarray(boxes, dtype=np.float32).reshape(-1, 6), names
+
+
+class ProcessInferencePool:
+    def __init__(self, processes, model_factory=None, start_method=PROCESS_START_METHOD):
+        """model_factory must be picklable (a module-level function) for the spawn start method."""
+        if processes < 1:
+            raise ValueError("processes must be at least 1.")
+        self.processes = processes
+        self.model_factory = model_factory or core.load_model
+        context = get_context(start_method)
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(max(1, (os.cpu_count() or 1) // processes), context.Barrier(processes)),
+        )
+
+    def detect(self, images_cv, confidence_threshold):
+        """Return (boxes, names) per image, spreading the images over the worker processes."""
+        return self._map(_detect_worker, list(images_cv), confidence_threshold)
+
+    def analyze_encoded(self, payloads, confidence_threshold, max_size=None):
+        """Decode, validate and detect in the workers; returns original_size/boxes/names/error dicts."""
+        arrays = [np.frombuffer(payload, dtype=np.uint8) for payload in payloads]
+        return self._map(_analyze_worker, arrays, confidence_threshold, max_size)
+
+    def warm(self, runs=1, image_size=None):
+        """Load and warm the model in every worker process; returns the warmed process ids."""
+        image_size = image_size or core.IMAGE_SIZE
+        futures = [
+            self._executor.submit(_warm_worker, self.model_factory, runs, image_size) for _ in range(self.processes)
+        ]
+        return {future.result() for future in futures}
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _map(self, worker, arrays, *args):
+        if not arrays:
+            return []
+        chunk_size = -(-len(arrays) // self.processes)
+        segments, futures = [], []
+        try:
+            for start in range(0, len(arrays), chunk_size):
+                shm, layout = _pack(arrays[start:start + chunk_size])
+                segments.append(shm)
+                futures.append(self._executor.submit(worker, self.model_factory, shm.name, layout, *args))
+            return [item for future in futures for item in future.result()]
+        finally:
+            for future in futures:
+                future.cancel()
+            for shm in segments:
+                shm.close()
+                shm.unlink()
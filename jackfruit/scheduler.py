@@ -0,0 +1,172 @@
+"""Process-wide inference queue with micro-batching and backpressure.
+
+Every Streamlit session, the batch tab and the CLI submit single images to
+one bounded queue. Worker threads drain it, grouping requests that arrive
+within ``batch_wait`` seconds into one forward pass. Each worker owns its own
+model instance because a YOLO model must not be called from several threads
+at once.
+"""
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FuturesTimeout
+
+# 0 keeps the old behaviour of calling the shared model directly.
+INFERENCE_WORKERS = int(os.getenv("JACKFRUIT_INFERENCE_WORKERS", "0"))
+INFERENCE_QUEUE_SIZE = int(os.getenv("JACKFRUIT_INFERENCE_QUEUE_SIZE", "64"))
+INFERENCE_BATCH_WAIT_MS = float(os.getenv("JACKFRUIT_INFERENCE_BATCH_WAIT_MS", "5"))
+INFERENCE_SUBMIT_TIMEOUT = float(os.getenv("JACKFRUIT_INFERENCE_SUBMIT_TIMEOUT", "30"))
+INFERENCE_RESULT_TIMEOUT = float(os.getenv("JACKFRUIT_INFERENCE_RESULT_TIMEOUT", "120"))
+WAIT_SAMPLES = 1024
+
+_STOP = object()
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+class InferenceScheduler:
+    def __init__(
+        self,
+        predict,
+        model_factory,
+        workers=1,
+        queue_size=INFERENCE_QUEUE_SIZE,
+        max_batch_size=8,
+        batch_wait=INFERENCE_BATCH_WAIT_MS / 1000,
+    ):
+        """predict(model, images, conf) returns one result per image; model_factory(index) builds a worker's model."""
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        if queue_size < 1 or max_batch_size < 1:
+            raise ValueError("queue_size and max_batch_size must be positive.")
+        self.predict = predict
+        self.model_factory = model_factory
+        self.max_batch_size = max_batch_size
+        self.batch_wait = batch_wait
+        self.queue_size = queue_size
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self._requests = 0
+        self._batches = 0
+        self._batched_images = 0
+        self._rejected = 0
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._work, args=(index,), name=f"jackfruit-infer-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def workers(self):
+        return len(self._threads)
+
+    def submit(self, image_cv, confidence_threshold, timeout=INFERENCE_SUBMIT_TIMEOUT):
+        if self._closed:
+            raise RuntimeError("The inference scheduler is shut down.")
+        future = Future()
+        try:
+            self._queue.put((image_cv, confidence_threshold, future, time.perf_counter()), timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise RuntimeError("The detector is busy; please try again in a moment.") from None
+        with self._lock:
+            self._requests += 1
+        return future
+
+    def run(self, images_cv, confidence_threshold, timeout=INFERENCE_RESULT_TIMEOUT):
+        futures = [self.submit(image_cv, confidence_threshold) for image_cv in images_cv]
+        deadline = time.perf_counter() + timeout
+        try:
+            return [future.result(timeout=max(0.0, deadline - time.perf_counter())) for future in futures]
+        except FuturesTimeout:
+            for future in futures:
+                future.cancel()
+            raise RuntimeError("Detection timed out; please try again in a moment.") from None
+
+    def stats(self):
+        with self._lock:
+            waits = sorted(self._waits)
+            batches = self._batches
+            return {
+                "workers": self.workers,
+                "queue_depth": self._queue.qsize(),
+                "queue_size": self.queue_size,
+                "requests": self._requests,
+                "rejected": self._rejected,
+                "batches": batches,
+                "avg_batch_size": self._batched_images / batches if batches else 0.0,
+                "wait_p50_ms": _percentile(waits, 0.5) * 1000,
+                "wait_p95_ms": _percentile(waits, 0.95) * 1000,
+                "wait_max_ms": (waits[-1] if waits else 0.0) * 1000,
+            }
+
+    def close(self, timeout=None):
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.perf_counter() + self.batch_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _work(self, index):
+        model = None
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            if not batch:
+                continue
+            started = time.perf_counter()
+            with self._lock:
+                self._waits.extend(started - enqueued for *_, enqueued in batch)
+
+            groups = {}
+            for request in batch:
+                if request[2].set_running_or_notify_cancel():
+                    groups.setdefault(request[1], []).append(request)
+            for confidence_threshold, requests in groups.items():
+                try:
+                    if model is None:
+                        model = self.model_factory(index)
+                    results = list(self.predict(model, [request[0] for request in requests], confidence_threshold))
+                    if len(results) != len(requests):
+                        raise RuntimeError(
+                            f"The detector returned {len(results)} results for {len(requests)} images."
+                        )
+                except Exception as exc:
+                    for request in requests:
+                        request[2].set_exception(exc)
+                    continue
+                with self._lock:
+                    self._batches += 1
+                    self._batched_images += len(requests)
+                for request, result in zip(requests, results):
+                    request[2].set_result(result)
@@ -0,0 +1,61 @@
+"""Theme stylesheet link for the Streamlit app.
+
+The stylesheet lives in ``static/theme.css`` and is served by Streamlit static
+serving, so a rerun only sends a ``<link>`` tag. Theme colours can be
+overridden with ``JACKFRUIT_THEME_<VARIABLE>`` (for example
+``JACKFRUIT_THEME_ACCENT_1=#ffa94d``), which adds a small ``:root`` block.
+"""
+import hashlib
+import os
+from functools import lru_cache
+from html import escape
+
+STATIC_URL = "app/static"
+THEME_ENV_PREFIX = "JACKFRUIT_THEME_"
+THEME_VARIABLES = (
+    "bg_primary",
+    "bg_secondary",
+    "text_primary",
+    "text_secondary",
+    "accent_1",
+    "accent_2",
+    "accent_3",
+    "gradient_1",
+    "gradient_2",
+    "gradient_3",
+    "card_shadow",
+    "border_color",
+)
+
+
+@lru_cache(maxsize=None)
+def stylesheet_version(path):
+    """Short content hash, so browsers cache the file until it changes."""
+    with open(path, "rb") as stylesheet:
+        return hashlib.sha256(stylesheet.read()).hexdigest()[:12]
+
+
+def theme_overrides(environ=None):
+    environ = os.environ if environ is None else environ
+    overrides = {}
+    for name in THEME_VARIABLES:
+        value = environ.get(THEME_ENV_PREFIX + name.upper(), "").strip()
+        if not value:
+            continue
+        if any(character in value for character in "{};<>"):
+            raise ValueError(f"Invalid CSS value for {THEME_ENV_PREFIX}{name.upper()}: {value!r}")
+        overrides[f"--{name.replace('_', '-')}"] = value
+    return overrides
+
+
+def theme_html(stylesheet_path, environ=None):
+    filename = os.path.basename(stylesheet_path)
+    html = (
+        f'<link rel="stylesheet" '
+        f'href="{STATIC_URL}/{escape(filename)}?v={stylesheet_version(stylesheet_path)}">'
+    )
+    overrides = theme_overrides(environ)
+    if overrides:
+        declarations = " ".join(f"{name}: {value};" for name, value in overrides.items())
+        html += f"<style>:root {{ {declarations} }}</style>"
+    return html
@@ -0,0 +1,30 @@
+"""Wall-clock timing of the stages of a detection request."""
+import time
+from contextlib import contextmanager
+
+from jackfruit import metrics
+
+
+class StageTimer:
+    def __init__(self, registry=None):
+        self.durations = {}
+        # Every stage also feeds the process-wide latency histograms.
+        self.registry = registry or metrics.REGISTRY
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.durations[name] = self.durations.get(name, 0.0) + elapsed
+            self.registry.observe(name, elapsed, metrics.REQUEST_STAGE_METRIC)
+
+    @property
+    def total(self):
+        return sum(self.durations.values())
+
+    def summary(self):
+        parts = [f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.durations.items()]
+        return " · ".join(parts + [f"total {self.total * 1000:.0f} ms"])
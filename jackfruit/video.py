@@ -0,0 +1,179 @@
+"""Video mode: stream frames, detect on a subset and count tracked fruit once.
+
+Frames are read one at a time from ``cv2.VideoCapture``; at most one
+detection batch of frames is held in memory, so memory stays flat however
+long the video is.
+"""
+import os
+import time
+
+from jackfruit import core
+from jackfruit.lazy import lazy_import
+
+np = lazy_import("numpy")
+evaluation = lazy_import("jackfruit.evaluation")
+
+# Detect on every Nth frame at least...
+VIDEO_FRAME_STRIDE = int(os.getenv("JACKFRUIT_VIDEO_FRAME_STRIDE", "5"))
+# ...and in between whenever the scene moved this much (mean absolute grey
+# level difference of a thumbnail, 0-1) since the last detected frame.
+VIDEO_CHANGE_THRESHOLD = float(os.getenv("JACKFRUIT_VIDEO_CHANGE_THRESHOLD", "0.08"))
+TRACK_IOU = float(os.getenv("JACKFRUIT_TRACK_IOU", "0.3"))
+# Detection passes a track may go unmatched before it is closed.
+TRACK_MAX_MISSES = int(os.getenv("JACKFRUIT_TRACK_MAX_MISSES", "3"))
+# Matches needed before a track counts, so one-off false positives do not.
+TRACK_MIN_HITS = int(os.getenv("JACKFRUIT_TRACK_MIN_HITS", "2"))
+SIGNATURE_SIZE = (64, 36)
+
+
+def iter_video_frames(path):
+    cv2 = core._cv2()
+    capture = cv2.VideoCapture(str(path))
+    if not capture.isOpened():
+        raise ValueError("The uploaded file is not a readable video.")
+    try:
+        index = 0
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            yield index, frame
+            index += 1
+    finally:
+        capture.release()
+
+
+def video_frame_count(path):
+    cv2 = core._cv2()
+    capture = cv2.VideoCapture(str(path))
+    try:
+        return int(capture.get(cv2.CAP_PROP_FRAME_COUNT)) or None
+    finally:
+        capture.release()
+
+
+def frame_signature(frame):
+    cv2 = core._cv2()
+    thumbnail = cv2.resize(frame, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(thumbnail, cv2.COLOR_BGR2GRAY).astype(np.float32) / 255
+
+
+class FrameSelector:
+    def __init__(self, stride=None, change_threshold=None):
+        self.stride = max(1, stride or VIDEO_FRAME_STRIDE)
+        self.change_threshold = VIDEO_CHANGE_THRESHOLD if change_threshold is None else change_threshold
+        self._last_index = None
+        self._last_signature = None
+
+    def select(self, index, frame):
+        signature = frame_signature(frame)
+        selected = (
+            self._last_index is None
+            or index - self._last_index >= self.stride
+            or float(np.mean(np.abs(signature - self._last_signature))) >= self.change_threshold
+        )
+        if selected:
+            self._last_index = index
+            self._last_signature = signature
+        return selected
+
+
+class IoUTracker:
+    """Greedy IoU association of per-frame boxes into fruit tracks."""
+
+    def __init__(self, iou_threshold=None, max_misses=None, min_hits=None):
+        self.iou_threshold = TRACK_IOU if iou_threshold is None else iou_threshold
+        self.max_misses = TRACK_MAX_MISSES if max_misses is None else max_misses
+        self.min_hits = TRACK_MIN_HITS if min_hits is None else min_hits
+        self.tracks = {}
+        self.counted = 0
+        self._next_id = 1
+
+    def update(self, boxes):
+        """boxes: (N, 4+) array whose first columns are x1, y1, x2, y2 of the fruit in one detected frame."""
+        boxes = np.asarray(boxes, dtype=np.float32)[:, :4]
+        track_ids = list(self.tracks)
+        matched, unmatched = set(), set(range(len(boxes)))
+        if track_ids and len(boxes):
+            iou = evaluation.box_iou(np.array([self.tracks[track_id]["box"] for track_id in track_ids]), boxes)
+            for flat in np.argsort(-iou, axis=None):
+                row, column = divmod(int(flat), len(boxes))
+                if iou[row, column] < self.iou_threshold:
+                    break
+                if row in matched or column not in unmatched:
+                    continue
+                matched.add(row)
+                unmatched.discard(column)
+                self._hit(self.tracks[track_ids[row]], boxes[column])
+
+        for row, track_id in enumerate(track_ids):
+            if row not in matched:
+                self.tracks[track_id]["misses"] += 1
+                if self.tracks[track_id]["misses"] > self.max_misses:
+                    del self.tracks[track_id]
+
+        for column in sorted(unmatched):
+            self.tracks[self._next_id] = track = {"hits": 0}
+            self._next_id += 1
+            self._hit(track, boxes[column])
+        return self.counted
+
+    def _hit(self, track, box):
+        track.update(box=box, misses=0, hits=track["hits"] + 1)
+        if track["hits"] == self.min_hits:
+            self.counted += 1
+
+
+def analyze_video(
+    path,
+    confidence_threshold,
+    stride=None,
+    change_threshold=None,
+    batch_size=None,
+    target_class_id=0,
+):
+    """Yield a progress dict per detection batch and a final one (done=True) with the unique count."""
+    floor_threshold = min(core.DETECTION_FLOOR, confidence_threshold)
+    selector = FrameSelector(stride, change_threshold)
+    tracker = IoUTracker()
+    batch_size = max(1, batch_size or core.BATCH_SIZE)
+    started = time.perf_counter()
+    frames_read = frames_detected = 0
+    pending = []
+
+    last = None
+
+    def flush():
+        nonlocal frames_detected, last
+        detections = core.detect_images([frame for _, frame in pending], floor_threshold)
+        for (index, frame), (boxes, names) in zip(pending, detections):
+            boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 6)
+            kept = boxes[(boxes[:, 4] >= confidence_threshold) & (boxes[:, 5] == target_class_id)]
+            tracker.update(kept)
+            frames_detected += 1
+            last = {"frame_index": index, "frame": frame, "boxes": boxes, "names": names, "in_frame": len(kept)}
+        pending.clear()
+
+    def progress(done):
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        return {
+            **last,
+            "unique_count": tracker.counted,
+            "frames_read": frames_read,
+            "frames_detected": frames_detected,
+            "fps": frames_read / elapsed,
+            "detection_fps": frames_detected / elapsed,
+            "done": done,
+        }
+
+    for index, frame in iter_video_frames(path):
+        frames_read += 1
+        if selector.select(index, frame):
+            pending.append((index, frame))
+            if len(pending) >= batch_size:
+                flush()
+                yield progress(done=False)
+    if pending:
+        flush()
+    if last is not None:
+        yield progress(done=True)
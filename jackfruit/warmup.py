@@ -0,0 +1,75 @@
+"""Background model preload so the first request does not pay for it."""
+import os
+import threading
+import time
+from functools import lru_cache
+
+from jackfruit import core
+from jackfruit.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+PRELOAD_MODEL = os.getenv("JACKFRUIT_PRELOAD_MODEL", "0").lower() in {"1", "true", "yes"}
+WARMUP_RUNS = int(os.getenv("JACKFRUIT_WARMUP_RUNS", "2"))
+
+
+def run_dummy_inferences(model, runs, image_size):
+    # Dummy passes trigger lazy runtime setup (kernel selection, graph
+    # compilation, allocator growth) at the real input size.
+    dummy = np.zeros((image_size, image_size, 3), dtype=np.uint8)
+    for _ in range(runs):
+        model(dummy, imgsz=image_size, conf=core.DETECTION_FLOOR, save=False, verbose=False)
+
+
+class ModelWarmup:
+    def __init__(self, runs=WARMUP_RUNS, image_size=None):
+        self.runs = runs
+        self.image_size = image_size or core.IMAGE_SIZE
+        self.error = None
+        self.duration = None
+        self._done = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="jackfruit-warmup", daemon=True)
+                self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    @property
+    def ready(self):
+        return self._done.is_set() and self.error is None
+
+    @property
+    def status(self):
+        if self._thread is None:
+            return "idle"
+        if not self._done.is_set():
+            return "warming"
+        return "failed" if self.error is not None else "ready"
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            pool = core.process_pool()
+            if pool is not None:
+                # Detection runs in the worker processes; this process never
+                # needs a model of its own.
+                pool.warm(self.runs, self.image_size)
+            else:
+                run_dummy_inferences(core.load_model(), self.runs, self.image_size)
+        except Exception as exc:
+            self.error = exc
+        finally:
+            self.duration = time.perf_counter() - started
+            self._done.set()
+
+
+@lru_cache(maxsize=1)
+def model_warmup():
+    return ModelWarmup()
@@ -1,6 +1,10 @@
+import os
 import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+# Keep test runs (and the app scripts they start) from writing history to ~/.cache.
+os.environ.setdefault("JACKFRUIT_HISTORY_DB", "")
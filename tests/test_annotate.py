@@ -0,0 +1,53 @@
+import numpy as np
+
+from jackfruit import annotate
+
+NAMES = {0: "jackfruit", 1: "leaf"}
+BOXES = np.array(
+    [
+        [10, 10, 40, 40, 0.9, 0],
+        [50, 50, 90, 90, 0.2, 0],
+        [60, 10, 90, 40, 0.95, 1],
+    ],
+    dtype=np.float32,
+)
+
+
+def test_render_draws_only_counted_boxes_and_leaves_the_input_untouched():
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+
+    count, confidences, rendered = annotate.render_detections(image, BOXES, NAMES, 0.5, max_size=0)
+
+    assert count == 1
+    assert confidences == [np.float32(0.9)]
+    assert not image.any()
+    assert rendered.shape == (100, 100, 3)
+    assert tuple(rendered[25, 10]) == annotate.BOX_COLOR
+    # The low-confidence jackfruit and the other class are not drawn.
+    assert not rendered[70, 50:90].any()
+    assert not rendered[38:42, 75].any()
+
+
+def test_render_converts_bgr_input_to_rgb_output():
+    image = np.zeros((20, 20, 3), dtype=np.uint8)
+    image[..., 0] = 200
+
+    _, _, rendered = annotate.render_detections(image, np.empty((0, 6)), NAMES, 0.5, max_size=0, channels="BGR")
+
+    assert tuple(rendered[5, 5]) == (0, 0, 200)
+
+
+def test_render_caps_the_output_size_and_scales_boxes():
+    image = np.zeros((300, 400, 3), dtype=np.uint8)
+    boxes = np.array([[100, 100, 300, 200, 0.9, 0]], dtype=np.float32)
+
+    _, _, rendered = annotate.render_detections(image, boxes, NAMES, 0.5, max_size=100)
+
+    assert rendered.shape == (75, 100, 3)
+    assert tuple(rendered[37, 25]) == annotate.BOX_COLOR
+
+
+def test_count_only_mode_skips_rendering(monkeypatch):
+    monkeypatch.setattr(annotate.core, "_cv2", lambda: (_ for _ in ()).throw(AssertionError("rendered")))
+
+    assert annotate.render_detections(None, BOXES, NAMES, 0.1, count_only=True) == (2, [np.float32(0.9), np.float32(0.2)], None)
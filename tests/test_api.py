@@ -0,0 +1,140 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from jackfruit import api, core  # noqa: E402
+
+BOXES = np.array(
+    [
+        [1, 2, 11, 12, 0.9, 0],
+        [5, 5, 9, 9, 0.3, 0],
+        [0, 0, 4, 4, 0.8, 1],
+    ],
+    dtype=np.float32,
+)
+NAMES = {0: "jackfruit", 1: "leaf"}
+
+
+def make_upload(size=(40, 20), image_format="PNG"):
+    upload = BytesIO()
+    Image.new("RGB", size, color=(10, 200, 30)).save(upload, image_format)
+    return upload.getvalue()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+
+    def fake_raw_detection(image_cv, floor_threshold):
+        calls.append((image_cv.shape, floor_threshold))
+        return BOXES, NAMES
+
+    def fake_batch_detection(images_cv, floor_threshold):
+        calls.append(([image_cv.shape for image_cv in images_cv], floor_threshold))
+        return [(BOXES, NAMES) for _ in images_cv]
+
+    monkeypatch.setattr(core, "model_runtime_available", lambda: True)
+    monkeypatch.setattr(core, "run_raw_detection", fake_raw_detection)
+    monkeypatch.setattr(core, "run_raw_batch_detection", fake_batch_detection)
+    monkeypatch.setattr(core, "image_to_cv2_bgr", np.asarray)
+    monkeypatch.setattr(core, "DECODE_SIZE", 10)
+    with TestClient(api.app) as test_client:
+        test_client.calls = calls
+        yield test_client
+
+
+def test_detect_returns_count_confidence_and_boxes_in_upload_coordinates(client):
+    response = client.post("/v1/detect?conf=0.5", files={"file": ("a.png", make_upload(), "image/png")})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 1
+    assert (body["width"], body["height"]) == (40, 20)
+    assert body["confidence"]["max_conf_pct"] == pytest.approx(90, abs=0.01)
+    # Decoded at 20x10, so boxes are scaled back up by 2.
+    assert body["boxes"][0] == {
+        "x1": 2.0, "y1": 4.0, "x2": 22.0, "y2": 24.0,
+        "confidence": 0.9, "class_id": 0, "class_name": "jackfruit",
+    }
+    assert [box["class_name"] for box in body["boxes"]] == ["jackfruit", "leaf"]
+    assert client.calls == [((10, 20, 3), 0.1)]
+
+
+def test_detect_rejects_invalid_images(client):
+    response = client.post("/v1/detect", files={"file": ("a.png", b"nope", "image/png")})
+
+    assert response.status_code == 422
+    assert "valid supported image" in response.json()["detail"]
+
+
+def test_detect_batch_reports_per_file_errors(client):
+    response = client.post(
+        "/v1/detect/batch?conf=0.2",
+        files=[
+            ("files", ("a.png", make_upload(), "image/png")),
+            ("files", ("b.txt", b"nope", "text/plain")),
+            ("files", ("c.jpg", make_upload((8, 8), "JPEG"), "image/jpeg")),
+        ],
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["name"] for result in results] == ["a.png", "b.txt", "c.jpg"]
+    assert [result.get("count") for result in results] == [2, None, 2]
+    assert "valid supported image" in results[1]["error"]
+    assert client.calls == [([(10, 20, 3), (8, 8, 3)], 0.1)]
+
+
+def test_detect_rejects_oversized_uploads(client, monkeypatch):
+    monkeypatch.setattr(api, "MAX_UPLOAD_BYTES", 10)
+
+    response = client.post("/v1/detect", files={"file": ("a.png", make_upload(), "image/png")})
+
+    assert response.status_code == 413
+
+
+def test_detect_batch_runs_model_batches_and_caps_the_file_count(client, monkeypatch):
+    monkeypatch.setattr(core, "BATCH_SIZE", 2)
+    files = [("files", (f"{index}.png", make_upload((8, 8)), "image/png")) for index in range(3)]
+
+    assert client.post("/v1/detect/batch", files=files).status_code == 200
+    assert [len(shapes) for shapes, _ in client.calls] == [2, 1]
+
+    monkeypatch.setattr(api, "MAX_BATCH_FILES", 2)
+    assert client.post("/v1/detect/batch", files=files).status_code == 413
+
+
+def test_detect_reports_configuration_errors_as_server_errors(client, monkeypatch):
+    def misconfigured(image_cv, floor_threshold):
+        raise ValueError("Unsupported model variant: 'fp8'. Choose fp32 or int8.")
+
+    monkeypatch.setattr(core, "run_raw_detection", misconfigured)
+
+    response = client.post("/v1/detect", files={"file": ("a.png", make_upload(), "image/png")})
+
+    assert response.status_code == 500
+    assert "model variant" in response.json()["detail"]
+
+
+def test_detect_reports_missing_model_runtime_as_unavailable(client, monkeypatch):
+    monkeypatch.setattr(core, "model_runtime_available", lambda: False)
+
+    response = client.post("/v1/detect", files={"file": ("a.png", make_upload(), "image/png")})
+
+    assert response.status_code == 503
+
+
+def test_metrics_endpoint_serves_prometheus_text(client):
+    client.post("/v1/detect", files={"file": ("a.png", make_upload(), "image/png")})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert 'jackfruit_stage_seconds_count{stage="decode"}' in response.text
@@ -1,39 +1,8 @@
-from io import BytesIO
 from types import SimpleNamespace
 
-import pytest
-from PIL import Image
-
 import app
 
 
-def make_image_file(size=(8, 8), image_format="PNG"):
-    image_file = BytesIO()
-    Image.new("RGB", size, color=(40, 120, 80)).save(image_file, image_format)
-    image_file.seek(0)
-    return image_file
-
-
-def test_validate_uploaded_image_accepts_valid_images():
-    image = app.validate_uploaded_image(make_image_file())
-
-    assert image.mode == "RGB"
-    assert image.size == (8, 8)
-    assert image.format == "PNG"
-
-
-def test_validate_uploaded_image_rejects_invalid_images():
-    with pytest.raises(ValueError, match="valid supported image"):
-        app.validate_uploaded_image(BytesIO(b"not an image"))
-
-
-def test_validate_uploaded_image_rejects_large_images(monkeypatch):
-    monkeypatch.setattr(app, "MAX_IMAGE_PIXELS", 10)
-
-    with pytest.raises(ValueError, match="too large"):
-        app.validate_uploaded_image(make_image_file(size=(4, 4)))
-
-
 def test_image_metadata_html_escapes_dynamic_values():
     html = app.image_metadata_html(
         SimpleNamespace(format="<script>alert(1)</script>", mode='RGB"><x', size=(3, 5))
@@ -44,50 +13,69 @@ def test_image_metadata_html_escapes_dynamic_values():
     assert "RGB&quot;&gt;&lt;x" in html
 
 
-def test_summarize_detections_filters_by_class_and_threshold():
-    boxes = [
-        SimpleNamespace(cls=[0], conf=[0.9]),
-        SimpleNamespace(cls=[0], conf=[0.2]),
-        SimpleNamespace(cls=[1], conf=[0.95]),
-        SimpleNamespace(cls=[0], conf=[0.5]),
-    ]
+def test_image_metadata_html_reports_original_and_decoded_size():
+    html = app.image_metadata_html(
+        SimpleNamespace(format="JPEG", mode="RGB", size=(500, 375), info={"original_size": (4000, 3000)})
+    )
 
-    count, confidences = app.summarize_detections(boxes, confidence_threshold=0.5)
+    assert "4000 x 3000 pixels (analyzed at 500 x 375)" in html
 
-    assert count == 2
-    assert confidences == [0.9, 0.5]
 
+def test_scheduler_status_text_reports_queue_and_wait():
+    text = app.scheduler_status_text(
+        {
+            "queue_depth": 3,
+            "queue_size": 64,
+            "wait_p50_ms": 4.2,
+            "wait_p95_ms": 18.7,
+            "avg_batch_size": 2.5,
+            "workers": 2,
+        }
+    )
+
+    assert "3/64 waiting" in text
+    assert "p95 19 ms" in text
+    assert "avg batch 2.5 on 2 worker(s)" in text
+
+
+def test_metrics_table_labels_request_stages():
+    rows = app.metrics_table(
+        [
+            {"metric": "jackfruit_stage_seconds", "stage": "decode", "count": 2, "mean_ms": 1.26, "p50_ms": 1.0, "p95_ms": 2.44},
+            {"metric": "jackfruit_request_stage_seconds", "stage": "inference", "count": 1, "mean_ms": 50, "p50_ms": 50, "p95_ms": 50},
+        ]
+    )
+
+    assert rows[0] == {"Stage": "decode", "Count": 2, "Mean ms": 1.3, "p50 ms": 1.0, "p95 ms": 2.4}
+    assert rows[1]["Stage"] == "request: inference"
 
-def test_confidence_summary_handles_empty_and_non_empty_values():
-    empty = app.confidence_summary([])
-    filled = app.confidence_summary([0.5, 0.75, 1.0])
 
-    assert empty["avg_conf"] == 0
-    assert filled["avg_conf"] == pytest.approx(0.75)
-    assert filled["min_conf_pct"] == pytest.approx(50.0)
-    assert filled["max_conf_pct"] == pytest.approx(100.0)
+def test_decoded_upload_validates_each_file_id_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(app, "validate_uploaded_image", lambda upload, max_size: calls.append(max_size) or "image")
+    monkeypatch.setattr(app, "image_to_cv2_bgr", lambda image: calls.append("bgr") or "bgr array")
+    cache = {}
 
+    assert app.decoded_upload(cache, SimpleNamespace(file_id="a"), 1024) == ("image", None)
+    assert app.decoded_upload(cache, SimpleNamespace(file_id="a"), 1024) == ("image", None)
+    assert app.upload_bgr(cache) == app.upload_bgr(cache) == "bgr array"
+    assert calls == [1024, "bgr"]
 
-def test_run_model_inference_cleans_up_temp_file(monkeypatch):
-    writes = []
-    removed = []
+    app.decoded_upload(cache, SimpleNamespace(file_id="b"), 1024)
+    assert "image_cv" not in cache
+    assert calls == [1024, "bgr", 1024]
 
-    class FakeCV2:
-        def imwrite(self, path, image):
-            writes.append((path, image))
-            return True
 
-    class FakeModel:
-        def __call__(self, path, conf, save):
-            assert path == writes[0][0]
-            assert conf == 0.7
-            assert save is False
-            return ["result"]
+def test_decoded_upload_caches_validation_errors(monkeypatch):
+    calls = []
 
-    monkeypatch.setattr(app, "_cv2", lambda: FakeCV2())
-    monkeypatch.setattr(app, "load_model", lambda: FakeModel())
-    monkeypatch.setattr(app.os, "remove", lambda path: removed.append(path))
+    def reject(upload, max_size):
+        calls.append(upload.file_id)
+        raise ValueError("not an image")
 
-    assert app.run_model_inference(object(), 0.7) == "result"
-    assert removed == [writes[0][0]]
+    monkeypatch.setattr(app, "validate_uploaded_image", reject)
+    cache = {}
 
+    assert app.decoded_upload(cache, SimpleNamespace(file_id="a"), None) == (None, "not an image")
+    assert app.decoded_upload(cache, SimpleNamespace(file_id="a"), None) == (None, "not an image")
+    assert calls == ["a"]
@@ -0,0 +1,86 @@
+import sqlite3
+
+import numpy as np
+
+from jackfruit.cache import DetectionCache, cache_key
+
+
+def make_boxes(*confidences):
+    return np.array([[0, 0, 10, 10, conf, 0] for conf in confidences], dtype=np.float32)
+
+
+def test_cache_key_depends_on_pixels_and_parts():
+    image = np.zeros((4, 4, 3), dtype=np.uint8)
+    changed = image.copy()
+    changed[0, 0, 0] = 1
+
+    assert cache_key(image, "rev-a") == cache_key(image.copy(), "rev-a")
+    assert cache_key(image, "rev-a") != cache_key(changed, "rev-a")
+    assert cache_key(image, "rev-a") != cache_key(image, "rev-b")
+
+
+def test_memory_tier_evicts_least_recently_used_entry():
+    cache = DetectionCache(max_entries=2)
+    cache.put("a", make_boxes(0.9), {0: "jackfruit"})
+    cache.put("b", make_boxes(0.8), {0: "jackfruit"})
+    cache.get("a")
+    cache.put("c", make_boxes(0.7), {0: "jackfruit"})
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_disk_tier_survives_new_cache_instance(tmp_path):
+    DetectionCache(max_entries=1, cache_dir=tmp_path).put(
+        "key", make_boxes(0.9, 0.4), {0: "jackfruit"}
+    )
+
+    boxes, names = DetectionCache(max_entries=1, cache_dir=tmp_path).get("key")
+
+    np.testing.assert_allclose(boxes[:, 4], [0.9, 0.4])
+    assert names == {0: "jackfruit"}
+
+
+def test_clear_empties_both_tiers(tmp_path):
+    cache = DetectionCache(cache_dir=tmp_path)
+    cache.put("key", make_boxes(0.9), {0: "jackfruit"})
+    cache.clear()
+
+    assert cache.get("key") is None
+    assert DetectionCache(cache_dir=tmp_path).get("key") is None
+
+
+def test_disk_tier_keeps_at_most_max_disk_entries(tmp_path):
+    cache = DetectionCache(max_entries=0, cache_dir=tmp_path, max_disk_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, make_boxes(0.9), {0: "jackfruit"})
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.get("c") is not None
+
+
+def test_disk_tier_failures_are_misses_and_skipped_writes(tmp_path, caplog):
+    cache = DetectionCache(max_entries=0, cache_dir=tmp_path)
+    with sqlite3.connect(cache.db_path) as connection:
+        connection.execute("DROP TABLE detections")
+
+    entry = cache.put("key", make_boxes(0.9), {0: "jackfruit"})
+
+    np.testing.assert_allclose(entry[0][:, 4], [0.9])
+    assert cache.get("key") is None
+    assert "write skipped" in caplog.text
+    assert "treating it as a miss" in caplog.text
+
+
+def test_unusable_cache_dir_disables_the_disk_tier(tmp_path, caplog):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+
+    cache = DetectionCache(cache_dir=blocker)
+
+    assert cache.db_path is None
+    assert cache.put("key", make_boxes(0.9), {0: "jackfruit"}) is not None
+    assert "disabled on disk" in caplog.text
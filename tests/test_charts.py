@@ -0,0 +1,36 @@
+import numpy as np
+
+from jackfruit import charts
+
+
+def test_lttb_keeps_endpoints_and_peaks_within_the_point_budget():
+    y = np.zeros(1000)
+    y[437] = 50
+    x, sampled = charts.lttb(np.arange(1, 1001), y, threshold=40)
+
+    assert len(x) == 40
+    assert x[0] == 1 and x[-1] == 1000
+    assert 438 in x
+    assert sampled.max() == 50
+
+
+def test_lttb_returns_short_series_unchanged():
+    x, y = charts.lttb(range(5), [1, 2, 3, 4, 5], threshold=10)
+
+    assert list(x) == [0, 1, 2, 3, 4]
+    assert list(y) == [1, 2, 3, 4, 5]
+
+
+def test_bin_frequencies_uses_one_bar_per_value_when_it_fits():
+    assert charts.bin_frequencies({0: 2, 3: 1, 1: 4}, max_bins=10) == ([0, 1, 3], [2, 4, 1], 1)
+    assert charts.bin_frequencies({}) == ([], [], 1)
+
+
+def test_bin_frequencies_merges_wide_ranges_into_at_most_max_bins():
+    frequencies = {value: 1 for value in range(100)}
+    centers, heights, width = charts.bin_frequencies(frequencies, max_bins=10)
+
+    assert len(centers) <= 10
+    assert sum(heights) == 100
+    assert width == 10
+    assert centers[0] == 4.5
@@ -0,0 +1,91 @@
+import csv
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from jackfruit import cli, core
+from jackfruit.cache import DetectionCache
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    calls = []
+
+    class FakeModel:
+        def __call__(self, images, conf, save, imgsz):
+            calls.append(len(images))
+            return [
+                SimpleNamespace(
+                    boxes=SimpleNamespace(
+                        data=np.array(
+                            [[0, 0, 1, 1, 0.9, 0], [0, 0, 1, 1, 0.3, 0]], dtype=np.float32
+                        )
+                    ),
+                    names={0: "jackfruit"},
+                )
+                for _ in images
+            ]
+
+    cache = DetectionCache(max_entries=0)
+    monkeypatch.setattr(core, "load_model", lambda: FakeModel())
+    monkeypatch.setattr(core, "result_cache", lambda: cache)
+    monkeypatch.setattr(core, "image_to_cv2_bgr", lambda image: np.asarray(image))
+    return calls
+
+
+def make_folder(root, count):
+    (root / "nested").mkdir(parents=True)
+    for index in range(count):
+        folder = root / "nested" if index % 2 else root
+        Image.new("RGB", (6, 4)).save(folder / f"image-{index}.png")
+    (root / "notes.txt").write_text("not an image")
+    (root / "broken.jpg").write_bytes(b"not an image")
+
+
+def test_cli_writes_jsonl_and_resumes(tmp_path, fake_model):
+    make_folder(tmp_path / "images", 5)
+    output = tmp_path / "results.jsonl"
+
+    assert cli.main([str(tmp_path / "images"), "-o", str(output), "--batch-size", "2", "--workers", "2", "--conf", "0.5"]) == 0
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+
+    assert len(rows) == 6
+    errors = [row for row in rows if row["error"]]
+    assert [row["path"] for row in errors] == [str(tmp_path / "images" / "broken.jpg")]
+    assert all(row["count"] == 1 and row["max_conf"] == pytest.approx(0.9) for row in rows if not row["error"])
+    assert sum(fake_model) == 5
+
+    fake_model.clear()
+    assert cli.main([str(tmp_path / "images"), "-o", str(output)]) == 0
+    assert fake_model == []
+    assert len(output.read_text().splitlines()) == 6
+
+
+def test_cli_writes_csv_for_glob_patterns(tmp_path, fake_model):
+    make_folder(tmp_path / "images", 3)
+    output = tmp_path / "results.csv"
+
+    cli.main([str(tmp_path / "images" / "**" / "*.png"), "-o", str(output), "--conf", "0.2"])
+
+    with open(output, newline="") as csv_file:
+        rows = list(csv.DictReader(csv_file))
+    assert len(rows) == 3
+    assert {row["count"] for row in rows} == {"2"}
+    assert {row["model_revision"] for row in rows} == {core.MODEL_REVISION}
+
+
+@pytest.mark.parametrize("suffix", ["jsonl", "csv"])
+def test_cli_resume_drops_a_partial_last_row(tmp_path, fake_model, suffix):
+    make_folder(tmp_path / "images", 2)
+    output = tmp_path / f"results.{suffix}"
+    cli.main([str(tmp_path / "images"), "-o", str(output)])
+    complete = output.read_text()
+    last_row = complete.splitlines()[-1]
+    output.write_text(complete[: len(complete) - len(last_row) // 2 - 1])
+
+    cli.main([str(tmp_path / "images"), "-o", str(output)])
+
+    assert output.read_text() == complete
@@ -0,0 +1,522 @@
+import functools
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image, ImageFile
+
+from jackfruit import core
+from jackfruit.cache import DetectionCache
+
+
+def make_image_file(size=(8, 8), image_format="PNG"):
+    image_file = BytesIO()
+    Image.new("RGB", size, color=(40, 120, 80)).save(image_file, image_format)
+    image_file.seek(0)
+    return image_file
+
+
+def test_validate_uploaded_image_accepts_valid_images():
+    image = core.validate_uploaded_image(make_image_file())
+
+    assert image.mode == "RGB"
+    assert image.size == (8, 8)
+    assert image.format == "PNG"
+
+
+def test_validate_uploaded_image_rejects_invalid_images():
+    with pytest.raises(ValueError, match="valid supported image"):
+        core.validate_uploaded_image(BytesIO(b"not an image"))
+
+
+def test_validate_uploaded_image_rejects_large_images(monkeypatch):
+    monkeypatch.setattr(core, "MAX_IMAGE_PIXELS", 10)
+
+    with pytest.raises(ValueError, match="too large"):
+        core.validate_uploaded_image(make_image_file(size=(4, 4)))
+
+
+def make_jpeg_file(size, orientation=None):
+    image_file = BytesIO()
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    Image.new("RGB", size, color=(200, 30, 10)).save(image_file, "JPEG", exif=exif)
+    image_file.seek(0)
+    return image_file
+
+
+def test_validate_uploaded_image_drafts_jpeg_near_model_size():
+    image = core.validate_uploaded_image(make_jpeg_file((2000, 1600)), max_size=300)
+
+    assert image.size == (500, 400)
+    assert image.mode == "RGB"
+    assert image.format == "JPEG"
+    assert image.info["original_size"] == (2000, 1600)
+
+
+def test_validate_uploaded_image_reduces_other_formats_and_keeps_full_size_by_default():
+    reduced = core.validate_uploaded_image(make_image_file(size=(900, 700)), max_size=200)
+    full = core.validate_uploaded_image(make_image_file(size=(900, 700)))
+
+    assert reduced.size == (300, 234)
+    assert reduced.info["original_size"] == (900, 700)
+    assert full.size == (900, 700)
+
+
+@pytest.mark.parametrize("mode", ["P", "1", "I;16"])
+def test_validate_uploaded_image_reduces_modes_pillow_cannot_reduce_directly(mode):
+    image_file = BytesIO()
+    Image.new(mode, (900, 700)).save(image_file, "PNG")
+    image_file.seek(0)
+
+    image = core.validate_uploaded_image(image_file, max_size=200)
+
+    assert image.mode == "RGB"
+    assert image.size == (300, 234)
+    assert image.info["original_size"] == (900, 700)
+
+
+def test_validate_uploaded_image_applies_exif_orientation():
+    image = core.validate_uploaded_image(make_jpeg_file((64, 32), orientation=6), max_size=16)
+
+    assert image.size == (16, 32)
+    assert image.info["original_size"] == (32, 64)
+
+
+def test_read_image_header_rejects_before_decoding(monkeypatch):
+    image_file = make_image_file(size=(4, 4))
+    monkeypatch.setattr(core, "MAX_IMAGE_PIXELS", 10)
+    monkeypatch.setattr(ImageFile.ImageFile, "load", lambda self: pytest.fail("pixels were decoded"))
+
+    with pytest.raises(ValueError, match="too large"):
+        core.read_image_header(image_file)
+
+
+def test_read_image_header_rejects_unlisted_formats():
+    with pytest.raises(ValueError, match="valid supported image"):
+        core.read_image_header(make_image_file(image_format="GIF"))
+
+
+def test_read_image_header_reports_oriented_size_without_decoding(monkeypatch):
+    image_file = make_jpeg_file((64, 32), orientation=6)
+    monkeypatch.setattr(ImageFile.ImageFile, "load", lambda self: pytest.fail("pixels were decoded"))
+
+    image, original_size = core.read_image_header(image_file)
+
+    assert image.size == (64, 32)
+    assert original_size == (32, 64)
+
+
+def test_validate_uploaded_image_reports_rotated_tiff_size_once():
+    image_file = BytesIO()
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    Image.new("RGB", (400, 200)).save(image_file, "TIFF", exif=exif)
+    image_file.seek(0)
+
+    image = core.validate_uploaded_image(image_file)
+
+    assert image.size == (200, 400)
+    assert image.info["original_size"] == (200, 400)
+
+
+def test_image_to_cv2_bgr_swaps_channels():
+    pytest.importorskip("cv2")
+
+    image_cv = core.image_to_cv2_bgr(Image.new("RGB", (3, 2), color=(10, 20, 30)))
+
+    assert image_cv.shape == (2, 3, 3)
+    assert image_cv[0, 0].tolist() == [30, 20, 10]
+
+
+def test_summarize_detections_filters_by_class_and_threshold():
+    boxes = [
+        SimpleNamespace(cls=[0], conf=[0.9]),
+        SimpleNamespace(cls=[0], conf=[0.2]),
+        SimpleNamespace(cls=[1], conf=[0.95]),
+        SimpleNamespace(cls=[0], conf=[0.5]),
+    ]
+
+    count, confidences = core.summarize_detections(boxes, confidence_threshold=0.5)
+
+    assert count == 2
+    assert confidences == [0.9, 0.5]
+
+
+def test_summarize_detections_uses_whole_box_arrays_and_multiple_classes():
+    boxes = SimpleNamespace(
+        cls=np.array([0, 0, 1, 2, 0], dtype=np.float32),
+        conf=np.array([0.9, 0.2, 0.95, 0.6, 0.5], dtype=np.float32),
+    )
+
+    count, confidences = core.summarize_detections(boxes, 0.5)
+    multi_count, multi_confidences = core.summarize_detections(boxes, 0.5, target_class_id=(0, 1))
+
+    assert count == 2
+    assert confidences == pytest.approx([0.9, 0.5])
+    assert all(isinstance(conf, float) for conf in confidences)
+    assert multi_count == 3
+    assert multi_confidences == pytest.approx([0.9, 0.95, 0.5])
+    assert core.summarize_detections(None, 0.5) == (0, [])
+
+
+def test_confidence_summary_handles_empty_and_non_empty_values():
+    empty = core.confidence_summary([])
+    filled = core.confidence_summary([0.5, 0.75, 1.0])
+
+    assert empty["avg_conf"] == 0
+    assert filled["avg_conf"] == pytest.approx(0.75)
+    assert filled["min_conf_pct"] == pytest.approx(50.0)
+    assert filled["max_conf_pct"] == pytest.approx(100.0)
+
+
+def test_run_model_inference_cleans_up_temp_file(monkeypatch):
+    writes = []
+    removed = []
+
+    class FakeCV2:
+        def imwrite(self, path, image):
+            writes.append((path, image))
+            return True
+
+    class FakeModel:
+        def __call__(self, path, conf, save, imgsz):
+            assert path == writes[0][0]
+            assert conf == 0.7
+            assert save is False
+            return ["result"]
+
+    monkeypatch.setattr(core, "_cv2", lambda: FakeCV2())
+    monkeypatch.setattr(core, "load_model", lambda: FakeModel())
+    monkeypatch.setattr(core.os, "remove", lambda path: removed.append(path))
+
+    assert core.run_model_inference(object(), 0.7, source="file") == "result"
+    assert removed == [writes[0][0]]
+
+
+def test_run_model_inference_passes_array_without_temp_file(monkeypatch):
+    image_cv = object()
+    calls = []
+
+    class FakeCV2:
+        def imwrite(self, path, image):
+            raise AssertionError("array inference must not write a temp file")
+
+    class FakeModel:
+        def __call__(self, source, conf, save, imgsz):
+            calls.append((source, conf, save, imgsz))
+            return ["result"]
+
+    monkeypatch.setattr(core, "_cv2", lambda: FakeCV2())
+    monkeypatch.setattr(core, "load_model", lambda: FakeModel())
+
+    assert core.run_model_inference(image_cv, 0.4, source="array") == "result"
+    assert calls == [(image_cv, 0.4, False, core.IMAGE_SIZE)]
+
+
+def test_run_model_inference_rejects_unknown_source():
+    with pytest.raises(ValueError, match="Unsupported inference source"):
+        core.run_model_inference(object(), 0.5, source="socket")
+
+
+
+def test_run_raw_detection_runs_model_once_at_floor(monkeypatch):
+    calls = []
+    image_cv = np.zeros((4, 4, 3), dtype=np.uint8)
+    boxes = SimpleNamespace(data=np.array([[0, 0, 2, 2, 0.8, 0]], dtype=np.float32))
+    result = SimpleNamespace(boxes=boxes, names={0: "jackfruit"})
+
+    def fake_inference(image, conf):
+        calls.append(conf)
+        return result
+
+    cache = DetectionCache()
+    monkeypatch.setattr(core, "result_cache", lambda: cache)
+    monkeypatch.setattr(core, "run_model_inference", fake_inference)
+
+    first = core.run_raw_detection(image_cv, 0.1)
+    data, names = core.run_raw_detection(image_cv.copy(), 0.1)
+
+    assert calls == [0.1]
+    np.testing.assert_allclose(first[0], data)
+    np.testing.assert_allclose(data, boxes.data)
+    assert names == {0: "jackfruit"}
+
+
+def test_switching_model_variant_misses_the_disk_cache(monkeypatch, tmp_path):
+    calls = []
+    image_cv = np.zeros((4, 4, 3), dtype=np.uint8)
+    result = SimpleNamespace(boxes=SimpleNamespace(data=np.zeros((0, 6), dtype=np.float32)), names={0: "jackfruit"})
+
+    def fake_inference(image, conf):
+        calls.append(core.MODEL_VARIANT)
+        return result
+
+    monkeypatch.setattr(core, "MODEL_VARIANT", "fp32")
+    monkeypatch.setattr(core, "run_model_inference", fake_inference)
+    monkeypatch.setattr(core, "result_cache", lambda: DetectionCache(cache_dir=tmp_path))
+    core.run_raw_detection(image_cv, 0.1)
+    core.run_raw_detection(image_cv, 0.1)
+
+    monkeypatch.setattr(core, "MODEL_VARIANT", "int8")
+    core.run_raw_detection(image_cv, 0.1)
+
+    assert calls == ["fp32", "int8"]
+
+
+@pytest.mark.parametrize("setting, value", [("MODEL_BACKEND", "onnx"), ("IMAGE_SIZE", 320)])
+def test_detection_cache_key_changes_with_model_settings(monkeypatch, setting, value):
+    image_cv = np.zeros((4, 4, 3), dtype=np.uint8)
+    key = core.detection_cache_key(image_cv, 0.1)
+
+    monkeypatch.setattr(core, setting, value)
+
+    assert core.detection_cache_key(image_cv, 0.1) != key
+
+
+def test_raw_detections_are_rethresholded_without_the_model():
+    boxes = np.array(
+        [
+            [0, 0, 1, 1, 0.9, 0],
+            [0, 0, 1, 1, 0.2, 0],
+            [0, 0, 1, 1, 0.95, 1],
+            [0, 0, 1, 1, 0.5, 0],
+        ],
+        dtype=np.float32,
+    )
+
+    count, confidences = core.summarize_raw_detections(boxes, confidence_threshold=0.5)
+
+    assert count == 2
+    assert confidences == pytest.approx([0.9, 0.5])
+    assert len(core.threshold_detections(boxes, 0.5)) == 3
+    assert len(core.threshold_detections(boxes, 0.1)) == 4
+
+
+def test_iter_batch_analysis_runs_one_forward_pass_per_batch(monkeypatch):
+    forward_calls = []
+
+    class FakeModel:
+        def __call__(self, images, conf, save, imgsz):
+            forward_calls.append(len(images))
+            return [
+                SimpleNamespace(
+                    boxes=SimpleNamespace(data=np.array([[0, 0, 1, 1, 0.9, 0]], dtype=np.float32)),
+                    names={0: "jackfruit"},
+                )
+                for _ in images
+            ]
+
+    cache = DetectionCache(max_entries=0)
+    monkeypatch.setattr(core, "result_cache", lambda: cache)
+    monkeypatch.setattr(core, "load_model", lambda: FakeModel())
+    monkeypatch.setattr(core, "image_to_cv2_bgr", lambda image: np.asarray(image))
+
+    uploads = []
+    for index in range(5):
+        upload = make_image_file(size=(4 + index, 4))
+        upload.name = f"image-{index}.png"
+        uploads.append(upload)
+    broken = BytesIO(b"not an image")
+    broken.name = "broken.png"
+    uploads.insert(2, broken)
+
+    batches = list(core.iter_batch_analysis(uploads, batch_size=2, max_workers=2))
+
+    assert [len(rows) for rows in batches] == [2, 2, 2]
+    assert forward_calls == [2, 1, 2]
+    rows = [row for batch in batches for row in batch]
+    assert [row["name"] for row in rows] == [upload.name for upload in uploads]
+    assert rows[2]["error"] and rows[2]["boxes"] is None
+    assert all(len(row["boxes"]) == 1 for index, row in enumerate(rows) if index != 2)
+
+
+def test_tile_windows_cover_image_with_overlap():
+    windows = core.tile_windows(width=1000, height=600, tile_size=512, overlap=0.25)
+
+    assert windows[0] == (0, 0, 512, 512)
+    assert windows[-1] == (488, 88, 1000, 600)
+    assert {x1 for _, _, x1, _ in windows} == {512, 896, 1000}
+    assert core.tile_windows(width=100, height=80, tile_size=512, overlap=0.25) == [(0, 0, 100, 80)]
+
+
+def test_non_max_suppression_merges_duplicates_per_class():
+    boxes = np.array(
+        [
+            [0, 0, 10, 10, 0.6, 0],
+            [1, 0, 11, 10, 0.9, 0],
+            [1, 0, 11, 10, 0.8, 1],
+            [50, 50, 60, 60, 0.7, 0],
+        ],
+        dtype=np.float32,
+    )
+
+    kept = core.non_max_suppression(boxes, iou_threshold=0.5)
+
+    assert kept[:, 4].tolist() == pytest.approx([0.9, 0.8, 0.7])
+
+
+def test_run_tiled_detection_offsets_and_merges_tile_boxes(monkeypatch):
+    forward_calls = []
+
+    class FakeModel:
+        def __call__(self, tiles, conf, save, imgsz):
+            forward_calls.append([tile.shape[:2] for tile in tiles])
+            # Every tile reports a fruit in its top-left corner.
+            return [
+                SimpleNamespace(
+                    boxes=SimpleNamespace(data=np.array([[0, 0, 8, 8, 0.9, 0]], dtype=np.float32)),
+                    names={0: "jackfruit"},
+                )
+                for _ in tiles
+            ]
+
+    cache = DetectionCache(max_entries=0)
+    monkeypatch.setattr(core, "result_cache", lambda: cache)
+    monkeypatch.setattr(core, "load_model", lambda: FakeModel())
+
+    boxes, names = core.run_tiled_detection(
+        np.zeros((32, 48, 3), dtype=np.uint8), tile_size=16, overlap=0, batch_size=4
+    )
+
+    assert [len(call) for call in forward_calls] == [4, 2]
+    assert all(shape == (16, 16) for call in forward_calls for shape in call)
+    assert sorted(map(tuple, boxes[:, :2].tolist())) == [
+        (0, 0), (0, 16), (16, 0), (16, 16), (32, 0), (32, 16)
+    ]
+    assert names == {0: "jackfruit"}
+
+
+@pytest.fixture
+def fake_ultralytics(monkeypatch, tmp_path):
+    checkpoint = tmp_path / "snapshots" / "rev" / "best.pt"
+    checkpoint.parent.mkdir(parents=True)
+    checkpoint.write_bytes(b"weights")
+    events = []
+
+    class FakeYOLO:
+        def __init__(self, path, task=None):
+            events.append(("load", Path(path).name, task))
+            self.path = Path(path)
+
+        def export(self, format, **options):
+            events.append(("export", format, options))
+            exported = self.path.with_suffix(".onnx")
+            exported.write_bytes(b"onnx")
+            return str(exported)
+
+    monkeypatch.setitem(sys.modules, "ultralytics", SimpleNamespace(YOLO=FakeYOLO))
+    monkeypatch.setattr(core, "download_model", lambda: str(checkpoint))
+    core.load_model.cache_clear()
+    yield events
+    core.load_model.cache_clear()
+
+
+def test_load_model_uses_checkpoint_for_torch_backend(monkeypatch, fake_ultralytics):
+    monkeypatch.setattr(core, "MODEL_BACKEND", "torch")
+
+    core.load_model()
+
+    assert fake_ultralytics == [("load", "best.pt", None)]
+
+
+def test_load_model_exports_onnx_once_next_to_checkpoint(monkeypatch, fake_ultralytics):
+    monkeypatch.setattr(core, "MODEL_BACKEND", "onnx")
+
+    core.load_model()
+    core.load_model.cache_clear()
+    core.load_model()
+
+    assert fake_ultralytics == [
+        ("load", "best.pt", None),
+        ("export", "onnx", {"dynamic": True, "imgsz": core.IMAGE_SIZE}),
+        ("load", "best.onnx", "detect"),
+        ("load", "best.onnx", "detect"),
+    ]
+
+
+def test_exported_model_path_rejects_unknown_backend(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported model backend"):
+        core.exported_model_path(tmp_path / "best.pt", "tensorrt-ish")
+
+
+def test_load_model_quantizes_int8_variant_once(monkeypatch, fake_ultralytics):
+    quantized = []
+
+    class FakeOnnxModel:
+        def __init__(self, path):
+            self.metadata_props = [f"meta:{Path(path).name}"]
+
+    def quantize_dynamic(source, target, weight_type):
+        quantized.append((Path(source).name, weight_type))
+        Path(target).write_bytes(b"int8")
+
+    saved = []
+    monkeypatch.setitem(
+        sys.modules,
+        "onnx",
+        SimpleNamespace(load=FakeOnnxModel, save=lambda model, path: saved.append(model.metadata_props)),
+    )
+    monkeypatch.setitem(
+        sys.modules,
+        "onnxruntime.quantization",
+        SimpleNamespace(QuantType=SimpleNamespace(QUInt8="QUInt8"), quantize_dynamic=quantize_dynamic),
+    )
+    monkeypatch.setattr(core, "MODEL_VARIANT", "int8")
+
+    core.load_model()
+    core.load_model.cache_clear()
+    core.load_model()
+
+    assert quantized == [("best.onnx", "QUInt8")]
+    assert saved == [["meta:best.onnx"]]
+    assert fake_ultralytics[-2:] == [("load", "best.int8.onnx", "detect")] * 2
+
+
+def test_load_model_rejects_unknown_variant(monkeypatch, fake_ultralytics):
+    monkeypatch.setattr(core, "MODEL_VARIANT", "int4")
+
+    with pytest.raises(ValueError, match="Unsupported model variant"):
+        core.load_model()
+
+
+def test_concurrent_first_load_model_calls_build_one_model(monkeypatch):
+    builds = []
+
+    def slow_build():
+        builds.append(1)
+        time.sleep(0.05)
+        return object()
+
+    monkeypatch.setattr(core, "_cached_model", functools.lru_cache(maxsize=1)(slow_build))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        models = list(executor.map(lambda _: core.load_model(), range(8)))
+
+    assert len(builds) == 1
+    assert all(model is models[0] for model in models)
+
+
+def test_failed_export_leaves_no_artifact_behind(monkeypatch, tmp_path):
+    checkpoint = tmp_path / "best.pt"
+    checkpoint.write_bytes(b"weights")
+
+    class CrashingYOLO:
+        def __init__(self, path, task=None):
+            self.path = Path(path)
+
+        def export(self, format, **options):
+            self.path.with_suffix(".onnx").write_bytes(b"trunc")
+            raise RuntimeError("export crashed")
+
+    monkeypatch.setitem(sys.modules, "ultralytics", SimpleNamespace(YOLO=CrashingYOLO))
+
+    with pytest.raises(RuntimeError, match="export crashed"):
+        core.exported_model_path(checkpoint, "onnx")
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["best.pt"]
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from jackfruit import evaluation
+
+
+def test_load_yolo_labels_converts_to_pixel_corners(tmp_path):
+    label_path = tmp_path / "image.txt"
+    label_path.write_text("0 0.5 0.5 0.2 0.4\n")
+
+    labels = evaluation.load_yolo_labels(label_path, width=100, height=50)
+
+    np.testing.assert_allclose(labels, [[40, 15, 60, 35, 0]], rtol=1e-6)
+    assert evaluation.load_yolo_labels(tmp_path / "missing.txt", 10, 10).shape == (0, 5)
+
+
+def test_match_detections_allows_one_prediction_per_label():
+    labels = np.array([[0, 0, 10, 10, 0]], dtype=float)
+    predictions = np.array(
+        [[0, 0, 10, 10, 0.6, 0], [0, 0, 10, 10, 0.9, 0], [0, 0, 10, 10, 0.8, 1]],
+        dtype=float,
+    )
+
+    matches = evaluation.match_detections(predictions, labels)
+
+    assert matches[:, 0].tolist() == [False, True, False]
+
+
+def test_mean_average_precision_is_perfect_for_exact_predictions():
+    labels = np.array([[0, 0, 10, 10, 0], [20, 20, 30, 30, 0]], dtype=float)
+    predictions = np.array([[0, 0, 10, 10, 0.9, 0], [20, 20, 30, 30, 0.8, 0]], dtype=float)
+
+    assert evaluation.mean_average_precision([(predictions, labels)]) == {
+        "map50": pytest.approx(1.0),
+        "map50_95": pytest.approx(1.0),
+    }
+
+
+def test_average_precision_penalizes_false_positives_ranked_first():
+    assert evaluation.average_precision([False, True], [0.9, 0.8], label_count=1) == pytest.approx(0.5)
+    assert evaluation.average_precision([], [], label_count=2) == 0.0
@@ -0,0 +1,142 @@
+import sqlite3
+
+import pytest
+
+from jackfruit import core, history
+
+
+def record(count, name="a.jpg"):
+    return history.make_record("image", name, count, [0.5, 0.7][:count], 0.25, payload=b"pixels")
+
+
+def test_make_record_includes_confidence_latency_and_revision():
+    entry = record(2)
+
+    assert entry["count"] == 2
+    assert entry["avg_conf"] == pytest.approx(0.6)
+    assert entry["max_conf"] == pytest.approx(0.7)
+    assert entry["latency_ms"] == pytest.approx(250)
+    assert entry["model_revision"] == core.MODEL_REVISION
+    assert len(entry["image_sha256"]) == 64
+
+
+def test_history_store_uses_wal_and_survives_reopening(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    history.HistoryStore(path).append([record(1, "first.jpg"), record(2, "second.jpg")], "kiosk")
+
+    reopened = history.HistoryStore(path)
+
+    assert len(reopened) == 2
+    assert [entry["name"] for entry in reopened.recent(5, "kiosk")] == ["first.jpg", "second.jpg"]
+    assert [entry["name"] for entry in reopened.recent(1, "kiosk")] == ["second.jpg"]
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_session_history_keeps_a_bounded_window_over_the_store(tmp_path):
+    store = history.HistoryStore(tmp_path / "history.sqlite3")
+    session = history.SessionHistory(store, window=3, session_id="kiosk")
+
+    for count in range(5):
+        session.append(record(count % 3))
+
+    assert session.counts == [2, 0, 1]
+    assert len(store) == 5
+    assert history.SessionHistory(store, window=2, session_id="kiosk").counts == [0, 1]
+
+    session.clear()
+    assert not session
+    assert len(store) == 0
+
+
+def test_session_history_works_without_a_store():
+    session = history.SessionHistory(window=2)
+    session.append(record(1), record(2), record(0))
+
+    assert session.counts == [2, 0]
+
+
+def test_running_stats_are_updated_on_append_and_seeded_from_the_store(tmp_path):
+    store = history.HistoryStore(tmp_path / "history.sqlite3")
+    session = history.SessionHistory(store, window=2, session_id="kiosk")
+    session.append(record(1), record(2), record(2))
+
+    assert session.stats.analyses == 3
+    assert session.stats.total == 5
+    assert session.stats.maximum == 2
+    assert session.stats.mean == pytest.approx(5 / 3)
+    assert session.first_index == 2
+
+    reopened = history.SessionHistory(store, window=2, session_id="kiosk")
+    assert reopened.stats.frequencies == {1: 1, 2: 2}
+    assert reopened.first_index == 2
+
+    session.clear()
+    assert session.stats.analyses == 0
+    assert session.stats.mean == 0.0
+
+
+def test_session_history_revision_changes_on_append_and_clear():
+    session = history.SessionHistory(window=2)
+    revisions = [session.revision]
+    session.append(record(1))
+    revisions.append(session.revision)
+    session.clear()
+    revisions.append(session.revision)
+
+    assert len(set(revisions)) == 3
+
+
+def test_sessions_share_the_default_history_across_restarts(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    history.SessionHistory(history.HistoryStore(path)).append(record(1), record(2))
+
+    resumed = history.SessionHistory(history.HistoryStore(path))
+
+    assert resumed.session_id == history.HISTORY_ID
+    assert resumed.counts == [1, 2]
+    assert resumed.stats.total == 3
+
+
+def test_history_store_keeps_at_most_max_rows(tmp_path):
+    store = history.HistoryStore(tmp_path / "history.sqlite3", max_rows=3)
+    for count in range(5):
+        store.append([record(count)], "kiosk")
+
+    assert len(store) == 3
+    assert [entry["count"] for entry in store.recent(10, "kiosk")] == [2, 3, 4]
+
+
+def test_sessions_only_see_and_clear_their_own_rows(monkeypatch, tmp_path):
+    monkeypatch.setattr(history, "HISTORY_PER_SESSION", True)
+    store = history.HistoryStore(tmp_path / "history.sqlite3")
+    first = history.SessionHistory(store)
+    second = history.SessionHistory(store)
+    first.append(record(1), record(4))
+    second.append(record(2))
+
+    assert first.session_id != second.session_id
+    assert history.SessionHistory(store, session_id=second.session_id).counts == [2]
+    assert store.running_stats(first.session_id).total == 5
+
+    second.clear()
+    assert len(store) == 2
+    assert history.SessionHistory(store, session_id=first.session_id).counts == [1, 4]
+
+
+def test_history_store_adds_the_session_column_to_older_databases(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE history (id INTEGER PRIMARY KEY AUTOINCREMENT, created_at REAL NOT NULL, "
+            "source TEXT NOT NULL, name TEXT, image_sha256 TEXT, count INTEGER NOT NULL, avg_conf REAL, "
+            "min_conf REAL, max_conf REAL, latency_ms REAL, model_revision TEXT)"
+        )
+
+        connection.execute("INSERT INTO history (created_at, source, count) VALUES (0, 'image', 7)")
+
+    store = history.HistoryStore(path)
+    store.append([record(3)], "kiosk")
+
+    assert store.recent(5, "kiosk")[0]["count"] == 3
+    assert store.recent(5, history.DEFAULT_HISTORY_ID)[0]["count"] == 7
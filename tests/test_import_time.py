@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+IMPORT_BUDGET_MS = float(os.getenv("JACKFRUIT_IMPORT_BUDGET_MS", "400"))
+HEAVY_MODULES = ("numpy", "cv2", "torch", "ultralytics", "pandas", "plotly.express")
+
+
+def run_python(code):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def cumulative_import_ms(stderr, module):
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise AssertionError(f"{module} was not imported")
+
+
+def loaded_heavy_modules_code(setup):
+    return (
+        f"{setup}\n"
+        "import sys, types\n"
+        "print(sorted(name for name in " + repr(HEAVY_MODULES) + "\n"
+        "    if type(sys.modules.get(name)) is types.ModuleType))\n"
+    )
+
+
+def test_core_import_is_lazy_and_within_budget():
+    completed = run_python(loaded_heavy_modules_code("import jackfruit.core, jackfruit.warmup"))
+
+    assert completed.stdout.strip() == "[]"
+    assert cumulative_import_ms(completed.stderr, "jackfruit.core") < IMPORT_BUDGET_MS
+
+
+def test_app_script_skips_charts_and_model_runtime_without_history():
+    completed = run_python(loaded_heavy_modules_code("import app"))
+
+    assert completed.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,90 @@
+import io
+import socket
+import time
+import urllib.request
+
+import pytest
+
+from jackfruit import core, metrics
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = metrics.Histogram(buckets=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.05, 0.05, 0.5, 5.0):
+        histogram.observe(seconds)
+
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.count == 5
+    assert histogram.sum == pytest.approx(5.605)
+    assert histogram.quantile(0.5) == pytest.approx(0.01 + 0.09 * 0.75)
+    assert histogram.quantile(1.0) == 1.0
+
+
+def test_registry_renders_prometheus_histograms():
+    registry = metrics.MetricsRegistry(buckets=(0.1, 1.0))
+    registry.observe("decode", 0.05)
+    registry.observe("decode", 0.5)
+    registry.observe("inference", 2.0, metric=metrics.REQUEST_STAGE_METRIC)
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE jackfruit_stage_seconds histogram" in text
+    assert 'jackfruit_stage_seconds_bucket{stage="decode",le="0.1"} 1' in text
+    assert 'jackfruit_stage_seconds_bucket{stage="decode",le="+Inf"} 2' in text
+    assert 'jackfruit_stage_seconds_count{stage="decode"} 2' in text
+    assert 'jackfruit_request_stage_seconds_sum{stage="inference"} 2.0' in text
+    assert [row["stage"] for row in registry.summary()] == ["inference", "decode"]
+
+
+def test_instrumented_core_functions_record_stages(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, "REGISTRY", registry)
+    boxes = core.np.array([[0, 0, 1, 1, 0.9, 0]], dtype=core.np.float32)
+
+    core.summarize_raw_detections(boxes, 0.5)
+    core._predict(lambda images, conf, save, imgsz: images, [1, 2], 0.5)
+
+    assert {row["stage"]: row["count"] for row in registry.summary()} == {"summarize": 1, "model_forward": 1}
+
+
+def test_decode_stage_excludes_header_time(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, "REGISTRY", registry)
+    read_header = core.read_image_header.__wrapped__
+
+    @metrics.timed("header")
+    def slow_header(uploaded_file):
+        time.sleep(0.1)
+        return read_header(uploaded_file)
+
+    monkeypatch.setattr(core, "read_image_header", slow_header)
+    upload = io.BytesIO()
+    core.Image.new("RGB", (8, 8)).save(upload, format="PNG")
+    upload.seek(0)
+
+    core.validate_uploaded_image(upload)
+
+    stages = {row["stage"]: row for row in registry.summary()}
+    assert stages["header"]["mean_ms"] >= 100
+    assert stages["decode"]["count"] == 1
+    assert stages["decode"]["mean_ms"] < 100
+
+
+def test_metrics_server_serves_prometheus_text(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    registry.observe("decode", 0.01)
+    monkeypatch.setattr(metrics, "REGISTRY", registry)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = metrics.start_metrics_server(port=port, host="127.0.0.1")
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            body = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+        metrics.start_metrics_server.cache_clear()
+
+    assert 'jackfruit_stage_seconds_count{stage="decode"} 1' in body
@@ -0,0 +1,88 @@
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from jackfruit import core, model_store
+
+
+@pytest.fixture
+def fake_hub(monkeypatch, tmp_path):
+    source = tmp_path / "hub" / "best.pt"
+    source.parent.mkdir()
+    source.write_bytes(b"weights")
+    downloads = []
+
+    def hf_hub_download(repo_id, filename, revision):
+        downloads.append((repo_id, filename, revision))
+        return str(source)
+
+    monkeypatch.setitem(sys.modules, "huggingface_hub", SimpleNamespace(hf_hub_download=hf_hub_download))
+    return downloads
+
+
+def test_prefetch_then_resolve_without_hub(monkeypatch, tmp_path, fake_hub):
+    store = tmp_path / "store"
+    target = model_store.prefetch("org/jackfruit", "rev1", "best.pt", store)
+
+    assert target == store / "org--jackfruit" / "rev1" / "best.pt"
+    assert fake_hub == [("org/jackfruit", "best.pt", "rev1")]
+    manifest = model_store.read_manifest(target.parent)
+    assert manifest["files"]["best.pt"]["sha256"] == model_store.sha256_path(target)
+
+    monkeypatch.setitem(sys.modules, "huggingface_hub", None)
+    assert model_store.resolve("org/jackfruit", "rev1", "best.pt", store) == target
+
+
+def test_resolve_rejects_missing_and_tampered_artifacts(tmp_path, fake_hub):
+    store = tmp_path / "store"
+    with pytest.raises(RuntimeError, match="not in the model store"):
+        model_store.resolve("org/jackfruit", "rev1", "best.pt", store)
+
+    target = model_store.prefetch("org/jackfruit", "rev1", "best.pt", store)
+    target.write_bytes(b"tampered")
+
+    with pytest.raises(RuntimeError, match="Checksum mismatch"):
+        model_store.resolve("org/jackfruit", "rev1", "best.pt", store)
+
+
+def test_download_model_uses_store_in_offline_mode(monkeypatch, tmp_path, fake_hub):
+    monkeypatch.setattr(model_store, "MODEL_STORE_DIR", tmp_path / "store")
+    target = model_store.prefetch(core.MODEL_REPO_ID, core.MODEL_REVISION, core.MODEL_FILENAME)
+    fake_hub.clear()
+    monkeypatch.setattr(model_store, "MODEL_OFFLINE", True)
+
+    assert core.download_model() == str(target)
+    assert fake_hub == []
+
+
+def test_sha256_path_covers_directory_artifacts(tmp_path):
+    exported = tmp_path / "best_openvino_model"
+    exported.mkdir()
+    (exported / "best.xml").write_text("graph")
+    (exported / "best.bin").write_bytes(b"weights")
+    before = model_store.sha256_path(exported)
+
+    (exported / "best.bin").write_bytes(b"changed")
+
+    assert model_store.sha256_path(exported) != before
+
+
+def test_offline_runtime_artifacts_are_verified_and_never_exported(monkeypatch, tmp_path, fake_hub):
+    monkeypatch.setattr(model_store, "MODEL_STORE_DIR", tmp_path / "store")
+    target = model_store.prefetch(core.MODEL_REPO_ID, core.MODEL_REVISION, core.MODEL_FILENAME)
+    monkeypatch.setattr(model_store, "MODEL_OFFLINE", True)
+    monkeypatch.setattr(core, "MODEL_BACKEND", "onnx")
+    monkeypatch.setattr(core, "exported_model_path", lambda *args: pytest.fail("exported while offline"))
+
+    with pytest.raises(RuntimeError, match="not in the model store"):
+        core.runtime_model_path(target)
+
+    exported = target.with_name("best.onnx")
+    exported.write_bytes(b"onnx")
+    model_store.record_artifact(target.parent, exported, core.MODEL_REPO_ID, core.MODEL_REVISION)
+    assert core.runtime_model_path(target) == exported
+
+    exported.write_bytes(b"tampered")
+    with pytest.raises(RuntimeError, match="Checksum mismatch"):
+        core.runtime_model_path(target)
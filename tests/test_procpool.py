@@ -0,0 +1,80 @@
+import os
+from io import BytesIO
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from jackfruit import core, procpool
+
+
+def fake_model(images, conf, save, imgsz, verbose=True):
+    if isinstance(images, np.ndarray):
+        images = [images]
+    return [
+        SimpleNamespace(
+            boxes=SimpleNamespace(
+                data=np.array([[0, 0, image.shape[1], image.shape[0], image[0, 0, 0] / 255, os.getpid()]])
+            ),
+            names={0: "jackfruit"},
+        )
+        for image in images
+    ]
+
+
+def fake_model_factory():
+    return fake_model
+
+
+@pytest.fixture
+def pool():
+    pool = procpool.ProcessInferencePool(2, model_factory=fake_model_factory, start_method="fork")
+    yield pool
+    pool.close()
+
+
+def test_process_pool_detects_images_passed_through_shared_memory(pool):
+    images = [np.full((4 + index, 6, 3), 51 * index, dtype=np.uint8) for index in range(4)]
+    # Non-contiguous views (tiles) are packed as well.
+    images.append(np.full((8, 8, 3), 255, dtype=np.uint8)[::2, ::2])
+
+    detections = pool.detect(images, 0.1)
+
+    assert [boxes[0, :4].tolist() for boxes, _ in detections] == [
+        [0, 0, 6, 4], [0, 0, 6, 5], [0, 0, 6, 6], [0, 0, 6, 7], [0, 0, 4, 4]
+    ]
+    np.testing.assert_allclose([boxes[0, 4] for boxes, _ in detections], [0, 0.2, 0.4, 0.6, 1.0])
+    assert all(names == {0: "jackfruit"} for _, names in detections)
+    assert {int(boxes[0, 5]) for boxes, _ in detections} != {os.getpid()}
+
+
+def test_process_pool_decodes_uploads_in_the_workers(pool):
+    upload = BytesIO()
+    Image.new("RGB", (40, 20), color=(0, 0, 102)).save(upload, "PNG")
+
+    rows = pool.analyze_encoded([upload.getvalue(), b"not an image"], 0.1, max_size=10)
+
+    assert rows[0]["original_size"] == (40, 20)
+    assert rows[0]["error"] is None
+    # Decoded at reduced size and converted to BGR in the worker.
+    assert rows[0]["boxes"][0, :5].tolist() == pytest.approx([0, 0, 20, 10, 0.4])
+    assert rows[1]["boxes"] is None
+    assert "valid supported image" in rows[1]["error"]
+
+
+def test_process_pool_warms_every_worker(pool):
+    warmed = pool.warm(runs=1, image_size=8)
+
+    assert len(warmed) == 2
+    assert os.getpid() not in warmed
+
+
+def test_run_raw_batch_detection_uses_the_process_pool(monkeypatch, pool):
+    monkeypatch.setattr(core, "process_pool", lambda: pool)
+    monkeypatch.setattr(core, "result_cache", lambda: core.DetectionCache(max_entries=0))
+
+    detections = core.run_raw_batch_detection([np.zeros((3, 5, 3), dtype=np.uint8)], 0.2)
+
+    assert detections[0][0].shape == (1, 6)
+    assert detections[0][1] == {0: "jackfruit"}
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from jackfruit import core, scheduler
+
+
+def test_scheduler_micro_batches_requests_that_arrive_together():
+    batches = []
+
+    def predict(model, images, conf):
+        batches.append((model, list(images), conf))
+        return [image * 10 for image in images]
+
+    inference = scheduler.InferenceScheduler(predict, lambda index: f"model-{index}", batch_wait=0.2)
+    try:
+        futures = [inference.submit(value, 0.1) for value in (1, 2, 3)]
+        assert [future.result(timeout=5) for future in futures] == [10, 20, 30]
+    finally:
+        inference.close(timeout=5)
+
+    assert batches == [("model-0", [1, 2, 3], 0.1)]
+    stats = inference.stats()
+    assert stats["requests"] == 3
+    assert stats["batches"] == 1
+    assert stats["avg_batch_size"] == 3
+    assert stats["queue_depth"] == 0
+    assert stats["wait_max_ms"] >= stats["wait_p50_ms"] >= 0
+
+
+def test_scheduler_splits_batches_by_confidence_and_propagates_errors():
+    def predict(model, images, conf):
+        if conf > 0.5:
+            raise RuntimeError("boom")
+        return list(images)
+
+    inference = scheduler.InferenceScheduler(predict, lambda index: None, batch_wait=0.2)
+    try:
+        ok = inference.submit("a", 0.1)
+        failed = inference.submit("b", 0.9)
+        assert ok.result(timeout=5) == "a"
+        with pytest.raises(RuntimeError, match="boom"):
+            failed.result(timeout=5)
+    finally:
+        inference.close(timeout=5)
+
+
+def test_scheduler_fails_requests_when_predict_returns_too_few_results():
+    inference = scheduler.InferenceScheduler(lambda model, images, conf: images[:1], lambda index: None, batch_wait=0.2)
+    try:
+        futures = [inference.submit(value, 0.1) for value in (1, 2)]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="1 results for 2 images"):
+                future.result(timeout=5)
+    finally:
+        inference.close(timeout=5)
+
+
+def test_scheduler_run_times_out_instead_of_waiting_forever():
+    release = threading.Event()
+
+    def predict(model, images, conf):
+        release.wait(5)
+        return list(images)
+
+    inference = scheduler.InferenceScheduler(predict, lambda index: None, batch_wait=0)
+    try:
+        with pytest.raises(RuntimeError, match="timed out"):
+            inference.run([1], 0.1, timeout=0.05)
+    finally:
+        release.set()
+        inference.close(timeout=5)
+
+
+def test_scheduler_rejects_when_queue_is_full():
+    release = threading.Event()
+
+    def predict(model, images, conf):
+        release.wait(5)
+        return list(images)
+
+    inference = scheduler.InferenceScheduler(
+        predict, lambda index: None, queue_size=1, max_batch_size=1, batch_wait=0
+    )
+    try:
+        first = inference.submit(1, 0.1)
+        # Let the worker take the first request so the queue slot frees up.
+        deadline = time.perf_counter() + 5
+        while inference.stats()["queue_depth"] and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        inference.submit(2, 0.1)
+        with pytest.raises(RuntimeError, match="busy"):
+            inference.submit(3, 0.1, timeout=0.01)
+        assert inference.stats()["rejected"] == 1
+    finally:
+        release.set()
+        assert first.result(timeout=5) == 1
+        inference.close(timeout=5)
+
+
+def test_run_batch_model_inference_goes_through_the_scheduler(monkeypatch):
+    def fake_model(images, conf, save, imgsz):
+        return [f"{image}@{conf}" for image in images]
+
+    monkeypatch.setattr(scheduler, "INFERENCE_WORKERS", 1)
+    monkeypatch.setattr(core, "load_model", lambda: fake_model)
+    core.inference_scheduler.cache_clear()
+    try:
+        assert core.inference_scheduler().workers == 1
+        assert core.run_batch_model_inference(["x", "y"], 0.3) == ["x@0.3", "y@0.3"]
+    finally:
+        core.inference_scheduler().close(timeout=5)
+        core.inference_scheduler.cache_clear()
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import pytest
+
+from jackfruit import theme
+
+STYLESHEET = Path(__file__).resolve().parents[1] / "static" / "theme.css"
+
+
+def test_theme_html_links_the_versioned_stylesheet(tmp_path):
+    stylesheet = tmp_path / "theme.css"
+    stylesheet.write_text(":root { --accent-1: #ff6b6b; }")
+
+    html = theme.theme_html(str(stylesheet), environ={})
+
+    assert html.startswith('<link rel="stylesheet" href="app/static/theme.css?v=')
+    assert "<style>" not in html
+
+
+def test_theme_html_adds_only_overridden_variables():
+    html = theme.theme_html(str(STYLESHEET), environ={"JACKFRUIT_THEME_ACCENT_1": "#ffa94d"})
+
+    assert html.endswith("<style>:root { --accent-1: #ffa94d; }</style>")
+
+
+def test_theme_overrides_reject_values_that_escape_the_declaration():
+    with pytest.raises(ValueError, match="JACKFRUIT_THEME_BG_PRIMARY"):
+        theme.theme_overrides({"JACKFRUIT_THEME_BG_PRIMARY": "red; } body { display: none"})
+
+
+def test_shipped_stylesheet_declares_every_theme_variable_without_remote_imports():
+    css = STYLESHEET.read_text()
+
+    assert "@import" not in css
+    assert "googleapis" not in css
+    for name in theme.THEME_VARIABLES:
+        assert f"--{name.replace('_', '-')}:" in css
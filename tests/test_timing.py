@@ -0,0 +1,27 @@
+import pytest
+
+from jackfruit import metrics, timing
+
+
+def test_stage_timer_records_each_stage_in_order(monkeypatch):
+    ticks = iter([0.0, 0.25, 1.0, 1.5, 2.0, 2.125])
+    monkeypatch.setattr(timing.time, "perf_counter", lambda: next(ticks))
+    registry = metrics.MetricsRegistry()
+    timer = timing.StageTimer(registry=registry)
+
+    with timer.stage("inference"):
+        pass
+    with pytest.raises(RuntimeError):
+        with timer.stage("annotation"):
+            raise RuntimeError("boom")
+    with timer.stage("inference"):
+        pass
+
+    assert list(timer.durations) == ["inference", "annotation"]
+    assert timer.durations["inference"] == pytest.approx(0.375)
+    assert timer.total == pytest.approx(0.875)
+    assert timer.summary() == "inference 375 ms · annotation 500 ms · total 875 ms"
+    assert [(row["metric"], row["stage"], row["count"]) for row in registry.summary()] == [
+        (metrics.REQUEST_STAGE_METRIC, "annotation", 1),
+        (metrics.REQUEST_STAGE_METRIC, "inference", 2),
+    ]
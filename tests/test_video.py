@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from jackfruit import core, video
+
+cv2 = pytest.importorskip("cv2")
+
+
+def write_video(path, frames=30, size=(96, 64)):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, size)
+    for index in range(frames):
+        frame = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        # One bright "fruit" drifting right by 1 px per frame.
+        frame[20:40, 10 + index:30 + index] = 255
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def fake_detect_images(images_cv, floor_threshold):
+    detections = []
+    for image_cv in images_cv:
+        ys, xs = np.nonzero(image_cv[:, :, 0] > 128)
+        boxes = np.array([[xs.min(), ys.min(), xs.max(), ys.max(), 0.9, 0]], dtype=np.float32)
+        detections.append((boxes, {0: "jackfruit"}))
+    return detections
+
+
+def test_iou_tracker_counts_each_fruit_once_and_ignores_one_off_boxes():
+    tracker = video.IoUTracker(iou_threshold=0.3, max_misses=1, min_hits=2)
+    fruit = np.array([[0, 0, 10, 10]], dtype=np.float32)
+
+    assert tracker.update(fruit) == 0
+    assert tracker.update(fruit + 1) == 1
+    assert tracker.update(np.vstack([fruit + 2, [[50, 50, 60, 60]]])) == 1
+    assert tracker.update(fruit + 3) == 1
+    # The fruit leaves the frame long enough for its track to close.
+    tracker.update(np.empty((0, 4)))
+    tracker.update(np.empty((0, 4)))
+    assert tracker.update(fruit + 3) == 1
+    assert tracker.update(fruit + 3) == 2
+
+
+def test_frame_selector_uses_stride_and_scene_change():
+    selector = video.FrameSelector(stride=3, change_threshold=0.2)
+    still = np.zeros((36, 64, 3), dtype=np.uint8)
+    moved = np.full((36, 64, 3), 255, dtype=np.uint8)
+
+    assert [selector.select(index, still) for index in range(4)] == [True, False, False, True]
+    assert selector.select(4, moved)
+
+
+def test_analyze_video_streams_frames_and_counts_tracked_fruit(tmp_path, monkeypatch):
+    path = write_video(tmp_path / "row.avi")
+    monkeypatch.setattr(core, "detect_images", fake_detect_images)
+
+    updates = list(video.analyze_video(path, 0.5, stride=5, change_threshold=1.0, batch_size=2))
+
+    assert video.video_frame_count(path) == 30
+    final = updates[-1]
+    assert final["frames_read"] == 30
+    assert final["frames_detected"] == 6
+    assert final["unique_count"] == 1
+    assert final["in_frame"] == 1
+    assert final["fps"] > 0
+    assert final["done"]
+    assert [update["done"] for update in updates] == [False, False, False, True]
+
+
+def test_iter_video_frames_rejects_unreadable_files(tmp_path):
+    path = tmp_path / "broken.mp4"
+    path.write_bytes(b"not a video")
+
+    with pytest.raises(ValueError, match="readable video"):
+        list(video.iter_video_frames(path))
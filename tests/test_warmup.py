@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import pytest
+
+from jackfruit import core, warmup
+
+
+def test_model_warmup_loads_model_and_runs_dummy_inferences(monkeypatch):
+    calls = []
+
+    def fake_model(image, imgsz, conf, save, verbose):
+        calls.append((image.shape, imgsz, save))
+        return []
+
+    monkeypatch.setattr(core, "load_model", lambda: fake_model)
+    model_warmup = warmup.ModelWarmup(runs=3, image_size=32)
+
+    assert model_warmup.status == "idle"
+    assert model_warmup.start() is model_warmup.start()
+    assert model_warmup.wait(timeout=5)
+
+    assert model_warmup.ready
+    assert model_warmup.status == "ready"
+    assert model_warmup.duration >= 0
+    assert calls == [((32, 32, 3), 32, False)] * 3
+
+
+def test_model_warmup_reports_failures(monkeypatch):
+    def broken_load():
+        raise RuntimeError("no network")
+
+    monkeypatch.setattr(core, "load_model", broken_load)
+    model_warmup = warmup.ModelWarmup().start()
+    model_warmup.wait(timeout=5)
+
+    assert not model_warmup.ready
+    assert model_warmup.status == "failed"
+    assert str(model_warmup.error) == "no network"
+
+
+def test_model_warmup_warms_the_process_pool_instead_of_this_process(monkeypatch):
+    warmed = []
+    pool = SimpleNamespace(warm=lambda runs, image_size: warmed.append((runs, image_size)))
+    monkeypatch.setattr(core, "process_pool", lambda: pool)
+    monkeypatch.setattr(core, "load_model", lambda: pytest.fail("the model was loaded in this process"))
+
+    model_warmup = warmup.ModelWarmup(runs=2, image_size=32).start()
+    model_warmup.wait(timeout=5)
+
+    assert model_warmup.ready
+    assert warmed == [(2, 32)]